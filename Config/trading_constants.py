@@ -86,6 +86,76 @@ class TCS:
         self.NUMBER_OF_BATCHES = 50
         self.MAX_WORKERS = min(50, os.cpu_count())  # Example, capped at 32
         self.MAX_INVESTMENT_PARTITION = 0.1
+        self.MAX_GROSS_EXPOSURE = float(os.getenv("MAX_GROSS_EXPOSURE", 1.0))  # Max invested fraction of equity in portfolio backtests
+        self.REBALANCE_FREQUENCY = int(os.getenv("REBALANCE_FREQUENCY", 20))  # Bars between portfolio rebalances
+        self.BACKTEST_BULK_BATCH_SIZE = int(os.getenv("BACKTEST_BULK_BATCH_SIZE", 5000))  # Rows per bulk_create batch
+        self.BACKTEST_SIDECAR_THRESHOLD = int(os.getenv("BACKTEST_SIDECAR_THRESHOLD", 10000))  # Trades above which logs go to Parquet
+        self.BACKTEST_SIDECAR_DIR = os.getenv("BACKTEST_SIDECAR_DIR", "backtest_sidecars")
+        self.MAX_VOLUME_PARTICIPATION = float(os.getenv("MAX_VOLUME_PARTICIPATION", 0.1))  # Max share of bar volume a backtest fill may take
+        self.DEFAULT_SPREAD_BPS = float(os.getenv("DEFAULT_SPREAD_BPS", 5))  # Spread assumed when no bid/ask quote is available
+        self.ROBUSTNESS_RESAMPLES = int(os.getenv("ROBUSTNESS_RESAMPLES", 2000))  # Monte Carlo / bootstrap resamples per backtest
+        self.ROBUSTNESS_BLOCK_SIZE = int(os.getenv("ROBUSTNESS_BLOCK_SIZE", 20))  # Bars per block in the block bootstrap
+        self.FORECAST_MODEL_CACHE_DIR = os.getenv("FORECAST_MODEL_CACHE_DIR", "forecast_model_cache")
+        self.FORECAST_FINE_TUNE_EPOCHS = int(os.getenv("FORECAST_FINE_TUNE_EPOCHS", 3))  # LSTM epochs when warm-starting on new bars
+        self.FORECAST_MAX_WARM_STARTS = int(os.getenv("FORECAST_MAX_WARM_STARTS", 20))  # Warm starts before a full refit is forced
+        self.FORECAST_FIT_WORKERS = int(os.getenv("FORECAST_FIT_WORKERS", 4))  # Processes fitting statistical models concurrently
+        self.FORECAST_TORCH_THREADS = int(os.getenv("FORECAST_TORCH_THREADS", 2))  # Torch threads for the LSTM worker
+        self.FORECAST_MODEL_TIMEOUT = float(os.getenv("FORECAST_MODEL_TIMEOUT", 300))  # Seconds a single model fit may take
+        self.GLOBAL_FORECAST_LAGS = int(os.getenv("GLOBAL_FORECAST_LAGS", 12))  # Lookback window of the global models
+        self.GLOBAL_FORECAST_BATCH_SIZE = int(os.getenv("GLOBAL_FORECAST_BATCH_SIZE", 256))  # Series windows per training/prediction batch
+        self.FORECAST_HEADLESS = os.getenv("FORECAST_HEADLESS", "false").lower() == "true"  # Skip bokeh charts and desktop notifications
+        self.FORECAST_CHART_DIR = os.getenv("FORECAST_CHART_DIR", "forecast_charts")  # On-demand rendered chart cache
+        self.FORECAST_STORAGE = os.getenv("FORECAST_STORAGE", "binary")  # 'binary' (float32 arrays) or 'json' (legacy JSONFields)
+        self.INFERENCE_MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", 64))  # Requests per inference micro-batch
+        self.INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", 5))  # Max time a request waits for its batch to fill
+        self.FORECAST_DRIFT_WINDOW = int(os.getenv("FORECAST_DRIFT_WINDOW", 50))  # Recent one-step errors used for drift detection
+        self.FORECAST_DRIFT_THRESHOLD = float(os.getenv("FORECAST_DRIFT_THRESHOLD", 1.5))  # Recent RMSE / fitted RMSE ratio that triggers a refit
+        self.FORECAST_BACKTEST_RETRAIN_EVERY = int(os.getenv("FORECAST_BACKTEST_RETRAIN_EVERY", 20))  # Bars between refits in forecast backtests
+        self.FORECAST_BACKTEST_START = float(os.getenv("FORECAST_BACKTEST_START", 0.7))  # Fraction of each series used before the first backtest forecast
+        self.FORECAST_BACKTEST_MAX_AGE_DAYS = int(os.getenv("FORECAST_BACKTEST_MAX_AGE_DAYS", 7))  # Accuracy stats older than this are re-evaluated
+        self.FORECAST_SELECTION_TOP_K = int(os.getenv("FORECAST_SELECTION_TOP_K", 2))  # Models run per ticker between tournaments
+        self.FORECAST_TOURNAMENT_INTERVAL_DAYS = int(os.getenv("FORECAST_TOURNAMENT_INTERVAL_DAYS", 7))  # Days between full model tournaments
+        self.FORECAST_DEGRADATION_RATIO = float(os.getenv("FORECAST_DEGRADATION_RATIO", 1.25))  # Best MAPE / tournament MAPE ratio that forces a tournament
+        self.FEATURE_STORE_DIR = os.getenv("FEATURE_STORE_DIR", "feature_store")
+        self.FEATURE_SET_VERSION = os.getenv("FEATURE_SET_VERSION", "1")  # Bump when feature definitions change
+        self.PIPELINE_EXECUTION_BACKEND = os.getenv("PIPELINE_EXECUTION_BACKEND", "thread")  # 'thread' or 'process' for PipelineManager
+        self.PIPELINE_BLAS_THREADS = int(os.getenv("PIPELINE_BLAS_THREADS", 1))  # BLAS threads per pipeline worker process
+        self.HPO_MAX_WORKERS = int(os.getenv("HPO_MAX_WORKERS", 4))  # Processes evaluating hyperparameter trials
+        self.HPO_HALVING_ETA = int(os.getenv("HPO_HALVING_ETA", 3))  # Successive halving keeps the top 1/eta at each rung
+        self.HPO_WARM_START_FRACTION = float(os.getenv("HPO_WARM_START_FRACTION", 0.5))  # Share of trials sampled near the previous best
+        self.HPO_HISTORY_DIR = os.getenv("HPO_HISTORY_DIR", "hpo_history")
+        self.MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "model_registry")
+        self.MODEL_REGISTRY_CACHE_SIZE = int(os.getenv("MODEL_REGISTRY_CACHE_SIZE", 32))  # Loaded models kept in memory per process
+        self.MODEL_TRAINER_BULK_CHUNK_SIZE = int(os.getenv("MODEL_TRAINER_BULK_CHUNK_SIZE", 1000))  # Buffered rows per bulk_create
+        self.MODEL_TRAINER_FLUSH_INTERVAL = float(os.getenv("MODEL_TRAINER_FLUSH_INTERVAL", 5))  # Seconds between timed flushes (0 disables the timer)
+        self.MODEL_TRAINER_FLUSH_MAX_RETRIES = int(os.getenv("MODEL_TRAINER_FLUSH_MAX_RETRIES", 3))  # Failed writes of a model's rows before they are dropped
+        self.FEATURE_SELECTION_CACHE_DIR = os.getenv("FEATURE_SELECTION_CACHE_DIR", "feature_selection_cache")
+        self.FEATURE_SELECTION_CORRELATION_THRESHOLD = float(os.getenv("FEATURE_SELECTION_CORRELATION_THRESHOLD", 0.95))  # |corr| above which a feature is redundant (1 disables the prefilter)
+        self.FEATURE_SELECTION_MI_BINS = int(os.getenv("FEATURE_SELECTION_MI_BINS", 16))  # Quantile bins per feature for approximate mutual information
+        self.FEATURE_SELECTION_MAX_CACHE_FILES = int(os.getenv("FEATURE_SELECTION_MAX_CACHE_FILES", 1024))  # Score files kept on disk (least recently used are pruned)
+        self.EXPLAIN_CACHE_DIR = os.getenv("EXPLAIN_CACHE_DIR", "explanations")
+        self.EXPLAIN_TIME_BUDGET = float(os.getenv("EXPLAIN_TIME_BUDGET", 30))  # Seconds one SHAP/LIME request may spend
+        self.EXPLAIN_MAX_ROWS = int(os.getenv("EXPLAIN_MAX_ROWS", 200))  # Stratified evaluation rows explained per model version
+        self.EXPLAIN_BACKGROUND_SIZE = int(os.getenv("EXPLAIN_BACKGROUND_SIZE", 100))  # Stratified training rows used as SHAP/LIME background
+        self.EXPLAIN_LIME_ROWS = int(os.getenv("EXPLAIN_LIME_ROWS", 10))  # Rows explained by LIME per request
+        self.MTDG_CACHE_DIR = os.getenv("MTDG_CACHE_DIR", "fmp_response_cache")
+        self.MTDG_MAX_CONCURRENCY = int(os.getenv("MTDG_MAX_CONCURRENCY", 10))  # FMP requests in flight per training batch
+        # Seconds a cached FMP response stays valid, per endpoint
+        self.MTDG_CACHE_TTLS = {
+            'historical_data': int(os.getenv("MTDG_TTL_HISTORICAL", 86400)),
+            'financial_ratios': int(os.getenv("MTDG_TTL_RATIOS", 604800)),
+            'key_metrics': int(os.getenv("MTDG_TTL_KEY_METRICS", 604800)),
+            'upgrades_downgrades': int(os.getenv("MTDG_TTL_UPGRADES_DOWNGRADES", 86400)),
+            'historical_interday': int(os.getenv("MTDG_TTL_INTERDAY", 86400)),
+        }
+        self.ONLINE_LEARNER = os.getenv("ONLINE_LEARNER", "sgd")  # 'sgd' or 'passive_aggressive' per-ticker incremental learner
+        self.ONLINE_ADWIN_DELTA = float(os.getenv("ONLINE_ADWIN_DELTA", 0.002))  # ADWIN confidence; smaller is less sensitive
+        self.ONLINE_PH_THRESHOLD = float(os.getenv("ONLINE_PH_THRESHOLD", 25))  # Page-Hinkley alarm level on scaled absolute errors
+        self.ONLINE_DRIFT_CONFIRM_WINDOW = int(os.getenv("ONLINE_DRIFT_CONFIRM_WINDOW", 200))  # Rows within which both detectors must fire
+        self.TRADING_CALENDAR_MARKET = os.getenv("TRADING_CALENDAR_MARKET", "NYSE")  # holidays financial market code
+        self.TRADING_CALENDAR_START_YEAR = int(os.getenv("TRADING_CALENDAR_START_YEAR", 2000))
+        self.TRADING_CALENDAR_YEARS_AHEAD = int(os.getenv("TRADING_CALENDAR_YEARS_AHEAD", 2))  # Years precomputed past the current one
+        self.TRADING_CALENDAR_DIR = os.getenv("TRADING_CALENDAR_DIR", "trading_calendar")
         self.TRADING_STRATEGY_THREAD_COUNT = 65
 
         # Define all trading periods from FMP
@@ -0,0 +1,112 @@
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional, Tuple
+from django.db.models import Max, Count, Sum
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+from Hybrid_Trading.Data.models import HistoricalData
+from Hybrid_Trading.Backtester.models import BacktestCacheEntry
+
+
+class BacktestResultCache:
+    """
+    Cache of backtest results keyed by a hash of the strategy config, the parameters and the
+    data version of the tickers' price slice.
+
+    The data version (max bar date, row count and close checksum) is part of the key, so new or
+    corrected bars always produce a miss; stale entries are never served and need no signal-based
+    invalidation.
+    """
+
+    # User input keys that only affect presentation, not the backtest itself
+    IGNORED_KEYS = {'output_options'}
+
+    def __init__(self):
+        self.logger = LoggingMaster("BacktestResultCache").get_logger()
+
+    def normalize_config(self, user_input: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Keep the result-affecting part of the user input in a stable, JSON-serializable form.
+        """
+        return {key: to_json_safe(value) for key, value in sorted(user_input.items()) if key not in self.IGNORED_KEYS}
+
+    async def data_version(self, tickers: List[str], start_date=None, end_date=None) -> str:
+        """
+        Compute the data version of the price slice with a single aggregate query.
+        """
+        historical_data_qs = HistoricalData.objects.filter(ticker_id__in=tickers)
+        if start_date and end_date:
+            historical_data_qs = historical_data_qs.filter(date__range=[start_date, end_date])
+
+        version = await historical_data_qs.aaggregate(max_date=Max('date'), rows=Count('id'), close_sum=Sum('close'))
+        return f"{version['max_date']}|{version['rows']}|{(version['close_sum'] or 0.0):.6f}"
+
+    def make_key(self, config: Dict[str, Any], tickers: List[str], data_version: str) -> str:
+        payload = json.dumps({'config': config, 'tickers': sorted(tickers), 'data_version': data_version}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def lookup(self, user_input: Dict[str, Any], tickers: List[str]) -> Tuple[str, str, Optional[Any]]:
+        """
+        Return (cache_key, data_version, cached_result). cached_result is None on a miss.
+        """
+        data_version = await self.data_version(tickers, user_input.get('start_date'), user_input.get('end_date'))
+        cache_key = self.make_key(self.normalize_config(user_input), tickers, data_version)
+
+        entry = await BacktestCacheEntry.objects.filter(cache_key=cache_key).afirst()
+        if entry is None:
+            self.logger.info(f"Backtest cache miss for {tickers} ({data_version})")
+            return cache_key, data_version, None
+
+        self.logger.info(f"Backtest cache hit for {tickers} ({data_version})")
+        return cache_key, data_version, entry.result
+
+    async def store(self, cache_key: str, data_version: str, user_input: Dict[str, Any], tickers: List[str], result: Any) -> Any:
+        """
+        Store a backtest result and return its JSON-safe form, pruning the entries it supersedes.
+        """
+        safe_result = to_json_safe(result)
+        config = self.normalize_config(user_input)
+        await BacktestCacheEntry.objects.aupdate_or_create(
+            cache_key=cache_key,
+            defaults={
+                'tickers': sorted(tickers),
+                'data_version': data_version,
+                'config': config,
+                'result': safe_result,
+            },
+        )
+        await self.prune_superseded(config, tickers, data_version)
+        return safe_result
+
+    async def prune_superseded(self, config: Dict[str, Any], tickers: List[str], data_version: str) -> int:
+        """
+        Delete cached results of the same run on older data versions; they can never be hit again.
+        """
+        deleted, _ = await BacktestCacheEntry.objects.filter(
+            tickers=sorted(tickers), config=config
+        ).exclude(data_version=data_version).adelete()
+        if deleted:
+            self.logger.info(f"Pruned {deleted} superseded cached backtest results for {tickers}")
+        return deleted
+
+
+def to_json_safe(value: Any) -> Any:
+    """
+    Convert backtest output (DataFrames, Series, NumPy and datetime values) into JSON-safe structures.
+    """
+    if isinstance(value, pd.DataFrame):
+        return json.loads(value.to_json(orient='records', date_format='iso'))
+    if isinstance(value, pd.Series):
+        return json.loads(value.to_json(orient='index', date_format='iso'))
+    if isinstance(value, dict):
+        return {str(key): to_json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_safe(item) for item in value]
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
@@ -1,4 +1,5 @@
 import asyncio
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import backtrader as bt
@@ -13,12 +14,15 @@ from Hybrid_Trading.Strategy.Strats.MRMS import MeanReversionMomentumStrategy
 from Hybrid_Trading.Strategy.Strats.VRS import VolatilityReversionStrategy
 from Hybrid_Trading.Strategy.Strats.VS import ValueSeekerStrategy
 from Hybrid_Trading.Trading.TL.Trading_Logic import DayTradingLogic
+from Hybrid_Trading.Backtester.Portfolio_Backtester import PortfolioBacktester
+from Hybrid_Trading.Backtester.Result_Store import BacktestResultStore
+from Hybrid_Trading.Backtester.Fill_Model import FillModel
+from Hybrid_Trading.Forecaster.Inference_Server import ForecastInferenceServer
+from Hybrid_Trading.Data.Trading_Calendar import get_trading_calendar
 from dotenv import load_dotenv
 from tqdm.asyncio import tqdm_asyncio  # Async-friendly TQDM progress bar
 from Hybrid_Trading.Data.models import HistoricalData
 from Hybrid_Trading.Symbols.models import Tickers
-from Hybrid_Trading.Backtester.models import BacktestResults, BacktestResultsTradeLogs
-from django.utils import timezone
 
 # Load environment variables
 load_dotenv()
@@ -51,6 +55,13 @@ class DayTradingBacktester:
         # Initialize DayTradingLogic for executing trades
         self.day_trading_logic = DayTradingLogic(user_input=self.user_input)
 
+        # Bulk persistence for summaries and trade logs
+        self.result_store = BacktestResultStore()
+        self.calendar = get_trading_calendar()
+
+        # One inference server for the whole run; PredictionStrategy registers per-ticker models with it
+        self.inference_server = ForecastInferenceServer()
+
         self.logger.info(f"Initialized with starting account value: {self.STARTING_ACCOUNT_VALUE}")
 
     async def pull_historical_data(self, ticker: str, start_date: datetime = None, end_date: datetime = None) -> pd.DataFrame:
@@ -86,7 +97,8 @@ class DayTradingBacktester:
         Execute backtest asynchronously for a given ticker using the aggregated signals.
         """
         self.logger.info(f"Executing backtest for {ticker}")
-        
+
+        ticker_trades = []
         for date in historical_data.index:
             signal = signals.get(date, {})
             if not signal:
@@ -95,15 +107,35 @@ class DayTradingBacktester:
             trade_log = await self.day_trading_logic.execute_trade(ticker, signal)  # Async trade execution
 
             if trade_log:
+                trade_log['date'] = date
                 self.trade_log.append(trade_log)
+                ticker_trades.append(trade_log)
+
+        # Optional realistic fills, as in the portfolio mode
+        trade_log = ticker_trades
+        if self.user_input.get('fill_model') and ticker_trades:
+            trade_log = await self.apply_fills(pd.DataFrame(ticker_trades), historical_data, ticker)
 
         portfolio_value = self.cash + sum(self.portfolio[t] * historical_data.at[date, 'close'] for t in self.portfolio)
         return {
             'ticker': ticker,
             'final_portfolio_value': portfolio_value,
-            'trade_log': self.trade_log
+            'trade_log': trade_log
         }
 
+    async def apply_fills(self, trades: pd.DataFrame, historical_data: pd.DataFrame, ticker: str) -> pd.DataFrame:
+        """
+        Reprice a ticker's trade log with the FillModel: fill price, volume-capped quantity and costs.
+        """
+        fill_model = FillModel.from_user_input(self.user_input)
+        quotes = await fill_model.load_quotes([ticker])
+        bars = historical_data.rename_axis('date').reset_index().assign(ticker=ticker)
+        bars['date'] = pd.to_datetime(bars['date'])
+        trades = trades.assign(date=pd.to_datetime(trades['date']), action=trades['final_action'])
+
+        filled = fill_model.apply(trades, bars.set_index(['date', 'ticker']), quotes)
+        return filled.assign(price=filled['fill_price'], quantity=filled['filled_quantity'])
+
     async def aggregate_signals(self, strategy_signals: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Aggregate signals asynchronously from different strategies using majority vote.
@@ -129,7 +161,18 @@ class DayTradingBacktester:
 
     async def run(self, fetched_data: List[Dict[str, Any]], start_date: datetime = None, end_date: datetime = None):
         """
-        Run backtest asynchronously for all tickers in the fetched data list.
+        Run backtest asynchronously for all tickers in the fetched data list, then stop the inference server.
+        """
+        try:
+            if self.user_input.get('backtest_mode') == 'portfolio':
+                return await self.run_portfolio([data.get('ticker') for data in fetched_data], start_date, end_date)
+            return await self.run_tickers(fetched_data, start_date, end_date)
+        finally:
+            await self.inference_server.stop()
+
+    async def run_tickers(self, fetched_data: List[Dict[str, Any]], start_date: datetime = None, end_date: datetime = None):
+        """
+        Backtest each ticker of the fetched data list independently.
         """
         self.logger.info("Starting backtesting process...")
         backtest_results = []
@@ -147,6 +190,7 @@ class DayTradingBacktester:
 
         await self.export_results(backtest_results)
         self.logger.info("Backtesting process completed and results exported.")
+        return backtest_results
 
     async def process_ticker(self, ticker: str, start_date: datetime, end_date: datetime):
         """
@@ -155,9 +199,17 @@ class DayTradingBacktester:
         # Fetch historical data using ORM with date range filtering
         historical_data = await self.pull_historical_data(ticker, start_date, end_date)
 
+        aggregated_signals = await self.generate_ticker_signals(historical_data)
+        result = await self.execute_backtest(historical_data, ticker, aggregated_signals)
+        return result
+
+    async def generate_ticker_signals(self, historical_data: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Run every strategy on a ticker's historical data and aggregate the signals.
+        """
         strategies = [
             DynamicStrategy(historical_data),
-            PredictionStrategy(historical_data),
+            PredictionStrategy(historical_data, inference_server=self.inference_server),
             InstantBacktestStrategy(historical_data),
             MeanReversionMomentumStrategy(historical_data),
             VolatilityReversionStrategy(historical_data),
@@ -165,45 +217,86 @@ class DayTradingBacktester:
         ]
 
         signals = [strategy.generate_signals() for strategy in strategies]
-        aggregated_signals = await self.aggregate_signals(signals)
-        result = await self.execute_backtest(historical_data, ticker, aggregated_signals)
-        return result
+        return await self.aggregate_signals(signals)
+
+    async def pull_price_matrix(self, tickers: List[str], start_date: datetime = None, end_date: datetime = None) -> pd.DataFrame:
+        """
+        Async fetch historical bars for many tickers in a single ORM query.
+        Returns a long DataFrame indexed by (date, ticker) that can be pivoted into aligned matrices.
+        """
+        self.logger.info(f"Fetching aligned price matrix for {len(tickers)} tickers")
+        historical_data_qs = HistoricalData.objects.filter(ticker_id__in=tickers).order_by('date')
+
+        if start_date and end_date:
+            historical_data_qs = historical_data_qs.filter(date__range=[start_date, end_date])
+
+        rows = [row async for row in historical_data_qs.values(  # Async ORM iteration
+            'ticker_id', 'date', 'open', 'high', 'low', 'close', 'volume', 'vwap'
+        )]
+        if not rows:
+            return pd.DataFrame()
+
+        bars = pd.DataFrame(rows).rename(columns={'ticker_id': 'ticker'})
+        bars['date'] = pd.to_datetime(bars['date'])
+        # Keep the common calendar to trading sessions; stray weekend/holiday prints would add empty bars
+        bars = self.calendar.filter_frame(bars)
+        return bars.set_index(['date', 'ticker']).sort_index()
+
+    async def run_portfolio(self, tickers: List[str], start_date: datetime = None, end_date: datetime = None) -> Dict[str, Any]:
+        """
+        Run a portfolio-level backtest: all tickers step on a common calendar and share one cash balance.
+        """
+        self.logger.info("Starting portfolio backtesting process...")
+        bars = await self.pull_price_matrix(tickers, start_date, end_date)
+        if bars.empty:
+            self.logger.warning("No historical data available for the portfolio backtest.")
+            return {}
+
+        prices = bars['close'].unstack('ticker').astype(np.float64)
+        ticker_columns = list(prices.columns)
+
+        ticker_signals = {}
+        for ticker in ticker_columns:
+            ticker_bars = bars.xs(ticker, level='ticker')
+            ticker_signals[ticker] = await self.generate_ticker_signals(ticker_bars)
+
+        signal_matrix = PortfolioBacktester.build_signal_matrix(ticker_signals, prices.index, ticker_columns)
+        portfolio_backtester = PortfolioBacktester(
+            position_sizer=self.day_trading_logic.calculate_position_size,
+            starting_cash=self.STARTING_ACCOUNT_VALUE,
+            max_position_weight=self.user_input.get('max_position_weight'),
+            max_gross_exposure=self.user_input.get('max_gross_exposure'),
+            rebalance_frequency=self.user_input.get('rebalance_frequency'),
+        )
+
+        # Optional realistic fills (next open / vwap, volume caps, bid/ask spread costs)
+        fills = None
+        if self.user_input.get('fill_model'):
+            fill_model = FillModel.from_user_input(self.user_input)
+            quotes = await fill_model.load_quotes(ticker_columns)
+            fills = fill_model.build_matrices(bars, quotes)
+
+        portfolio_result = portfolio_backtester.run(prices, signal_matrix, fills)
+
+        trade_log = portfolio_result['trade_log']
+        results = [
+            {
+                'ticker': ticker,
+                'final_portfolio_value': portfolio_result['final_portfolio_value'],
+                'trade_log': ticker_trades.drop(columns='ticker'),
+            }
+            for ticker, ticker_trades in trade_log.groupby('ticker')
+        ]
+        await self.export_results(results)
+        self.logger.info("Portfolio backtesting process completed and results exported.")
+        return portfolio_result
 
     async def export_results(self, results: List[Dict[str, Any]]):
         """
-        Save backtesting results asynchronously to the database.
+        Save backtesting results asynchronously to the database using bulk inserts.
+        Large trade logs are written to Parquet sidecars referenced from the summary row.
         """
         try:
-            for result in results:
-                ticker_symbol = result.get('ticker')
-                final_portfolio_value = result.get('final_portfolio_value')
-                trade_logs = result.get('trade_log')
-
-                try:
-                    ticker = await Tickers.objects.aget(ticker=ticker_symbol)  # Async ORM fetch
-                except Tickers.DoesNotExist:
-                    self.logger.error(f"Ticker {ticker_symbol} does not exist in the database.")
-                    continue
-
-                backtest_result = await BacktestResults.objects.acreate(  # Async ORM create
-                    ticker=ticker,
-                    final_portfolio_value=final_portfolio_value,
-                    trade_log=trade_logs,
-                    backtest_date=timezone.now()
-                )
-
-                self.logger.info(f"Saved backtest result for {ticker_symbol} with final portfolio value: {final_portfolio_value}")
-
-                for trade_log in trade_logs:
-                    await BacktestResultsTradeLogs.objects.acreate(  # Async ORM create
-                        ticker=ticker,
-                        action=trade_log.get('action'),
-                        quantity=trade_log.get('quantity'),
-                        price=trade_log.get('price'),
-                        date=trade_log.get('date'),
-                        portfolio_value=trade_log.get('current_portfolio_value')
-                    )
-                    self.logger.info(f"Logged trade: {trade_log['action']} on {trade_log['date']} for {ticker_symbol}")
-
+            await self.result_store.save(results)
         except Exception as e:
-            self.logger.error(f"Failed to save backtest results to the database: {e}")
\ No newline at end of file
+            self.logger.error(f"Failed to save backtest results to the database: {e}")
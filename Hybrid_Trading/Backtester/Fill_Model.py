@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+from Hybrid_Trading.Data.models import RealTimePrice
+
+
+class FillModel:
+    """
+    Realistic fill simulation for the backtest engine. It reprices a finished trade list
+    (apply) or provides aligned fill matrices for PortfolioBacktester (build_matrices).
+
+    Supported fill prices:
+      - 'close':     fill at the signal bar's close (the backtester's default)
+      - 'next_open': fill at the next bar's open for the same ticker
+      - 'vwap':      fill at the fill bar's vwap (falls back to close when vwap is missing)
+
+    Quantities are capped at a share of the fill bar's volume, and a half-spread from
+    RealTimePrice bid/ask (or a default spread) plus slippage is charged on top of the fill
+    price. Every step is a column operation over the whole trade list or bar matrix.
+    """
+
+    FILL_PRICES = ('close', 'next_open', 'vwap')
+
+    def __init__(
+        self,
+        fill_price: str = 'next_open',
+        participation_rate: float = None,
+        default_spread_bps: float = None,
+        slippage: float = 0.0,
+        commission_rate: float = None,
+    ):
+        if fill_price not in self.FILL_PRICES:
+            raise ValueError(f"Unsupported fill price '{fill_price}'. Expected one of {self.FILL_PRICES}.")
+
+        self.logger = LoggingMaster("FillModel").get_logger()
+        self.constants = TCS()
+        self.fill_price = fill_price
+        self.participation_rate = participation_rate if participation_rate is not None else self.constants.MAX_VOLUME_PARTICIPATION
+        self.default_spread_bps = default_spread_bps if default_spread_bps is not None else self.constants.DEFAULT_SPREAD_BPS
+        self.slippage = slippage
+        self.commission_rate = commission_rate if commission_rate is not None else self.constants.COMMISSION_RATE
+
+    @classmethod
+    def from_user_input(cls, user_input: Dict[str, Any]) -> "FillModel":
+        return cls(
+            fill_price=user_input.get('fill_model', 'next_open'),
+            participation_rate=user_input.get('participation_rate'),
+            default_spread_bps=user_input.get('spread_bps'),
+            slippage=user_input.get('slippage', 0.0),
+        )
+
+    async def load_quotes(self, tickers: List[str]) -> pd.DataFrame:
+        """
+        Async fetch the latest bid/ask per ticker from RealTimePrice in one query.
+        Returns a DataFrame indexed by ticker with a relative half_spread column.
+        """
+        rows = [row async for row in RealTimePrice.objects.filter(ticker_id__in=tickers).order_by('last_sale_time').values(
+            'ticker_id', 'bid_price', 'ask_price'
+        )]
+        if not rows:
+            return pd.DataFrame(columns=['half_spread'])
+
+        quotes = pd.DataFrame(rows).drop_duplicates('ticker_id', keep='last').set_index('ticker_id')
+        bid = quotes['bid_price'].astype(np.float64)
+        ask = quotes['ask_price'].astype(np.float64)
+        mid = (bid + ask) / 2
+        valid = (bid > 0) & (ask >= bid)
+        quotes['half_spread'] = np.where(valid, (ask - bid) / (2 * mid.where(valid, 1.0)), np.nan)
+        return quotes[['half_spread']]
+
+    def apply(self, trades: pd.DataFrame, bars: pd.DataFrame, quotes: pd.DataFrame = None) -> pd.DataFrame:
+        """
+        Reprice a trade list.
+
+        :param trades: Trade log with date, ticker, action ('Buy'/'Sell') and quantity columns.
+        :param bars: Long bar frame indexed by (date, ticker) with open, close, volume and optionally vwap.
+        :param quotes: Optional frame indexed by ticker with a half_spread column (see load_quotes).
+        :return: The trades with fill_date, fill_price, filled_quantity, transaction_cost and cash_flow columns.
+        """
+        if trades.empty:
+            return trades.assign(fill_date=pd.NaT, fill_price=np.nan, filled_quantity=0, transaction_cost=0.0, cash_flow=0.0)
+
+        # Per-ticker next-bar columns, computed once over the whole bar frame
+        bar_frame = bars.reset_index().sort_values(['ticker', 'date'])
+        if 'vwap' not in bar_frame.columns:
+            bar_frame['vwap'] = np.nan
+        next_bar = bar_frame.groupby('ticker', sort=False)[['date', 'open', 'close', 'volume', 'vwap']].shift(-1)
+        bar_frame = bar_frame.join(next_bar.add_prefix('next_'))
+
+        merged = trades.reset_index(drop=True).merge(
+            bar_frame, on=['date', 'ticker'], how='left', suffixes=('', '_bar')
+        )
+
+        if self.fill_price == 'next_open':
+            fill_date = merged['next_date']
+            base_price = merged['next_open'].to_numpy(dtype=np.float64)
+            fill_volume = merged['next_volume'].to_numpy(dtype=np.float64)
+        elif self.fill_price == 'vwap':
+            fill_date = merged['date']
+            base_price = merged['vwap'].fillna(merged['close']).to_numpy(dtype=np.float64)
+            fill_volume = merged['volume'].to_numpy(dtype=np.float64)
+        else:
+            fill_date = merged['date']
+            base_price = merged['close'].to_numpy(dtype=np.float64)
+            fill_volume = merged['volume'].to_numpy(dtype=np.float64)
+
+        side = np.where(merged['action'].to_numpy() == 'Buy', 1.0, -1.0)
+
+        # Spread: per-ticker half spread from quotes, default spread where no quote is available
+        half_spread = np.full(len(merged), self.default_spread_bps / 2 / 10_000)
+        if quotes is not None and not quotes.empty:
+            quoted = merged['ticker'].map(quotes['half_spread']).to_numpy(dtype=np.float64)
+            half_spread = np.where(np.isfinite(quoted), quoted, half_spread)
+
+        fill_price = base_price * (1 + side * (half_spread + self.slippage))
+
+        # Volume participation cap; trades without a fill bar are not filled
+        requested = merged['quantity'].to_numpy(dtype=np.float64)
+        capacity = np.floor(np.nan_to_num(fill_volume) * self.participation_rate)
+        filled_quantity = np.where(np.isfinite(fill_price), np.minimum(requested, capacity), 0).astype(np.int64)
+
+        notional = filled_quantity * np.nan_to_num(fill_price)
+        transaction_cost = notional * self.commission_rate + filled_quantity * np.nan_to_num(base_price) * (half_spread + self.slippage)
+
+        result = trades.reset_index(drop=True).copy()
+        result['fill_date'] = fill_date.to_numpy()
+        result['fill_price'] = fill_price
+        result['filled_quantity'] = filled_quantity
+        result['transaction_cost'] = transaction_cost
+        result['cash_flow'] = -side * notional - notional * self.commission_rate
+
+        unfilled = int((filled_quantity < requested).sum())
+        if unfilled:
+            self.logger.info(f"{unfilled} of {len(result)} trades were partially filled or unfilled by the fill model")
+        return result
+
+    def build_matrices(self, bars: pd.DataFrame, quotes: pd.DataFrame = None) -> Dict[str, np.ndarray]:
+        """
+        Build (date x ticker) fill matrices for PortfolioBacktester, aligned with the close-price pivot.
+
+        Row t holds the price and volume capacity for an order raised on bar t: buy_price and
+        sell_price include half-spread and slippage, capacity is the share cap from volume participation.
+        """
+        opens = bars['open'].unstack('ticker').astype(np.float64)
+        closes = bars['close'].unstack('ticker').astype(np.float64)
+        volumes = bars['volume'].unstack('ticker').astype(np.float64)
+
+        if self.fill_price == 'next_open':
+            base_price = opens.shift(-1)
+            fill_volume = volumes.shift(-1)
+        elif self.fill_price == 'vwap' and 'vwap' in bars.columns:
+            base_price = bars['vwap'].unstack('ticker').astype(np.float64).fillna(closes)
+            fill_volume = volumes
+        else:
+            base_price = closes
+            fill_volume = volumes
+
+        half_spread = np.full(closes.shape[1], self.default_spread_bps / 2 / 10_000)
+        if quotes is not None and not quotes.empty:
+            quoted = quotes['half_spread'].reindex(closes.columns).to_numpy(dtype=np.float64)
+            half_spread = np.where(np.isfinite(quoted), quoted, half_spread)
+
+        base = base_price.to_numpy()
+        return {
+            'buy_price': base * (1 + half_spread + self.slippage),
+            'sell_price': base * (1 - half_spread - self.slippage),
+            'capacity': np.floor(np.nan_to_num(fill_volume.to_numpy()) * self.participation_rate),
+        }
@@ -0,0 +1,197 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Callable
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+
+# Signal encoding used in the signal matrix
+BUY = 1
+SELL = -1
+HOLD = 0
+
+
+class PortfolioBacktester:
+    """
+    Steps every ticker of a universe on a common calendar with one shared cash balance.
+
+    Prices and signals are aligned (date x ticker) matrices. The only Python loop runs over
+    the calendar; every bar is processed for all tickers at once with NumPy array operations,
+    so the cost of a bar does not grow with a per-ticker loop.
+    """
+
+    def __init__(
+        self,
+        position_sizer: Callable[[float, np.ndarray], np.ndarray],
+        starting_cash: float = None,
+        max_position_weight: float = None,
+        max_gross_exposure: float = None,
+        rebalance_frequency: int = None,
+        commission_rate: float = None,
+    ):
+        self.logger = LoggingMaster("PortfolioBacktester").get_logger()
+        self.constants = TCS()
+
+        self.position_sizer = position_sizer
+        self.starting_cash = float(starting_cash if starting_cash is not None else self.constants.STARTING_ACCOUNT_VALUE)
+        self.max_position_weight = max_position_weight if max_position_weight is not None else self.constants.MAX_INVESTMENT_PARTITION
+        self.max_gross_exposure = max_gross_exposure if max_gross_exposure is not None else self.constants.MAX_GROSS_EXPOSURE
+        self.rebalance_frequency = rebalance_frequency if rebalance_frequency is not None else self.constants.REBALANCE_FREQUENCY
+        self.commission_rate = commission_rate if commission_rate is not None else self.constants.COMMISSION_RATE
+
+    @staticmethod
+    def build_signal_matrix(signals: Dict[str, Dict[Any, Dict[str, Any]]], calendar: pd.Index, tickers: List[str]) -> np.ndarray:
+        """
+        Convert per-ticker aggregated signals ({date: {'final_action': ...}}) into an int8 matrix
+        aligned with the price matrix. Missing dates are treated as Hold.
+        """
+        action_codes = {'Buy': BUY, 'Sell': SELL}
+        matrix = np.zeros((len(calendar), len(tickers)), dtype=np.int8)
+
+        for column, ticker in enumerate(tickers):
+            ticker_signals = signals.get(ticker) or {}
+            if not ticker_signals:
+                continue
+            codes = pd.Series(
+                {date: action_codes.get(signal.get('final_action'), HOLD) for date, signal in ticker_signals.items()},
+                dtype=np.int8,
+            )
+            codes.index = pd.to_datetime(codes.index)
+            matrix[:, column] = codes.reindex(calendar, fill_value=HOLD).to_numpy()
+
+        return matrix
+
+    def run(self, prices: pd.DataFrame, signal_matrix: np.ndarray, fills: Dict[str, np.ndarray] = None) -> Dict[str, Any]:
+        """
+        Run the portfolio backtest.
+
+        :param prices: Aligned close-price matrix (index: calendar, columns: tickers). NaN means no bar.
+        :param signal_matrix: int8 matrix of the same shape holding BUY / SELL / HOLD codes.
+        :param fills: Optional fill matrices from FillModel.build_matrices (buy_price, sell_price, capacity).
+                      Without them orders fill at the signal bar's close with unlimited capacity.
+        :return: Final value, equity curve, final positions and the trade log as a DataFrame.
+        """
+        calendar = prices.index
+        tickers = np.asarray(prices.columns)
+        price_matrix = prices.to_numpy(dtype=np.float64)
+
+        if price_matrix.shape != signal_matrix.shape:
+            raise ValueError(f"Price matrix {price_matrix.shape} and signal matrix {signal_matrix.shape} are not aligned.")
+
+        n_bars, n_tickers = price_matrix.shape
+        self.logger.info(f"Running portfolio backtest over {n_bars} bars and {n_tickers} tickers with starting cash {self.starting_cash}")
+
+        buy_price_matrix = fills['buy_price'] if fills else price_matrix
+        sell_price_matrix = fills['sell_price'] if fills else price_matrix
+        capacity_matrix = fills['capacity'] if fills else None
+
+        cash = self.starting_cash
+        shares = np.zeros(n_tickers, dtype=np.int64)
+        last_price = np.full(n_tickers, np.nan)
+        equity_curve = np.empty(n_bars, dtype=np.float64)
+        exposure_curve = np.empty(n_bars, dtype=np.float64)
+        trade_chunks: List[tuple] = []
+
+        for t in range(n_bars):
+            bar = price_matrix[t]
+            valid = np.isfinite(bar) & (bar > 0)
+            last_price = np.where(valid, bar, last_price)
+            mark = np.nan_to_num(last_price)
+            signal = signal_matrix[t]
+
+            buy_price = buy_price_matrix[t]
+            sell_price = sell_price_matrix[t]
+            can_buy = valid & np.isfinite(buy_price) & (buy_price > 0)
+            can_sell = valid & np.isfinite(sell_price) & (sell_price > 0)
+            capacity = capacity_matrix[t].astype(np.int64) if capacity_matrix is not None else np.full(n_tickers, np.iinfo(np.int64).max)
+
+            # Exits: close positions on Sell, up to the bar's fill capacity
+            sell_mask = can_sell & (signal == SELL) & (shares > 0)
+            if sell_mask.any():
+                sell_qty = np.where(sell_mask, np.minimum(shares, capacity), 0)
+                capacity = capacity - sell_qty
+                cash += float(np.sum(sell_qty * np.nan_to_num(sell_price)) * (1 - self.commission_rate))
+                shares -= sell_qty
+                filled = sell_qty > 0
+                trade_chunks.append((t, np.flatnonzero(filled), SELL, sell_qty[filled], sell_price[filled]))
+
+            equity = cash + float(np.dot(shares, mark))
+            position_cap = self.max_position_weight * equity
+
+            # Periodic rebalance: trim positions that drifted above the per-name weight cap
+            if self.rebalance_frequency and t % self.rebalance_frequency == 0:
+                excess_value = shares * mark - position_cap
+                trim_mask = can_sell & (excess_value > 0)
+                if trim_mask.any():
+                    trim_qty = np.where(trim_mask, np.ceil(np.maximum(excess_value, 0) / np.where(valid, bar, 1.0)), 0).astype(np.int64)
+                    trim_qty = np.minimum(np.minimum(trim_qty, shares), np.maximum(capacity, 0))
+                    capacity = capacity - trim_qty
+                    cash += float(np.sum(trim_qty * np.nan_to_num(sell_price)) * (1 - self.commission_rate))
+                    shares -= trim_qty
+                    filled = trim_qty > 0
+                    trade_chunks.append((t, np.flatnonzero(filled), SELL, trim_qty[filled], sell_price[filled]))
+
+            # Entries: size through the shared cash balance, then apply exposure and capacity limits
+            buy_mask = can_buy & (signal == BUY)
+            if buy_mask.any() and cash > 0:
+                buy_prices = np.where(buy_mask, buy_price, np.inf)
+                requested = np.where(buy_mask, self.position_sizer(cash, buy_prices), 0)
+                headroom = np.floor(np.maximum(position_cap - shares * mark, 0) / buy_prices)
+                buy_qty = np.minimum(np.minimum(requested, headroom), np.maximum(capacity, 0)).astype(np.int64)
+                buy_qty = np.maximum(buy_qty, 0)
+
+                fill_prices = np.where(buy_mask, buy_price, 0)
+                cost = buy_qty * fill_prices * (1 + self.commission_rate)
+                total_cost = float(cost.sum())
+                gross_headroom = self.max_gross_exposure * equity - float(np.dot(shares, mark))
+                budget = min(cash, max(gross_headroom, 0.0))
+                if total_cost > budget > 0:
+                    buy_qty = np.floor(buy_qty * (budget / total_cost)).astype(np.int64)
+                    cost = buy_qty * fill_prices * (1 + self.commission_rate)
+                elif budget <= 0:
+                    buy_qty[:] = 0
+                    cost[:] = 0
+
+                filled = buy_qty > 0
+                if filled.any():
+                    cash -= float(cost.sum())
+                    shares += buy_qty
+                    trade_chunks.append((t, np.flatnonzero(filled), BUY, buy_qty[filled], buy_price[filled]))
+
+            invested = float(np.dot(shares, mark))
+            equity_curve[t] = cash + invested
+            exposure_curve[t] = invested / equity_curve[t] if equity_curve[t] > 0 else 0.0
+
+        trade_log = self._build_trade_log(trade_chunks, calendar, tickers, equity_curve)
+        final_value = float(equity_curve[-1]) if n_bars else self.starting_cash
+
+        self.logger.info(f"Portfolio backtest completed. Final value: {final_value:.2f}, trades: {len(trade_log)}")
+        return {
+            'final_portfolio_value': final_value,
+            'cash': cash,
+            'positions': pd.Series(shares, index=tickers)[shares > 0].to_dict(),
+            'equity_curve': pd.Series(equity_curve, index=calendar, name='portfolio_value'),
+            'gross_exposure': pd.Series(exposure_curve, index=calendar, name='gross_exposure'),
+            'trade_log': trade_log,
+        }
+
+    @staticmethod
+    def _build_trade_log(trade_chunks: List[tuple], calendar: pd.Index, tickers: np.ndarray, equity_curve: np.ndarray) -> pd.DataFrame:
+        """
+        Concatenate the per-bar trade arrays into a single trade log DataFrame.
+        """
+        columns = ['date', 'ticker', 'action', 'quantity', 'price', 'current_portfolio_value']
+        if not trade_chunks:
+            return pd.DataFrame(columns=columns)
+
+        bar_index = np.concatenate([np.full(len(cols), t) for t, cols, _, _, _ in trade_chunks])
+        ticker_index = np.concatenate([cols for _, cols, _, _, _ in trade_chunks])
+        actions = np.concatenate([np.full(len(cols), side) for _, cols, side, _, _ in trade_chunks])
+
+        return pd.DataFrame({
+            'date': calendar[bar_index],
+            'ticker': tickers[ticker_index],
+            'action': np.where(actions == BUY, 'Buy', 'Sell'),
+            'quantity': np.concatenate([qty for _, _, _, qty, _ in trade_chunks]),
+            'price': np.concatenate([px for _, _, _, _, px in trade_chunks]),
+            'current_portfolio_value': equity_curve[bar_index],
+        }, columns=columns)
@@ -0,0 +1,159 @@
+import os
+import json
+import pandas as pd
+import pyarrow.parquet as pq
+from typing import Dict, Any, List
+from django.utils import timezone
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+from Hybrid_Trading.Symbols.models import Tickers
+from Hybrid_Trading.Backtester.models import BacktestResults, BacktestResultsTradeLogs
+
+
+class BacktestResultStore:
+    """
+    Bulk persistence for backtest results.
+
+    Summary rows always go to BacktestResults. Trade logs are written with batched bulk_create,
+    or, for runs above BACKTEST_SIDECAR_THRESHOLD trades, to a Parquet sidecar file that the
+    summary row points to through trade_log_path.
+    """
+
+    TRADE_COLUMNS = ['action', 'quantity', 'price', 'date', 'portfolio_value']
+
+    def __init__(self, batch_size: int = None, sidecar_threshold: int = None, sidecar_dir: str = None):
+        self.logger = LoggingMaster("BacktestResultStore").get_logger()
+        self.constants = TCS()
+        self.batch_size = batch_size or self.constants.BACKTEST_BULK_BATCH_SIZE
+        self.sidecar_threshold = sidecar_threshold or self.constants.BACKTEST_SIDECAR_THRESHOLD
+        self.sidecar_dir = sidecar_dir or self.constants.BACKTEST_SIDECAR_DIR
+
+    def trades_to_frame(self, trade_logs: Any) -> pd.DataFrame:
+        """
+        Normalize a trade log (list of dicts or DataFrame): the trade log table columns come first,
+        every other per-trade field (decisions, fills, ...) is kept after them.
+        """
+        trades = trade_logs if isinstance(trade_logs, pd.DataFrame) else pd.DataFrame(list(trade_logs or []))
+        if trades.empty:
+            return pd.DataFrame(columns=self.TRADE_COLUMNS)
+
+        trades = trades.rename(columns={'current_portfolio_value': 'portfolio_value'})
+        for column in self.TRADE_COLUMNS:
+            if column not in trades.columns:
+                trades[column] = None
+        extra_columns = [column for column in trades.columns if column not in self.TRADE_COLUMNS]
+        trades = trades[self.TRADE_COLUMNS + extra_columns].copy()
+        trades['date'] = pd.to_datetime(trades['date'])
+        return trades.sort_values('date', kind='stable').reset_index(drop=True)
+
+    @staticmethod
+    def _sidecar_frame(trades: pd.DataFrame) -> pd.DataFrame:
+        # Nested per-trade fields (decision dicts, signal lists) are stored as JSON strings in Parquet
+        trades = trades.copy()
+        for column in trades.columns[trades.dtypes == object]:
+            if trades[column].map(lambda value: isinstance(value, (dict, list))).any():
+                trades[column] = trades[column].map(lambda value: json.dumps(value, default=str) if value is not None else None)
+        return trades
+
+    def write_sidecar(self, ticker_symbol: str, backtest_date, trades: pd.DataFrame) -> str:
+        """
+        Write a trade log to a Parquet sidecar and return its path.
+        """
+        os.makedirs(self.sidecar_dir, exist_ok=True)
+        file_name = f"{ticker_symbol}_{backtest_date.strftime('%Y%m%dT%H%M%S%f')}_trades.parquet"
+        file_path = os.path.join(self.sidecar_dir, file_name)
+        self._sidecar_frame(trades).to_parquet(file_path, index=False, row_group_size=self.batch_size)
+        return file_path
+
+    async def save(self, results: List[Dict[str, Any]]) -> List[BacktestResults]:
+        """
+        Persist backtest results with one bulk insert for summaries and batched inserts for trades.
+        """
+        symbols = {result.get('ticker') for result in results}
+        known_tickers = {ticker async for ticker in Tickers.objects.filter(ticker__in=symbols).values_list('ticker', flat=True)}
+
+        backtest_date = timezone.now()
+        summary_rows = []
+        inline_trades = []  # Trade frame of each summary row, None when it went to a sidecar
+        sidecar_count = 0
+
+        for result in results:
+            ticker_symbol = result.get('ticker')
+            if ticker_symbol not in known_tickers:
+                self.logger.error(f"Ticker {ticker_symbol} does not exist in the database.")
+                continue
+
+            trades = self.trades_to_frame(result.get('trade_log'))
+            inline_trade_log = None
+            trade_log_path = None
+
+            if len(trades) > self.sidecar_threshold:
+                trade_log_path = self.write_sidecar(ticker_symbol, backtest_date, trades)
+                sidecar_count += 1
+                inline_trades.append(None)
+            else:
+                inline_trade_log = json.loads(trades.to_json(orient='records', date_format='iso', default_handler=str))
+                inline_trades.append(trades)
+
+            summary_rows.append(BacktestResults(
+                ticker_id=ticker_symbol,
+                final_portfolio_value=result.get('final_portfolio_value'),
+                trade_log=inline_trade_log,
+                trade_count=len(trades),
+                trade_log_path=trade_log_path,
+                backtest_date=backtest_date,
+            ))
+
+        saved = await BacktestResults.objects.abulk_create(summary_rows, batch_size=self.batch_size)
+
+        # Trade rows point at their own summary row, so reruns of a ticker never collide or mix
+        trade_rows = [
+            BacktestResultsTradeLogs(
+                ticker_id=summary.ticker_id,
+                backtest_result=summary,
+                action=row.action,
+                quantity=row.quantity,
+                price=row.price,
+                date=row.date.to_pydatetime(),
+                portfolio_value=row.portfolio_value,
+            )
+            for summary, trades in zip(saved, inline_trades) if trades is not None
+            for row in trades[self.TRADE_COLUMNS].itertuples(index=False)
+        ]
+        await BacktestResultsTradeLogs.objects.abulk_create(trade_rows, batch_size=self.batch_size)
+
+        self.logger.info(
+            f"Saved {len(saved)} backtest results, {len(trade_rows)} trade log rows and {sidecar_count} Parquet sidecars"
+        )
+        return saved
+
+    def load_trade_page(self, backtest_result: BacktestResults, page: int = 1, page_size: int = 500) -> pd.DataFrame:
+        """
+        Return one page of trades for a backtest result, reading only the Parquet row groups it spans.
+        """
+        offset = max(page - 1, 0) * page_size
+
+        if not backtest_result.trade_log_path:
+            trade_logs = BacktestResultsTradeLogs.objects.filter(
+                backtest_result=backtest_result
+            ).order_by('date', 'id').values(*self.TRADE_COLUMNS)[offset:offset + page_size]
+            return pd.DataFrame(list(trade_logs), columns=self.TRADE_COLUMNS)
+
+        parquet_file = pq.ParquetFile(backtest_result.trade_log_path)
+        row_groups = []
+        group_start = 0
+        first_group_start = None
+        for group in range(parquet_file.num_row_groups):
+            group_rows = parquet_file.metadata.row_group(group).num_rows
+            group_end = group_start + group_rows
+            if group_end > offset and group_start < offset + page_size:
+                row_groups.append(group)
+                if first_group_start is None:
+                    first_group_start = group_start
+            group_start = group_end
+
+        if not row_groups:
+            return pd.DataFrame(columns=self.TRADE_COLUMNS)
+
+        table = parquet_file.read_row_groups(row_groups, columns=self.TRADE_COLUMNS)
+        return table.slice(offset - first_group_start, page_size).to_pandas()
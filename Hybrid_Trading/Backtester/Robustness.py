@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
+from tqdm import tqdm
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+
+METRICS = ('sharpe_ratio', 'sortino_ratio', 'max_drawdown', 'volatility', 'annualized_return')
+METHODS = ('block_bootstrap', 'trade_reshuffle', 'noise_injection')
+
+
+def batch_metrics(returns: np.ndarray, risk_free_rate: float = 0.01) -> Dict[str, np.ndarray]:
+    """
+    Compute the PerformanceMetrics formulas row-wise over a (n_resamples x n_periods) return matrix.
+    """
+    n_periods = returns.shape[1]
+    mean = returns.mean(axis=1)
+    excess_std = returns.std(axis=1, ddof=1)
+
+    negative = np.where(returns < 0, returns, 0.0)
+    negative_count = (returns < 0).sum(axis=1)
+    downside_risk = np.sqrt((negative ** 2).sum(axis=1) / np.maximum(negative_count, 1))
+
+    growth = np.cumprod(1 + returns, axis=1)
+    drawdown = np.maximum.accumulate(growth, axis=1) - growth
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'sharpe_ratio': (mean - risk_free_rate) / excess_std * np.sqrt(252),
+            'sortino_ratio': np.where(negative_count > 0, (mean - risk_free_rate) / downside_risk * np.sqrt(252), np.nan),
+            'max_drawdown': drawdown.max(axis=1),
+            'volatility': excess_std * np.sqrt(252),
+            'annualized_return': growth[:, -1] ** (252 / n_periods) - 1,
+        }
+
+
+def resample(returns: np.ndarray, method: str, n_resamples: int, rng: np.random.Generator,
+             block_size: int = 20, noise_scale: float = 0.5) -> np.ndarray:
+    """
+    Draw a (n_resamples x n_periods) matrix of resampled return paths in one batch.
+
+    - block_bootstrap: circular block bootstrap, keeps autocorrelation within blocks
+    - trade_reshuffle: random permutations of the trade/return order (path metrics only)
+    - noise_injection: adds Gaussian noise scaled to noise_scale x the return volatility
+    """
+    n_periods = returns.shape[0]
+
+    if method == 'block_bootstrap':
+        block_size = max(1, min(block_size, n_periods))
+        n_blocks = -(-n_periods // block_size)
+        starts = rng.integers(0, n_periods, size=(n_resamples, n_blocks, 1))
+        index = ((starts + np.arange(block_size)) % n_periods).reshape(n_resamples, -1)[:, :n_periods]
+        return returns[index]
+
+    if method == 'trade_reshuffle':
+        return rng.permuted(np.broadcast_to(returns, (n_resamples, n_periods)), axis=1)
+
+    if method == 'noise_injection':
+        noise = rng.standard_normal((n_resamples, n_periods)) * (noise_scale * returns.std(ddof=1))
+        return returns + noise
+
+    raise ValueError(f"Unsupported resampling method '{method}'. Expected one of {METHODS}.")
+
+
+def confidence_intervals(returns: np.ndarray, method: str, n_resamples: int, confidence: float, seed: Optional[int],
+                         block_size: int, noise_scale: float, chunk_size: int, risk_free_rate: float = 0.01) -> Dict[str, Dict[str, float]]:
+    """
+    Resample in chunks, compute metrics in batch and summarize them as confidence intervals.
+    """
+    rng = np.random.default_rng(seed)
+    point = {name: float(values[0]) for name, values in batch_metrics(returns[np.newaxis, :], risk_free_rate).items()}
+
+    samples = {name: [] for name in METRICS}
+    for start in range(0, n_resamples, chunk_size):
+        paths = resample(returns, method, min(chunk_size, n_resamples - start), rng, block_size, noise_scale)
+        for name, values in batch_metrics(paths, risk_free_rate).items():
+            samples[name].append(values)
+
+    tail = (1 - confidence) / 2 * 100
+    summary = {}
+    for name in METRICS:
+        values = np.concatenate(samples[name])
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            summary[name] = {'point': point[name], 'mean': np.nan, 'std': np.nan, 'lower': np.nan, 'upper': np.nan}
+            continue
+        lower, upper = np.percentile(values, [tail, 100 - tail])
+        summary[name] = {
+            'point': point[name],
+            'mean': float(values.mean()),
+            'std': float(values.std()),
+            'lower': float(lower),
+            'upper': float(upper),
+        }
+    return summary
+
+
+def _analyze_worker(args: tuple) -> tuple:
+    """
+    Process-pool entry point: (ticker, returns, kwargs) -> (ticker, summary).
+    """
+    ticker, returns, kwargs = args
+    return ticker, confidence_intervals(returns, **kwargs)
+
+
+class RobustnessAnalyzer:
+    """
+    Monte Carlo / bootstrap confidence intervals for backtest metrics.
+
+    Resampled paths are generated as one NumPy matrix per chunk and all metrics are computed
+    row-wise, so thousands of resamples of a daily return series take a few hundred
+    milliseconds. Large universes can fan out over a process pool with analyze_universe.
+    """
+
+    def __init__(self, n_resamples: int = None, confidence: float = 0.95, block_size: int = None,
+                 noise_scale: float = 0.5, chunk_size: int = 1000, seed: Optional[int] = None,
+                 risk_free_rate: float = 0.01):
+        self.logger = LoggingMaster("RobustnessAnalyzer").get_logger()
+        self.constants = TCS()
+        self.n_resamples = n_resamples or self.constants.ROBUSTNESS_RESAMPLES
+        self.confidence = confidence
+        self.block_size = block_size or self.constants.ROBUSTNESS_BLOCK_SIZE
+        self.noise_scale = noise_scale
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.risk_free_rate = risk_free_rate  # Same per-period convention as PerformanceMetrics
+
+    @staticmethod
+    def returns_from_trade_log(trade_log: Any) -> np.ndarray:
+        """
+        Derive a return series from a trade list using the portfolio value recorded after each trade.
+        """
+        trades = trade_log if isinstance(trade_log, pd.DataFrame) else pd.DataFrame(list(trade_log or []))
+        value_column = 'current_portfolio_value' if 'current_portfolio_value' in trades.columns else 'portfolio_value'
+        if trades.empty or value_column not in trades.columns:
+            return np.array([])
+
+        values = trades.sort_values('date', kind='stable').groupby('date')[value_column].last()
+        return values.pct_change().dropna().to_numpy(dtype=np.float64)
+
+    def _kwargs(self, method: str) -> Dict[str, Any]:
+        if method not in METHODS:
+            raise ValueError(f"Unsupported resampling method '{method}'. Expected one of {METHODS}.")
+        return {
+            'method': method,
+            'n_resamples': self.n_resamples,
+            'confidence': self.confidence,
+            'seed': self.seed,
+            'block_size': self.block_size,
+            'noise_scale': self.noise_scale,
+            'chunk_size': self.chunk_size,
+            'risk_free_rate': self.risk_free_rate,
+        }
+
+    def analyze(self, returns: Any = None, trade_log: Any = None, method: str = 'block_bootstrap') -> Dict[str, Dict[str, float]]:
+        """
+        Confidence intervals for one backtest, from its return series or its trade list.
+        """
+        if returns is None:
+            returns = self.returns_from_trade_log(trade_log)
+        returns = np.asarray(returns, dtype=np.float64)
+        returns = returns[np.isfinite(returns)]
+
+        if returns.size < 2:
+            self.logger.error("Not enough returns for robustness analysis.")
+            return {}
+
+        summary = confidence_intervals(returns, **self._kwargs(method))
+        self.logger.info(f"Robustness analysis ({method}, {self.n_resamples} resamples) completed for {returns.size} periods")
+        return summary
+
+    def analyze_universe(self, returns_by_ticker: Dict[str, Any], method: str = 'block_bootstrap',
+                         max_workers: int = None) -> pd.DataFrame:
+        """
+        Confidence intervals for many tickers. With max_workers > 1 tickers are spread over a process pool.
+        Returns a DataFrame indexed by (ticker, metric).
+        """
+        kwargs = self._kwargs(method)
+        jobs: List[tuple] = []
+        for ticker, returns in returns_by_ticker.items():
+            returns = np.asarray(returns, dtype=np.float64)
+            returns = returns[np.isfinite(returns)]
+            if returns.size >= 2:
+                jobs.append((ticker, returns, kwargs))
+            else:
+                self.logger.warning(f"Not enough returns for robustness analysis of {ticker}.")
+
+        results = {}
+        if max_workers and max_workers > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for ticker, summary in tqdm(executor.map(_analyze_worker, jobs, chunksize=8), total=len(jobs), desc="Robustness Analysis"):
+                    results[ticker] = summary
+        else:
+            for job in tqdm(jobs, desc="Robustness Analysis"):
+                ticker, summary = _analyze_worker(job)
+                results[ticker] = summary
+
+        rows = {(ticker, metric): values for ticker, summary in results.items() for metric, values in summary.items()}
+        return pd.DataFrame.from_dict(rows, orient='index').rename_axis(['ticker', 'metric'])
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backtester_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backtestresults',
+            name='trade_count',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='backtestresults',
+            name='trade_log_path',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
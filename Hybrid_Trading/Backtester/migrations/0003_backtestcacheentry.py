@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backtester_app', '0002_backtestresults_trade_log_sidecar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BacktestCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cache_key', models.CharField(max_length=64, unique=True)),
+                ('tickers', models.JSONField()),
+                ('data_version', models.CharField(max_length=128)),
+                ('config', models.JSONField(blank=True, null=True)),
+                ('result', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'Hybrid_Trading_Schema.backtest_cache',
+            },
+        ),
+    ]
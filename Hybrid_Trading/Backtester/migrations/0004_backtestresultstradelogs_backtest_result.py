@@ -0,0 +1,25 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backtester_app', '0003_backtestcacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backtestresultstradelogs',
+            name='backtest_result',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='trade_rows', to='backtester_app.backtestresults'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='backtestresultstradelogs',
+            unique_together={('backtest_result', 'date', 'action')},
+        ),
+        migrations.AddIndex(
+            model_name='backtestresultstradelogs',
+            index=models.Index(fields=['backtest_result', 'date'], name='idx_bt_logs_result_date'),
+        ),
+    ]
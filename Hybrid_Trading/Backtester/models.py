@@ -6,6 +6,8 @@ class BacktestResults(models.Model):
     ticker = models.ForeignKey(Tickers, on_delete=models.DO_NOTHING, db_column='ticker', to_field='ticker')  # ForeignKey to Tickers
     final_portfolio_value = models.FloatField(blank=True, null=True)  # Final value of the portfolio after the backtest
     trade_log = models.JSONField(blank=True, null=True)  # Trade logs as a JSON field
+    trade_count = models.IntegerField(blank=True, null=True)  # Number of trades in the backtest
+    trade_log_path = models.TextField(blank=True, null=True)  # Parquet sidecar holding the trade log for large runs
     backtest_date = models.DateTimeField(blank=True, null=True)  # Date when the backtest was conducted
 
     class Meta:
@@ -18,6 +20,7 @@ class BacktestResults(models.Model):
 
 class BacktestResultsTradeLogs(models.Model):
     ticker = models.ForeignKey(Tickers, on_delete=models.CASCADE, db_column='ticker', to_field='ticker')  # ForeignKey to Tickers
+    backtest_result = models.ForeignKey(BacktestResults, on_delete=models.CASCADE, blank=True, null=True, related_name='trade_rows')  # Backtest run the trade belongs to
     action = models.CharField(max_length=10)  # Action taken (buy/sell/etc.)
     quantity = models.IntegerField()  # Quantity of shares
     price = models.FloatField()  # Price of the stock at the time of the trade
@@ -27,10 +30,25 @@ class BacktestResultsTradeLogs(models.Model):
 
     class Meta:
         db_table = 'Hybrid_Trading_Schema.backtest_results_trade_logs'  # Custom table name
-        unique_together = (('ticker', 'date', 'action'),)  # Ensure unique combination of ticker, date, and action
+        unique_together = (('backtest_result', 'date', 'action'),)  # Unique per backtest run, so reruns keep their own trades
         indexes = [
             models.Index(fields=['ticker', 'date', 'action'], name='idx_bt_logs_tda'),  # Shortened index name for performance
+            models.Index(fields=['backtest_result', 'date'], name='idx_bt_logs_result_date'),  # Paging one run's trades
         ]
 
     def __str__(self):
-        return f"{self.ticker} - {self.action} on {self.date}"
\ No newline at end of file
+        return f"{self.ticker} - {self.action} on {self.date}"
+
+class BacktestCacheEntry(models.Model):
+    cache_key = models.CharField(max_length=64, unique=True)  # SHA-256 of strategy config, parameters and data version
+    tickers = models.JSONField()  # Tickers covered by the cached run, used to prune superseded entries
+    data_version = models.CharField(max_length=128)  # Max bar date, row count and close checksum of the price slice
+    config = models.JSONField(blank=True, null=True)  # Normalized user input the result was produced with
+    result = models.JSONField()  # Cached backtest result
+    created_at = models.DateTimeField(auto_now_add=True)  # Timestamp when the entry was cached
+
+    class Meta:
+        db_table = 'Hybrid_Trading_Schema.backtest_cache'  # Custom table name for cached backtest results
+
+    def __str__(self):
+        return f"{', '.join(self.tickers)} - cached on {self.created_at}"
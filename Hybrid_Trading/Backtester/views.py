@@ -2,6 +2,7 @@ from django.shortcuts import render
 from django.views.generic import FormView
 from .forms import BacktestForm
 from Hybrid_Trading.Backtester.Day_Trading_Backtester import DayTradingBacktester
+from Hybrid_Trading.Backtester.Backtest_Cache import BacktestResultCache
 import plotly.graph_objects as go  # For Plotly
 from bokeh.plotting import figure  # For Bokeh
 from bokeh.embed import components
@@ -22,13 +23,21 @@ class BacktestView(FormView):
         Async method to run the backtest using DayTradingBacktester
         and send real-time updates via WebSocket.
         """
-        backtester = DayTradingBacktester(user_input, "/tmp")
-
-        # Run the backtest asynchronously
-        await backtester.run()
-
-        # Fetch results
-        results = backtester.export_results()
+        tickers = [user_input['ticker']]
+        cache = BacktestResultCache()
+
+        # Serve identical submissions on unchanged data straight from the cache
+        cache_key, data_version, results = await cache.lookup(user_input, tickers)
+        if results is None:
+            backtester = DayTradingBacktester(user_input, "/tmp")
+
+            # Run the backtest asynchronously
+            backtest_results = await backtester.run(
+                [{'ticker': ticker} for ticker in tickers],
+                user_input.get('start_date'),
+                user_input.get('end_date')
+            )
+            results = await cache.store(cache_key, data_version, user_input, tickers, backtest_results)
 
         # Send the final results to WebSocket clients
         channel_layer = get_channel_layer()
@@ -1,11 +1,15 @@
-from django.views.generic import TemplateView
+from django.views.generic import TemplateView, View
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.db import connection
 import plotly.graph_objs as go
 import pandas as pd
 from Hybrid_Trading.Model_Trainer.models import ModelEvaluation, ModelPrediction, TradeSignal
 from Hybrid_Trading.Backtester.models import BacktestResults, BacktestResultsTradeLogs
+from Hybrid_Trading.Backtester.Result_Store import BacktestResultStore
 from Hybrid_Trading.Trading.models import PerformanceMetrics, TradeLogs, Signals
+import json
 import logging
 
 # Set up logging
@@ -101,7 +105,7 @@ class DashboardView(TemplateView):
         if self.table_exists('backtest_results'):
             backtest_results = BacktestResults.objects.filter(
                 backtest_date__lte=timezone.now()
-            ).values('ticker__ticker', 'final_portfolio_value', 'trade_log', 'backtest_date')
+            ).values('id', 'ticker__ticker', 'final_portfolio_value', 'trade_count', 'trade_log_path', 'backtest_date')  # Summaries only; trades are paged
             df = pd.DataFrame(backtest_results)
             print("Backtest Results Data Columns:", df.columns)  # For debugging
             print("Backtest Results Data Sample:\n", df.head())  # For debugging
@@ -308,4 +312,29 @@ class DashboardView(TemplateView):
             return df
         else:
             logger.info("BacktestResultsTradeLogs table does not exist.")
-            return pd.DataFrame()
\ No newline at end of file
+            return pd.DataFrame()
+
+
+class BacktestTradePageView(View):
+    """
+    Serve one page of a backtest's trade log, read from the DB or from its Parquet sidecar.
+    """
+    def get(self, request, result_id):
+        backtest_result = get_object_or_404(BacktestResults, pk=result_id)
+        try:
+            page = int(request.GET.get('page', 1))
+            page_size = int(request.GET.get('page_size', 500))
+        except ValueError:
+            return JsonResponse({'error': 'page and page_size must be integers.'}, status=400)
+        if page < 1 or page_size < 1:
+            return JsonResponse({'error': 'page and page_size must be positive.'}, status=400)
+        page_size = min(page_size, 5000)
+
+        trades = BacktestResultStore().load_trade_page(backtest_result, page=page, page_size=page_size)
+        return JsonResponse({
+            'ticker': backtest_result.ticker_id,
+            'page': page,
+            'page_size': page_size,
+            'trade_count': backtest_result.trade_count,
+            'trades': json.loads(trades.to_json(orient='records', date_format='iso')),
+        })
@@ -7,4 +7,5 @@ app_name = 'dashboard'
 
 urlpatterns = [
     path('', dashboard_view.DashboardView.as_view(), name='dashboard'),
+    path('backtest_trades/<int:result_id>/', dashboard_view.BacktestTradePageView.as_view(), name='backtest_trades'),
 ]
\ No newline at end of file
@@ -0,0 +1,211 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+import holidays
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Tuple
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+
+# Typical school break windows as ((month, day), (month, day)), inclusive; the winter break runs into the next year
+SCHOOL_BREAKS = [
+    ((12, 20), (1, 10)),  # Winter break
+    ((6, 1), (8, 15)),    # Summer break
+    ((8, 15), (9, 15)),   # Back-to-school
+]
+
+
+class CalendarRange:
+    """
+    Session and school-break masks over whole years from start_year to end_year, with the
+    cumulative session count. Immutable once built, so lookups can use one without locking.
+    """
+
+    def __init__(self, start_year: int, end_year: int, session_mask: np.ndarray, school_break_mask: np.ndarray):
+        self.start_year = start_year
+        self.end_year = end_year
+        self.origin = np.datetime64(f"{start_year}-01-01", 'D')
+        self.days = np.arange(self.origin, np.datetime64(f"{end_year + 1}-01-01", 'D'))
+        self.session_mask = session_mask
+        self.school_break_mask = school_break_mask
+        self.sessions = self.days[session_mask]
+        # sessions_before[i] is the number of sessions strictly before day i
+        self.sessions_before = np.concatenate([[0], np.cumsum(session_mask)])
+
+
+class TradingCalendar:
+    """
+    Precomputed trading calendar for a range of years.
+
+    One boolean session mask (weekdays minus the market's holidays) and one school-break mask
+    are built per day of the range and persisted as .npz, along with the cumulative session
+    count. is_session, next_session, previous_session, last_session and sessions_between are
+    array lookups into those masks, vectorized over any array of dates. Dates outside the range
+    extend it on demand: a wider CalendarRange is built (or loaded) and swapped in.
+    """
+
+    def __init__(self, start_year: int = None, end_year: int = None, market: str = None, cache_dir: str = None):
+        self.logger = LoggingMaster("TradingCalendar").get_logger()
+        self.constants = TCS()
+        self.market = market or self.constants.TRADING_CALENDAR_MARKET
+        self.cache_dir = cache_dir or self.constants.TRADING_CALENDAR_DIR
+        self._extend_lock = threading.Lock()
+        self.range = self._load_or_build(start_year or self.constants.TRADING_CALENDAR_START_YEAR,
+                                         end_year or datetime.now().year + self.constants.TRADING_CALENDAR_YEARS_AHEAD)
+
+    @property
+    def start_year(self) -> int:
+        return self.range.start_year
+
+    @property
+    def end_year(self) -> int:
+        return self.range.end_year
+
+    @property
+    def sessions(self) -> np.ndarray:
+        return self.range.sessions
+
+    def _cache_path(self, start_year: int, end_year: int) -> str:
+        file_name = f"{self.market}_{start_year}_{end_year}_holidays-{holidays.__version__}.npz"
+        return os.path.join(self.cache_dir, file_name)
+
+    def _load_or_build(self, start_year: int, end_year: int) -> CalendarRange:
+        cache_path = self._cache_path(start_year, end_year)
+        if os.path.exists(cache_path):
+            with np.load(cache_path) as cached:
+                return CalendarRange(start_year, end_year, cached['session_mask'], cached['school_break_mask'])
+
+        session_mask, school_break_mask = self._build(start_year, end_year)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            np.savez_compressed(cache_path, session_mask=session_mask, school_break_mask=school_break_mask)
+            self.logger.info(f"Trading calendar {self.market} {start_year}-{end_year} saved to {cache_path}")
+        except OSError as e:
+            self.logger.warning(f"Could not persist trading calendar: {e}")
+        return CalendarRange(start_year, end_year, session_mask, school_break_mask)
+
+    def _build(self, start_year: int, end_year: int) -> Tuple[np.ndarray, np.ndarray]:
+        origin = np.datetime64(f"{start_year}-01-01", 'D')
+        days = np.arange(origin, np.datetime64(f"{end_year + 1}-01-01", 'D'))
+        market_holidays = holidays.financial_holidays(self.market, years=range(start_year, end_year + 1))
+        holiday_days = np.array(sorted(market_holidays.keys()), dtype='datetime64[D]')
+
+        # 1970-01-01 was a Thursday, so (days since epoch + 3) % 7 gives Monday = 0
+        weekday = (days.astype(np.int64) + 3) % 7
+        session_mask = (weekday < 5) & ~np.isin(days, holiday_days)
+
+        # Mark each inclusive break window with +1/-1 and take the running sum
+        marks = np.zeros(len(days) + 1, dtype=np.int64)
+        for year in range(start_year - 1, end_year + 1):
+            for (start_month, start_day), (end_month, end_day) in SCHOOL_BREAKS:
+                window_end_year = year + 1 if (end_month, end_day) < (start_month, start_day) else year
+                start = np.datetime64(f"{year}-{start_month:02d}-{start_day:02d}", 'D') - origin
+                end = np.datetime64(f"{window_end_year}-{end_month:02d}-{end_day:02d}", 'D') - origin
+                start, end = max(int(start.astype(np.int64)), 0), min(int(end.astype(np.int64)), len(days) - 1)
+                if start <= end:
+                    marks[start] += 1
+                    marks[end + 1] -= 1
+        school_break_mask = np.cumsum(marks[:-1]) > 0
+
+        return session_mask, school_break_mask
+
+    def _extend(self, days: np.ndarray) -> CalendarRange:
+        """
+        Swap in a range covering the given days, with a year of margin on the extended side so
+        that previous_session/next_session of the outermost dates still find a session.
+        """
+        first_year = int(str(days.min())[:4])
+        last_year = int(str(days.max())[:4])
+        with self._extend_lock:
+            current = self.range
+            start_year = first_year - 1 if first_year < current.start_year else current.start_year
+            end_year = last_year + 1 if last_year > current.end_year else current.end_year
+            if (start_year, end_year) != (current.start_year, current.end_year):
+                self.logger.info(f"Extending trading calendar {self.market} to {start_year}-{end_year}")
+                self.range = self._load_or_build(start_year, end_year)
+            return self.range
+
+    def _offsets(self, dates: Any) -> Tuple[np.ndarray, np.ndarray, bool, CalendarRange]:
+        """
+        Convert dates (scalar or array-like) into day offsets into the masks of a range covering them.
+        Returns (offsets, valid, is_scalar, range); NaT entries are marked invalid.
+        """
+        is_scalar = np.ndim(dates) == 0
+        index = pd.DatetimeIndex(pd.to_datetime([dates] if is_scalar else dates))
+        if index.tz is not None:
+            index = index.tz_localize(None)
+
+        days = index.values.astype('datetime64[D]')
+        valid = ~np.isnat(days)
+        calendar_range = self.range
+        if valid.any() and (days[valid].min() < calendar_range.days[0] or days[valid].max() > calendar_range.days[-1]):
+            calendar_range = self._extend(days[valid])
+        offsets = np.where(valid, (days - calendar_range.origin).astype(np.int64), 0)
+        return offsets, valid, is_scalar, calendar_range
+
+    @staticmethod
+    def _session_dates(calendar_range: CalendarRange, positions: np.ndarray, valid: np.ndarray, is_scalar: bool):
+        sessions = calendar_range.sessions
+        valid = valid & (positions >= 0) & (positions < len(sessions))
+        result = pd.DatetimeIndex(np.where(valid, sessions[np.clip(positions, 0, max(len(sessions) - 1, 0))], np.datetime64('NaT')))
+        return result[0] if is_scalar else result
+
+    def is_session(self, dates: Any):
+        offsets, valid, is_scalar, calendar_range = self._offsets(dates)
+        result = calendar_range.session_mask[offsets] & valid
+        return bool(result[0]) if is_scalar else result
+
+    def is_school_break(self, dates: Any, year: int = None):
+        """Whether each date falls in a school break window; with `year`, only the windows starting in that year."""
+        offsets, valid, is_scalar, calendar_range = self._offsets(dates)
+        result = calendar_range.school_break_mask[offsets] & valid
+        if year is not None:
+            # The year's windows run from its earliest start to its latest end (the winter break ends next year)
+            first = min(np.datetime64(f"{year}-{month:02d}-{day:02d}", 'D') for (month, day), _ in SCHOOL_BREAKS)
+            last = max(
+                np.datetime64(f"{year + ((end_month, end_day) < (start_month, start_day))}-{end_month:02d}-{end_day:02d}", 'D')
+                for (start_month, start_day), (end_month, end_day) in SCHOOL_BREAKS
+            )
+            origin = calendar_range.origin
+            result &= (offsets >= (first - origin).astype(np.int64)) & (offsets <= (last - origin).astype(np.int64))
+        return bool(result[0]) if is_scalar else result
+
+    def next_session(self, dates: Any):
+        """First session strictly after each date."""
+        offsets, valid, is_scalar, calendar_range = self._offsets(dates)
+        return self._session_dates(calendar_range, calendar_range.sessions_before[offsets + 1], valid, is_scalar)
+
+    def previous_session(self, dates: Any):
+        """Last session strictly before each date."""
+        offsets, valid, is_scalar, calendar_range = self._offsets(dates)
+        return self._session_dates(calendar_range, calendar_range.sessions_before[offsets] - 1, valid, is_scalar)
+
+    def last_session(self, dates: Any):
+        """Most recent session on or before each date."""
+        offsets, valid, is_scalar, calendar_range = self._offsets(dates)
+        return self._session_dates(calendar_range, calendar_range.sessions_before[offsets + 1] - 1, valid, is_scalar)
+
+    def sessions_between(self, start_date: Any, end_date: Any) -> pd.DatetimeIndex:
+        """All sessions between two dates, both inclusive."""
+        (start, end), _, _, calendar_range = self._offsets([start_date, end_date])
+        return pd.DatetimeIndex(calendar_range.sessions[calendar_range.sessions_before[start]:calendar_range.sessions_before[end + 1]])
+
+    def filter_frame(self, data: pd.DataFrame, date_col: str = 'date', exclude_school_breaks: bool = False) -> pd.DataFrame:
+        """
+        Keep only the rows of a frame that fall on sessions (and optionally outside school breaks).
+        """
+        offsets, valid, _, calendar_range = self._offsets(data[date_col])
+        keep = calendar_range.session_mask[offsets] & valid
+        if exclude_school_breaks:
+            keep &= ~calendar_range.school_break_mask[offsets]
+        return data[keep]
+
+
+@lru_cache(maxsize=None)
+def get_trading_calendar() -> TradingCalendar:
+    """
+    Process-wide calendar over the configured year range, built or loaded once.
+    """
+    return TradingCalendar()
@@ -13,9 +13,10 @@ from asgiref.sync import async_to_sync
 import uuid  # For generating unique task IDs
 
 class DTPipelineOrchestrator:
-    def __init__(self, tickers, interval, start_date, end_date, period, fillna_method, sentiment_type):
+    def __init__(self, tickers, interval, start_date, end_date, period, fillna_method, sentiment_type, covered_models=None):
         """
         Initialize the pipeline orchestrator using form data.
+        covered_models maps tickers to the forecast models another run already produced.
         """
         self.tickers = tickers
         self.interval = interval
@@ -28,7 +29,7 @@ class DTPipelineOrchestrator:
         self.logger = LoggingMaster("TradingPipelineOrchestrator").get_logger()
 
         # Initializing each pipeline stage with relevant parameters
-        self.fetch_stage = FetchDataStage(tickers, interval, start_date, end_date, period, fillna_method)
+        self.fetch_stage = FetchDataStage(tickers, interval, start_date, end_date, period, fillna_method, covered_models)
         self.generate_signals_stage = GenerateSignalsStage(tickers, start_date, end_date, fillna_method, sentiment_type)
         self.execute_trades_stage = ExecuteTradesStage(tickers)
         self.track_performance_stage = TrackPerformanceStage(tickers)  # This should be the final stage
@@ -44,6 +45,12 @@ class DTPipelineOrchestrator:
         self.channel_layer = get_channel_layer()
         self.group_name = f'progress_{self.task_id}'  # Group name for sending WebSocket updates
 
+    def skip_covered_models(self, covered_models):
+        """
+        Skip the forecast models another run (e.g. the global forecaster) already produced, per ticker.
+        """
+        self.fetch_stage.forecaster.covered_models = covered_models
+
     async def run_day_trading_pipeline(self):
         """
         Run the entire day trading pipeline asynchronously.
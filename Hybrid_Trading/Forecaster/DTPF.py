@@ -1,22 +1,23 @@
 import os
 import threading
-from typing import Dict, Tuple
+import numpy as np
+from typing import Any, Dict, Iterable, Tuple
 import pandas as pd
-import xgboost as xgb
 from darts import TimeSeries
-from darts.models import ARIMA, ExponentialSmoothing, Theta, RNNModel
 from darts.utils.missing_values import fill_missing_values
-from sklearn.metrics import mean_squared_error, mean_absolute_percentage_error
 from lime.lime_tabular import LimeTabularExplainer
 import shap
-from bokeh.plotting import figure, save
-from bokeh.models import HoverTool
 from datetime import datetime, timedelta
-from plyer import notification
 from dotenv import load_dotenv
-import holidays
 from Hybrid_Trading.Model_Trainer.Self_Teaching import SelfTeaching
 from Hybrid_Trading.Log.Logging_Master import LoggingMaster  # Import LoggingMaster for consistent logging
+from Config.trading_constants import TCS
+from Hybrid_Trading.Data.Trading_Calendar import get_trading_calendar
+from Hybrid_Trading.Forecaster.Forecast_Store import ForecastStore
+from Hybrid_Trading.Forecaster.Model_Cache import ForecastModelCache
+from Hybrid_Trading.Forecaster.Model_Executor import ParallelModelFitter, SERIES_MODELS, fit_series_model, fit_xgboost_model
+from Hybrid_Trading.Forecaster.Incremental_Forecaster import IncrementalForecaster
+from Hybrid_Trading.Forecaster.Model_Selection import ModelSelectionRegistry
 from Hybrid_Trading.Data.models import HistoricalData, FinancialRatios, TechnicalIndicators  # Import relevant models
 
 # Load environment variables
@@ -24,7 +25,8 @@ load_dotenv()
 
 class DayTimeForecaster:
     def __init__(self, tickers: str, interval: str, start_date: str, end_date: str, period: str,
-                 prediction_horizon: int = 5, fill_na_method: str = 'mean'):
+                 prediction_horizon: int = 5, fill_na_method: str = 'mean', model_timeouts: Dict[str, float] = None,
+                 headless: bool = None, covered_models: Dict[str, Iterable[str]] = None):
         self.tickers = tickers  # Now handling multiple tickers
         self.interval = interval
         self.start_date = start_date
@@ -43,34 +45,40 @@ class DayTimeForecaster:
 
         )
 
-        # Define U.S. holidays for filtering
-        self.holidays = holidays.US()
+        # Headless runs only persist forecast arrays; charts are rendered on demand by ForecastChartRenderer
+        self.headless = TCS().FORECAST_HEADLESS if headless is None else headless
+        self.forecast_store = ForecastStore()
+
+        # Shared precomputed trading calendar for holiday and school-break filtering
+        self.calendar = get_trading_calendar()
+
+        # Fits the candidate models concurrently; models are cached on disk and warm-started by the workers
+        self.model_fitter = ParallelModelFitter(timeouts=model_timeouts)
+
+        # Routine runs only fit the ticker's best models; full tournaments are scheduled or triggered by degradation
+        self.model_selection = ModelSelectionRegistry()
+
+        # Models another run (e.g. the global forecaster) already produced, per ticker; they are not refitted here
+        self.covered_models = covered_models or {}
+
+        # Intraday bars update the cached ARIMA/ExponentialSmoothing fits in place; started on the first bar
+        self.incremental = None
+        self._last_bar_time = None
 
     def exclude_holidays(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Remove rows that fall on U.S. holidays."""
+        """Remove rows that do not fall on trading sessions (weekends and market holidays)."""
         data['date'] = pd.to_datetime(data['date'])
-        is_holiday = data['date'].isin(self.holidays)
-        non_holiday_data = data[~is_holiday]
+        non_holiday_data = self.calendar.filter_frame(data)
         self.logger.info(f"Excluded {len(data) - len(non_holiday_data)} holiday rows from data.")
         return non_holiday_data
 
     def filter_school_breaks(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Exclude typical school break times and back-to-school periods."""
+        """Exclude typical school break times and back-to-school periods of the current year."""
         current_year = datetime.now().year
-
-        # Define typical school breaks dynamically based on the current year
-        school_breaks = [
-            (datetime(current_year, 12, 20), datetime(current_year + 1, 1, 10)),  # Winter break
-            (datetime(current_year, 6, 1), datetime(current_year, 8, 15)),  # Summer break
-            (datetime(current_year, 8, 15), datetime(current_year, 9, 15))  # Back-to-school
-        ]
-
         data['date'] = pd.to_datetime(data['date'])
-        for start, end in school_breaks:
-            data = data[~((data['date'] >= start) & (data['date'] <= end))]
-
-        self.logger.info(f"Excluded school break and back-to-school dates for {current_year}.")
-        return data
+        filtered_data = data[~self.calendar.is_school_break(data['date'], year=current_year)]
+        self.logger.info(f"Excluded {len(data) - len(filtered_data)} school break and back-to-school rows for {current_year}.")
+        return filtered_data
 
     def fetch_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Fetch required data using Django ORM."""
@@ -155,54 +163,75 @@ class DayTimeForecaster:
         # Handle missing values
         series = fill_missing_values(series)
 
-        results = {}
-
-        # ARIMA model
-        self.logger.info("Running ARIMA model...")
-        arima_model = ARIMA()
-        arima_model.fit(series)
-        arima_forecast = arima_model.predict(self.prediction_horizon)
-        results['ARIMA'] = (arima_forecast, arima_model.rmse(), arima_model.mape())
-
-        # Exponential Smoothing model
-        self.logger.info("Running Exponential Smoothing model...")
-        exp_model = ExponentialSmoothing()
-        exp_model.fit(series)
-        exp_forecast = exp_model.predict(self.prediction_horizon)
-        results['ExponentialSmoothing'] = (exp_forecast, exp_model.rmse(), exp_model.mape())
-
-        # Theta model
-        self.logger.info("Running Theta model...")
-        theta_model = Theta()
-        theta_model.fit(series)
-        theta_forecast = theta_model.predict(self.prediction_horizon)
-        results['Theta'] = (theta_forecast, theta_model.rmse(), theta_model.mape())
-
         # XGBoost model using combined data
-        self.logger.info("Running XGBoost model...")
         split_index = int(0.8 * len(combined_data))
         X_train = combined_data.drop(columns='close').iloc[:split_index]
         y_train = combined_data['close'].iloc[:split_index]
         X_test = combined_data.drop(columns='close').iloc[split_index:]
         y_test = combined_data['close'].iloc[split_index:]
 
-        xgb_model = xgb.XGBRegressor(objective='reg:squarederror', n_estimators=100)
-        xgb_model.fit(X_train, y_train)
-        xgb_forecast = xgb_model.predict(X_test)
-        rmse = mean_squared_error(y_test, xgb_forecast, squared=False)
-        mape = mean_absolute_percentage_error(y_test, xgb_forecast)
-        results['XGBoost'] = (xgb_forecast, rmse, mape)
-
-        # RNN model using multivariate data
-        self.logger.info("Running RNN model...")
-        rnn_model = RNNModel(model="LSTM", input_chunk_length=12, output_chunk_length=self.prediction_horizon)
-        rnn_model.fit(series)
-        rnn_forecast = rnn_model.predict(self.prediction_horizon)
-        results['RNN'] = (rnn_forecast, rnn_model.rmse(), rnn_model.mape())
-
-        self.logger.info("Forecasting process complete.")
+        xgb_params = {'objective': 'reg:squarederror', 'n_estimators': 100}
+        rnn_params = {'model': "LSTM", 'input_chunk_length': 12, 'output_chunk_length': self.prediction_horizon}
+
+        # The candidate models are independent, so they are fitted concurrently: {name: (worker, args, uses_torch)}
+        jobs = {
+            'ARIMA': (fit_series_model, (self.tickers, 'ARIMA', {}, series, self.prediction_horizon), False),
+            'ExponentialSmoothing': (fit_series_model, (self.tickers, 'ExponentialSmoothing', {}, series, self.prediction_horizon), False),
+            'Theta': (fit_series_model, (self.tickers, 'Theta', {}, series, self.prediction_horizon), False),
+            'XGBoost': (fit_xgboost_model, (self.tickers, xgb_params, X_train, y_train, X_test, y_test), False),
+            'RNN': (fit_series_model, (self.tickers, 'RNN', rnn_params, series, self.prediction_horizon), True),
+        }
+        covered = set(self.covered_models.get(self.tickers, ()))
+        if covered:
+            self.logger.info(f"Skipping {', '.join(sorted(covered))} for {self.tickers}: already forecast by the global run")
+        selected, tournament = self.model_selection.select(self.tickers, [name for name in jobs if name not in covered])
+        jobs = {name: job for name, job in jobs.items() if name in selected}
+        self.logger.info(f"Fitting {', '.join(jobs)} concurrently...")
+        results = self.model_fitter.fit(jobs)
+        self.model_selection.record(self.tickers, results, tournament)
+        # Intraday updates re-attach to the new fits on the next bar
+        self.incremental = None
+
+        self.logger.info(f"Forecasting process complete with {len(results)} of {len(jobs)} models.")
         return results
 
+    def start_incremental_updates(self, series: TimeSeries) -> IncrementalForecaster:
+        """
+        Attach the cached ARIMA and ExponentialSmoothing fits so intraday bars update their forecasts
+        without refitting; a full refit only runs when residual drift is detected.
+        """
+        model_cache = ForecastModelCache()
+
+        def refit(model_name: str, observations):
+            model = SERIES_MODELS[model_name]()
+            model.fit(TimeSeries.from_values(observations))
+            return model
+
+        incremental = IncrementalForecaster(horizon=self.prediction_horizon, refit_callback=refit)
+        for model_name in ('ARIMA', 'ExponentialSmoothing'):
+            model = model_cache.load(self.tickers, SERIES_MODELS[model_name], {})
+            if model is None:
+                self.logger.warning(f"No cached {model_name} fit for {self.tickers}; run forecast_with_models first.")
+                continue
+            incremental.attach(model_name, model, series)
+        return incremental
+
+    def update_intraday(self, price: float, bar_time: Any = None) -> Dict[str, np.ndarray]:
+        """
+        Fold a new intraday bar into the incrementally updated models and return their forecasts.
+        The first bar attaches the cached fits to the stored history; a repeated bar_time is ignored.
+        """
+        if bar_time is not None and bar_time == self._last_bar_time:
+            return {}
+        if self.incremental is None:
+            historical_data, _ = self.fetch_data()
+            if historical_data.empty:
+                return {}
+            series = fill_missing_values(TimeSeries.from_dataframe(historical_data, time_col='date', value_cols='close'))
+            self.incremental = self.start_incremental_updates(series)
+        self._last_bar_time = bar_time
+        return {model_name: self.incremental.update(model_name, price) for model_name in list(self.incremental.updaters)}
+
     def report_results(self, results: Dict[str, Tuple[pd.DataFrame, float, float]]):
         """Generate and log the report based on evaluation results."""
         for model_name, (forecast, rmse, mape) in results.items():
@@ -233,10 +262,25 @@ class DayTimeForecaster:
         results = self.forecast_with_models()
         if results:
             self.report_results(results)
-            threading.Thread(target=self.create_and_save_visualization, args=(results, self.tickers)).start()
+            self.save_results(results)
+            if not self.headless:
+                threading.Thread(target=self.create_and_save_visualization, args=(results, self.tickers)).start()
+
+    def save_results(self, results: Dict[str, Tuple[pd.DataFrame, float, float]]):
+        """Persist the forecast arrays and metrics to TimeSeriesForecasts."""
+        try:
+            self.forecast_store.save(
+                self.tickers, results, interval=self.interval, start_date=self.start_date, end_date=self.end_date,
+                period=self.period, prediction_horizon=self.prediction_horizon, fill_na_method=self.fill_na_method
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to store forecast for {self.tickers}: {e}")
 
     def create_and_save_visualization(self, results: Dict[str, Tuple[pd.DataFrame, float, float]], ticker: str):
         """Create and save the forecast visualization using Bokeh."""
+        from bokeh.plotting import figure, save
+        from bokeh.models import HoverTool
+
         date_str = datetime.today().strftime('%Y-%m-%d')
         output_dir = os.path.join(self.base_dir, ticker, date_str)
         os.makedirs(output_dir, exist_ok=True)
@@ -269,6 +313,8 @@ class DayTimeForecaster:
 
     def notify_user_new_forecast(self, ticker: str, file_path: str):
         """Trigger a system notification to inform the user of the new forecast."""
+        from plyer import notification
+
         self.logger.info(f"Notification: New forecast available for {ticker}. File saved at {file_path}")
         
         # Create a system notification
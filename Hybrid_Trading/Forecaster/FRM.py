@@ -8,6 +8,12 @@ from Config.trading_constants import TCS
 from Hybrid_Trading.Symbols.SymbolScrapper import TickerScraper
 from Config.utils import TempFiles  # Assuming TempFiles is in a Utilities directory
 from Config.utils import TradingDataWorkbook  # Assuming TradingDataWorkbook is in the same directory
+from Hybrid_Trading.Forecaster.Global_Forecaster import GlobalForecaster
+from Hybrid_Trading.Forecaster.Forecast_Store import ForecastStore
+from Hybrid_Trading.Forecaster.Model_Selection import CANDIDATE_MODELS
+from Hybrid_Trading.Forecaster.PF import TimeSeriesForecaster
+from asgiref.sync import sync_to_async
+from Hybrid_Trading.Forecaster.Forecast_Backtester import ForecastBacktester
 from alive_progress import alive_bar
 import asyncio
 
@@ -28,6 +34,10 @@ class FullRunPipeline:
         self.tickers = self.scrape_tickers()  # Fetch tickers during initialization
         self.orchestrator = DTPipelineOrchestrator(form_data)
         self.logger = logging.getLogger("FullRunPipeline")
+        self.forecast_store = ForecastStore()
+        self.global_forecasts = {}
+        self.best_models = {}
+        self.backtested_models = set()
 
     def scrape_tickers(self):
         """
@@ -38,9 +48,10 @@ class FullRunPipeline:
         self.logger.info(f"Scraped tickers: {tickers}")
         return tickers
 
-    async def process_ticker(self, ticker: str):
+    async def process_ticker(self, ticker: str, best_model: str = None):
         """
         Process a single ticker asynchronously using the orchestrator.
+        best_model is the ticker's most accurate stored model, if it has accuracy stats.
         """
         try:
             self.logger.info(f"Processing ticker: {ticker}")
@@ -52,6 +63,10 @@ class FullRunPipeline:
             # Run the orchestrator pipeline for the current ticker
             await self.orchestrator.run_pipeline()
 
+            # Global mode: the orchestrator skips the globally covered models, the rest are fitted here
+            if self.form_data.get("forecast_mode") == "global":
+                await self.forecast_ticker(ticker, best_model)
+
             # Clean up temporary files after processing
             temp_files.cleanup_temp_files()
 
@@ -60,6 +75,55 @@ class FullRunPipeline:
             self.logger.error(f"Error processing {ticker}: {e}")
             return None
 
+    def candidate_models(self, ticker: str, best_model: str = None) -> List[str]:
+        """
+        Per-ticker models still to fit for a ticker, never the models the global run already covered.
+        With accuracy stats, the backtested models narrow to the best one; models the backtester does
+        not evaluate (XGBoost, RNN) have no stats and stay eligible.
+        """
+        covered = self.global_forecasts.get(ticker, {})
+        if best_model is None:
+            candidates = CANDIDATE_MODELS
+        else:
+            candidates = [model_name for model_name in CANDIDATE_MODELS
+                          if model_name == best_model or model_name not in self.backtested_models]
+        return [model_name for model_name in candidates if model_name not in covered]
+
+    async def forecast_ticker(self, ticker: str, best_model: str = None):
+        """
+        Fit and store the per-ticker forecasts of a ticker.
+        """
+        candidates = self.candidate_models(ticker, best_model)
+        if not candidates:
+            return
+        forecaster = TimeSeriesForecaster(
+            user_input=self.form_data,
+            ticker=ticker,
+            interval=self.form_data.get("interval"),
+            start_date=self.form_data.get("start_date"),
+            end_date=self.form_data.get("end_date"),
+            period=self.form_data.get("period"),
+            prediction_horizon=int(self.form_data.get("prediction_horizon", 5)),
+            fill_na_method=self.form_data.get("fill_na_method", 'mean'),
+            candidate_models=candidates
+        )
+        await sync_to_async(forecaster.run_forecast_and_visualization)()
+
+    async def store_global_forecasts(self):
+        """
+        Persist the global forecasts through ForecastStore, one run per ticker (no validation metrics).
+        """
+        for ticker, by_model in self.global_forecasts.items():
+            results = {model_name: (forecast, None, None) for model_name, forecast in by_model.items()}
+            try:
+                await sync_to_async(self.forecast_store.save)(
+                    ticker, results, interval=self.form_data.get("interval"), start_date=self.form_data.get("start_date"),
+                    end_date=self.form_data.get("end_date"), period=self.form_data.get("period"),
+                    prediction_horizon=int(self.form_data.get("prediction_horizon", 5))
+                )
+            except Exception as e:
+                self.logger.error(f"Failed to store global forecast for {ticker}: {e}")
+
     async def run_pipeline(self):
         """
         Execute the full pipeline asynchronously using the form data and tickers.
@@ -87,11 +151,37 @@ class FullRunPipeline:
         tickers_to_process = self.tickers[:num_symbols]
         self.logger.info(f"Number of tickers to process: {num_symbols}")
 
+        # Global mode: one RNN/XGBoost trained across the whole universe instead of one model per ticker
+        if self.form_data.get("forecast_mode") == "global":
+            global_forecaster = GlobalForecaster(
+                tickers=tickers_to_process,
+                start_date=self.form_data.get("start_date"),
+                end_date=self.form_data.get("end_date"),
+                prediction_horizon=int(self.form_data.get("prediction_horizon", 5)),
+                use_static_covariates=bool(self.form_data.get("use_static_covariates", False))
+            )
+            self.global_forecasts = await global_forecaster.run()
+            await self.store_global_forecasts()
+            self.orchestrator.skip_covered_models({ticker: set(by_model) for ticker, by_model in self.global_forecasts.items()})
+
+        # Model selection reads stored walk-forward accuracy; only tickers with missing or stale stats are backtested
+        if tickers_to_process:
+            backtester = ForecastBacktester(
+                tickers=tickers_to_process,
+                start_date=self.form_data.get("start_date"),
+                end_date=self.form_data.get("end_date"),
+                horizon=int(self.form_data.get("prediction_horizon", 5))
+            )
+            if self.form_data.get("evaluate_forecasts"):
+                await backtester.run()
+            self.best_models = await backtester.best_models()
+            self.backtested_models = set(backtester.model_params)
+
         # Progress bar setup using alive_bar
         async with alive_bar(len(tickers_to_process), title="Processing Tickers") as bar:
             tasks = []
             for ticker in tickers_to_process:
-                tasks.append(self.process_ticker(ticker))
+                tasks.append(self.process_ticker(ticker, self.best_models.get(ticker)))
                 bar()  # Update progress bar for each ticker added
 
             # Run all tasks asynchronously
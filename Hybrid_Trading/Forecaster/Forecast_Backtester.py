@@ -0,0 +1,181 @@
+import asyncio
+from collections import Counter
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from typing import Dict, List, Tuple, Optional
+from darts import TimeSeries
+from darts.utils.missing_values import fill_missing_values
+from django.utils import timezone
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+from Hybrid_Trading.Data.models import HistoricalData
+from Hybrid_Trading.Forecaster.models import ForecastAccuracy
+from Hybrid_Trading.Forecaster.Model_Executor import SERIES_MODELS
+
+
+def backtest_ticker(ticker: str, series: TimeSeries, model_params: Dict[str, dict], horizon: int,
+                    retrain_every: int, start: float) -> Dict[str, Tuple[float, float, int]]:
+    """
+    Worker: walk-forward evaluation of each model on one ticker's series.
+    Returns {model_name: (rmse, mape, n_forecasts)}.
+    """
+    stats = {}
+    for model_name, params in model_params.items():
+        model = SERIES_MODELS[model_name](**params)
+        # Models that can forecast from a longer series than they were fitted on reuse the last fit
+        # between refits; the others are refitted at every evaluated point, so only every k-th is evaluated
+        reusable = getattr(model, '_supports_non_retrainable_historical_forecasts', False)
+        try:
+            forecasts = model.historical_forecasts(
+                series, start=start, forecast_horizon=horizon,
+                stride=1 if reusable else retrain_every,
+                retrain=retrain_every if reusable else True,
+                last_points_only=True, verbose=False,
+            )
+        except Exception as e:
+            LoggingMaster("ForecastBacktester").get_logger().error(f"Backtest of {model_name} on {ticker} failed: {e}")
+            stats[model_name] = (np.nan, np.nan, 0)
+            continue
+
+        actual = series.slice_intersect(forecasts).values(copy=False)[:, 0]
+        predicted = forecasts.values(copy=False)[:, 0]
+        errors = predicted - actual
+        rmse = float(np.sqrt(np.mean(errors ** 2)))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mape = float(np.nanmean(np.abs(errors / actual)))
+        stats[model_name] = (rmse, mape, len(predicted))
+    return stats
+
+
+class ForecastBacktester:
+    """
+    Forecast evaluation engine.
+
+    Each candidate model is evaluated walk-forward over an expanding window: the model is refitted
+    every FORECAST_BACKTEST_RETRAIN_EVERY bars instead of at every step, and models that can forecast
+    from an extended series (ARIMA, RNN) reuse their last fit in between. Tickers are spread over a
+    process pool. RMSE/MAPE per (ticker, model, horizon) are stored in ForecastAccuracy, so model
+    selection can read them instead of refitting.
+    """
+
+    DEFAULT_MODELS = {'ARIMA': {}, 'ExponentialSmoothing': {}, 'Theta': {}}
+
+    def __init__(self, tickers: List[str], start_date: str, end_date: str, horizon: int = 5,
+                 model_params: Dict[str, dict] = None, retrain_every: int = None, start: float = None,
+                 max_workers: int = None):
+        self.logger = LoggingMaster("ForecastBacktester").get_logger()
+        self.constants = TCS()
+        self.tickers = list(tickers)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.horizon = horizon
+        self.model_params = model_params or self.DEFAULT_MODELS
+        self.retrain_every = retrain_every or self.constants.FORECAST_BACKTEST_RETRAIN_EVERY
+        self.start = start or self.constants.FORECAST_BACKTEST_START
+        self.max_workers = max_workers or self.constants.FORECAST_FIT_WORKERS
+
+    async def fetch_series(self, tickers: List[str]) -> Dict[str, TimeSeries]:
+        """
+        Load the close prices of all tickers with one query and build one business-day series per ticker.
+        """
+        rows = [row async for row in HistoricalData.objects.filter(
+            ticker_id__in=tickers, date__range=[self.start_date, self.end_date]
+        ).values('ticker_id', 'date', 'close')]
+        if not rows:
+            return {}
+
+        frame = pd.DataFrame(rows)
+        frame['date'] = pd.to_datetime(frame['date'])
+        closes = frame.pivot_table(index='date', columns='ticker_id', values='close').sort_index()
+
+        series_by_ticker = {}
+        for ticker in closes.columns:
+            ticker_closes = closes[ticker].dropna()
+            if len(ticker_closes) < 2 * (self.retrain_every + self.horizon):
+                self.logger.warning(f"Skipping {ticker}: {len(ticker_closes)} bars are too few to backtest")
+                continue
+            series = TimeSeries.from_series(ticker_closes, fill_missing_dates=True, freq='B')
+            series_by_ticker[ticker] = fill_missing_values(series)
+        return series_by_ticker
+
+    async def stale_tickers(self) -> List[str]:
+        """
+        Tickers missing accuracy stats for any candidate model, or whose stats are older than FORECAST_BACKTEST_MAX_AGE_DAYS.
+        """
+        fresh_after = timezone.now() - timedelta(days=self.constants.FORECAST_BACKTEST_MAX_AGE_DAYS)
+        covered = Counter([ticker async for ticker in ForecastAccuracy.objects.filter(
+            ticker_id__in=self.tickers, horizon=self.horizon, model_name__in=list(self.model_params),
+            evaluated_at__gte=fresh_after
+        ).values_list('ticker_id', flat=True)])
+        return [ticker for ticker in self.tickers if covered[ticker] < len(self.model_params)]
+
+    async def run(self, only_stale: bool = True) -> Dict[str, Dict[str, Tuple[float, float, int]]]:
+        """
+        Backtest the tickers (by default only those without fresh stats) and store the results.
+        Returns {ticker: {model_name: (rmse, mape, n_forecasts)}}.
+        """
+        tickers = await self.stale_tickers() if only_stale else self.tickers
+        if not tickers:
+            self.logger.info("Forecast accuracy stats are up to date")
+            return {}
+
+        series_by_ticker = await self.fetch_series(tickers)
+        self.logger.info(f"Backtesting {len(self.model_params)} models on {len(series_by_ticker)} tickers "
+                         f"(refit every {self.retrain_every} bars)")
+
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                ticker: loop.run_in_executor(pool, backtest_ticker, ticker, series, self.model_params,
+                                             self.horizon, self.retrain_every, self.start)
+                for ticker, series in series_by_ticker.items()
+            }
+            results = {}
+            for ticker, future in futures.items():
+                try:
+                    results[ticker] = await future
+                except Exception as e:
+                    self.logger.error(f"Backtest failed for {ticker}: {e}")
+
+        await self.save_stats(results, series_by_ticker)
+        return results
+
+    async def save_stats(self, results: Dict[str, Dict[str, Tuple[float, float, int]]], series_by_ticker: Dict[str, TimeSeries]):
+        evaluated_at = timezone.now()
+        for ticker, stats in results.items():
+            series = series_by_ticker[ticker]
+            for model_name, (rmse, mape, n_forecasts) in stats.items():
+                await ForecastAccuracy.objects.aupdate_or_create(
+                    ticker_id=ticker, model_name=model_name, horizon=self.horizon,
+                    defaults={
+                        'retrain_every': self.retrain_every,
+                        'start_date': series.start_time().date(),
+                        'end_date': series.end_time().date(),
+                        'n_forecasts': n_forecasts,
+                        'rmse': rmse if np.isfinite(rmse) else None,
+                        'mape': mape if np.isfinite(mape) else None,
+                        'evaluated_at': evaluated_at,
+                    }
+                )
+        self.logger.info(f"Stored forecast accuracy for {len(results)} tickers")
+
+    async def load_accuracy(self, metric: str = 'mape') -> pd.DataFrame:
+        """
+        Stored accuracy of every candidate model as a (ticker x model) DataFrame of `metric`.
+        """
+        rows = [row async for row in ForecastAccuracy.objects.filter(
+            ticker_id__in=self.tickers, horizon=self.horizon, model_name__in=list(self.model_params)
+        ).values('ticker_id', 'model_name', metric)]
+        if not rows:
+            return pd.DataFrame(columns=list(self.model_params))
+        return pd.DataFrame(rows).pivot(index='ticker_id', columns='model_name', values=metric)
+
+    async def best_models(self, metric: str = 'mape') -> Dict[str, Optional[str]]:
+        """
+        Most accurate stored model per ticker (None when a ticker has no usable stats).
+        """
+        accuracy = (await self.load_accuracy(metric)).astype(float).dropna(how='all')
+        best = accuracy.idxmin(axis=1).to_dict() if not accuracy.empty else {}
+        return {ticker: best.get(ticker) for ticker in self.tickers}
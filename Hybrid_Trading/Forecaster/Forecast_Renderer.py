@@ -0,0 +1,65 @@
+import os
+import pandas as pd
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+from Hybrid_Trading.Forecaster.models import TimeSeriesForecasts
+from Hybrid_Trading.Forecaster.Forecast_Store import ForecastStore
+
+
+class ForecastChartRenderer:
+    """
+    Builds the bokeh forecast chart for a stored forecast the first time it is requested and
+    caches the HTML under FORECAST_CHART_DIR, keyed by forecast id and generation time.
+    Forecast runs themselves never touch bokeh.
+    """
+
+    def __init__(self, chart_dir: str = None):
+        self.logger = LoggingMaster("ForecastChartRenderer").get_logger()
+        self.constants = TCS()
+        self.chart_dir = chart_dir or self.constants.FORECAST_CHART_DIR
+        self.forecast_store = ForecastStore()
+
+    def chart_path(self, forecast_row: TimeSeriesForecasts) -> str:
+        generated_at = forecast_row.forecast_generated_at.strftime('%Y%m%dT%H%M%S') if forecast_row.forecast_generated_at else 'undated'
+        return os.path.join(self.chart_dir, f"forecast_{forecast_row.id}_{generated_at}.html")
+
+    def render(self, forecast_id: int) -> str:
+        """
+        Return the path of the cached chart HTML for a forecast, building it on the first request.
+        """
+        forecast_row = TimeSeriesForecasts.objects.get(id=forecast_id)
+        output_file_path = self.chart_path(forecast_row)
+        if os.path.exists(output_file_path):
+            return output_file_path
+
+        # bokeh is only imported when a chart is actually requested
+        from bokeh.plotting import figure, save
+        from bokeh.models import HoverTool
+
+        ticker = forecast_row.ticker_id
+        title = f"Forecast for {ticker}"
+        if forecast_row.forecast_generated_at:
+            title += f" - {forecast_row.forecast_generated_at:%Y-%m-%d}"
+        p = figure(title=title, x_axis_type="datetime", width=800, height=400)
+
+        # Plot every stored model forecast that has a date axis, with its band when one was stored
+        for model_name, forecast in self.forecast_store.load(forecast_row).items():
+            if not isinstance(forecast.index, pd.DatetimeIndex):
+                continue
+            p.line(forecast.index, forecast['point'], legend_label=model_name)
+            if forecast['lower'].notna().any():
+                p.varea(x=forecast.index, y1=forecast['lower'], y2=forecast['upper'], alpha=0.2, legend_label=model_name)
+
+        hover = HoverTool(
+            tooltips=[("Date", "@x{%F}"), ("Value", "@y{0.2f}")],
+            formatters={'@x': 'datetime'},
+            mode='vline'
+        )
+        p.add_tools(hover)
+        if p.legend:
+            p.legend.click_policy = "hide"
+
+        os.makedirs(self.chart_dir, exist_ok=True)
+        save(p, filename=output_file_path, title=f"Forecast {ticker}")
+        self.logger.info(f"Rendered forecast chart {forecast_id} to {output_file_path}")
+        return output_file_path
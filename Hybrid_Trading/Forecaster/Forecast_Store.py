@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Tuple
+from django.db import transaction
+from django.utils import timezone
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+from Hybrid_Trading.Forecaster.models import TimeSeriesForecasts, ForecastArrays
+
+# Forecaster result name -> field prefix on TimeSeriesForecasts
+MODEL_FIELDS = {
+    'ARIMA': 'arima',
+    'ExponentialSmoothing': 'exp_smoothing',
+    'Theta': 'theta',
+    'XGBoost': 'xgboost',
+    'RNN': 'rnn',
+}
+
+# Quantiles stored as lower/upper bands for probabilistic forecasts
+BAND_QUANTILES = (0.05, 0.95)
+
+
+class ForecastStore:
+    """
+    Persists forecaster results ({model: (forecast, rmse, mape)}).
+
+    Metrics always go to TimeSeriesForecasts. With FORECAST_STORAGE='binary' each model's
+    forecast is stored in ForecastArrays as raw bytes: dates as int64 epoch seconds, point
+    and lower/upper bands as float32. With 'json' the legacy JSONFields are filled instead.
+    """
+
+    def __init__(self, storage: str = None):
+        self.logger = LoggingMaster("ForecastStore").get_logger()
+        self.constants = TCS()
+        self.storage = storage or self.constants.FORECAST_STORAGE
+
+    @staticmethod
+    def forecast_to_arrays(forecast: Any) -> Dict[str, Optional[np.ndarray]]:
+        """
+        Convert a darts TimeSeries, pandas object or NumPy array into dates / point / lower / upper arrays.
+        Probabilistic darts forecasts are reduced to the median and the BAND_QUANTILES.
+        """
+        lower = upper = None
+        if hasattr(forecast, 'time_index'):
+            dates = pd.DatetimeIndex(forecast.time_index) if isinstance(forecast.time_index, pd.DatetimeIndex) else None
+            samples = np.asarray(forecast.all_values(copy=False), dtype=np.float64)[:, 0, :]
+            point = np.median(samples, axis=1)
+            if samples.shape[1] > 1:
+                lower, upper = np.quantile(samples, BAND_QUANTILES, axis=1)
+        elif isinstance(forecast, (pd.Series, pd.DataFrame)):
+            dates = forecast.index if isinstance(forecast.index, pd.DatetimeIndex) else None
+            point = np.asarray(forecast, dtype=np.float64).reshape(len(forecast), -1)[:, 0]
+        else:
+            dates = None
+            point = np.asarray(forecast, dtype=np.float64).ravel()
+
+        return {
+            'dates': dates.tz_localize(None).values.astype('datetime64[s]').astype(np.int64) if dates is not None else None,
+            'point': point.astype(np.float32),
+            'lower': lower.astype(np.float32) if lower is not None else None,
+            'upper': upper.astype(np.float32) if upper is not None else None,
+        }
+
+    @staticmethod
+    def arrays_to_json(arrays: Dict[str, Optional[np.ndarray]]) -> Dict[str, list]:
+        dates = [] if arrays['dates'] is None else [str(date) for date in arrays['dates'].astype('datetime64[s]')]
+        values = arrays['point'].astype(np.float64)
+        return {'dates': dates, 'values': np.where(np.isfinite(values), values, None).tolist()}
+
+    @staticmethod
+    def decode(dates: Optional[bytes], point: bytes, lower: Optional[bytes] = None, upper: Optional[bytes] = None) -> pd.DataFrame:
+        """
+        Rebuild a forecast frame (point, lower, upper) from stored bytes, indexed by date when dates were stored.
+        """
+        point_values = np.frombuffer(point, dtype=np.float32)
+        frame = pd.DataFrame({
+            'point': point_values,
+            'lower': np.frombuffer(lower, dtype=np.float32) if lower else np.nan,
+            'upper': np.frombuffer(upper, dtype=np.float32) if upper else np.nan,
+        })
+        if dates:
+            frame.index = pd.DatetimeIndex(np.frombuffer(dates, dtype=np.int64).astype('datetime64[s]'), name='date')
+        return frame
+
+    @staticmethod
+    def _metric(value: Any):
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+        return value if np.isfinite(value) else None
+
+    def save(self, ticker: str, results: Dict[str, Tuple[Any, float, float]], **run_fields) -> TimeSeriesForecasts:
+        """
+        Store one forecaster run. run_fields are passed through (interval, start_date, period, ...).
+        """
+        generated_at = timezone.now()
+        fields = dict(run_fields, forecast_generated_at=generated_at)
+        arrays_by_model = {}
+        for model_name, (forecast, rmse, mape) in results.items():
+            prefix = MODEL_FIELDS.get(model_name)
+            if prefix is None:
+                continue
+            arrays = self.forecast_to_arrays(forecast)
+            if self.storage == 'json':
+                fields[f"{prefix}_forecast"] = self.arrays_to_json(arrays)
+            else:
+                arrays_by_model[model_name] = arrays
+            fields[f"{prefix}_rmse"] = self._metric(rmse)
+            fields[f"{prefix}_mape"] = self._metric(mape)
+
+        with transaction.atomic():
+            forecast_row = TimeSeriesForecasts.objects.create(ticker_id=ticker, **fields)
+            ForecastArrays.objects.bulk_create([
+                ForecastArrays(
+                    forecast=forecast_row,
+                    ticker_id=ticker,
+                    model_name=model_name,
+                    generated_at=generated_at,
+                    dates=arrays['dates'].tobytes() if arrays['dates'] is not None else None,
+                    point=arrays['point'].tobytes(),
+                    lower=arrays['lower'].tobytes() if arrays['lower'] is not None else None,
+                    upper=arrays['upper'].tobytes() if arrays['upper'] is not None else None,
+                )
+                for model_name, arrays in arrays_by_model.items()
+            ])
+
+        self.logger.info(f"Stored forecast {forecast_row.id} for {ticker} with {len(results)} models ({self.storage})")
+        return forecast_row
+
+    def load(self, forecast_row: TimeSeriesForecasts) -> Dict[str, pd.DataFrame]:
+        """
+        Return {model_name: forecast frame} for a stored run, from binary arrays or the legacy JSON fields.
+        """
+        forecasts = {
+            row['model_name']: self.decode(row['dates'], row['point'], row['lower'], row['upper'])
+            for row in ForecastArrays.objects.filter(forecast=forecast_row).values('model_name', 'dates', 'point', 'lower', 'upper')
+        }
+        for model_name, prefix in MODEL_FIELDS.items():
+            stored = getattr(forecast_row, f"{prefix}_forecast")
+            if model_name in forecasts or not stored:
+                continue
+            frame = pd.DataFrame({'point': pd.to_numeric(pd.Series(stored.get('values', [])), errors='coerce'), 'lower': np.nan, 'upper': np.nan})
+            if stored.get('dates'):
+                frame.index = pd.DatetimeIndex(pd.to_datetime(stored['dates']), name='date')
+            forecasts[model_name] = frame
+        return forecasts
+
+    def load_wide(self, tickers: List[str], model_name: str = 'ARIMA', column: str = 'point') -> pd.DataFrame:
+        """
+        Latest forecast of one model for many tickers in a single query, as a wide (date x ticker) DataFrame.
+        """
+        latest = ForecastArrays.objects.filter(
+            ticker_id__in=tickers, model_name=model_name, dates__isnull=False
+        ).order_by('ticker_id', '-generated_at').distinct('ticker_id')  # PostgreSQL DISTINCT ON
+
+        columns = {}
+        for row in latest.values('ticker_id', 'dates', 'point', 'lower', 'upper'):
+            frame = self.decode(row['dates'], row['point'], row['lower'], row['upper'])
+            columns[row['ticker_id']] = frame[column]
+
+        if not columns:
+            return pd.DataFrame(columns=list(tickers))
+        return pd.DataFrame(columns).sort_index()
@@ -0,0 +1,143 @@
+import pandas as pd
+from typing import Dict, List, Tuple
+from darts import TimeSeries
+from darts.dataprocessing.transformers import Scaler, StaticCovariatesTransformer
+from darts.models import RNNModel, XGBModel
+from darts.utils.missing_values import fill_missing_values
+from sklearn.preprocessing import OneHotEncoder
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+from Hybrid_Trading.Data.models import HistoricalData
+from Hybrid_Trading.Symbols.models import Tickers
+
+
+class GlobalForecaster:
+    """
+    Global multi-series forecasting: one RNN and one XGBoost model trained across every ticker
+    of the universe instead of one model per ticker.
+
+    Each ticker's close series is min-max scaled on its own, so tickers with very different price
+    levels share one model. With use_static_covariates the ticker's sector and industry are
+    one-hot encoded as static covariates (used by XGBoost; the darts RNNModel ignores them).
+    Forecasts for the whole universe come from a single batched predict call per model.
+    """
+
+    MODEL_TYPES = ('RNN', 'XGBoost')
+
+    def __init__(self, tickers: List[str], start_date: str, end_date: str, prediction_horizon: int = 5,
+                 model_types: Tuple[str, ...] = MODEL_TYPES, use_static_covariates: bool = False,
+                 lags: int = None, batch_size: int = None):
+        self.logger = LoggingMaster("GlobalForecaster").get_logger()
+        self.constants = TCS()
+        self.tickers = list(tickers)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.prediction_horizon = prediction_horizon
+        self.model_types = [model_type for model_type in model_types if model_type in self.MODEL_TYPES]
+        self.use_static_covariates = use_static_covariates
+        self.lags = lags or self.constants.GLOBAL_FORECAST_LAGS
+        self.batch_size = batch_size or self.constants.GLOBAL_FORECAST_BATCH_SIZE
+        self.scaler = Scaler()
+
+    async def fetch_series(self) -> Dict[str, TimeSeries]:
+        """
+        Load the close prices of all tickers with one query and build one business-day series per ticker.
+        """
+        rows = [row async for row in HistoricalData.objects.filter(
+            ticker_id__in=self.tickers, date__range=[self.start_date, self.end_date]
+        ).values('ticker_id', 'date', 'close')]
+        if not rows:
+            self.logger.error(f"No historical data found for {len(self.tickers)} tickers")
+            return {}
+
+        frame = pd.DataFrame(rows)
+        frame['date'] = pd.to_datetime(frame['date'])
+        closes = frame.pivot_table(index='date', columns='ticker_id', values='close').sort_index()
+
+        # Shorter series cannot provide a single training window
+        min_length = self.lags + self.prediction_horizon
+        series_by_ticker = {}
+        for ticker in closes.columns:
+            ticker_closes = closes[ticker].dropna()
+            if len(ticker_closes) < min_length:
+                self.logger.warning(f"Skipping {ticker}: {len(ticker_closes)} bars, need at least {min_length}")
+                continue
+            series = TimeSeries.from_series(ticker_closes, fill_missing_dates=True, freq='B')
+            series_by_ticker[ticker] = fill_missing_values(series).astype('float32')
+
+        self.logger.info(f"Built {len(series_by_ticker)} series from {len(frame)} bars")
+        return series_by_ticker
+
+    async def attach_static_covariates(self, series_by_ticker: Dict[str, TimeSeries]) -> Dict[str, TimeSeries]:
+        """
+        Attach one-hot encoded sector and industry static covariates to every series.
+        """
+        metadata = {row['ticker']: row async for row in Tickers.objects.filter(
+            ticker__in=list(series_by_ticker)
+        ).values('ticker', 'sector', 'industry')}
+
+        tickers = list(series_by_ticker)
+        with_covariates = [
+            series_by_ticker[ticker].with_static_covariates(pd.DataFrame({
+                'sector': [metadata.get(ticker, {}).get('sector') or 'Unknown'],
+                'industry': [metadata.get(ticker, {}).get('industry') or 'Unknown'],
+            }))
+            for ticker in tickers
+        ]
+        encoded = StaticCovariatesTransformer(transformer_cat=OneHotEncoder()).fit_transform(with_covariates)
+        return dict(zip(tickers, encoded))
+
+    def build_model(self, model_type: str):
+        if model_type == 'RNN':
+            return RNNModel(model="LSTM", input_chunk_length=self.lags, output_chunk_length=self.prediction_horizon,
+                            batch_size=self.batch_size)
+        return XGBModel(lags=self.lags, output_chunk_length=self.prediction_horizon,
+                        use_static_covariates=self.use_static_covariates, objective='reg:squarederror', n_estimators=100)
+
+    async def run(self) -> Dict[str, Dict[str, TimeSeries]]:
+        """
+        Train the global models on the whole universe and forecast every ticker.
+        Returns {ticker: {model_type: forecast}} in price units.
+        """
+        series_by_ticker = await self.fetch_series()
+        if not series_by_ticker:
+            return {}
+        if self.use_static_covariates:
+            series_by_ticker = await self.attach_static_covariates(series_by_ticker)
+
+        tickers = list(series_by_ticker)
+        scaled = self.scaler.fit_transform([series_by_ticker[ticker] for ticker in tickers])
+
+        forecasts = {ticker: {} for ticker in tickers}
+        for model_type in self.model_types:
+            self.logger.info(f"Training global {model_type} model on {len(scaled)} series...")
+            model = self.build_model(model_type)
+            model.fit(scaled)
+
+            # One batched pass over the whole universe, then undo each ticker's scaling
+            predict_kwargs = {'batch_size': self.batch_size} if model_type == 'RNN' else {}
+            predictions = model.predict(n=self.prediction_horizon, series=scaled, **predict_kwargs)
+            for ticker, forecast in zip(tickers, self.scaler.inverse_transform(predictions)):
+                forecasts[ticker][model_type] = forecast
+
+        self.logger.info(f"Global forecasts produced for {len(tickers)} tickers with {', '.join(self.model_types)}")
+        return forecasts
+
+    @staticmethod
+    def to_frame(forecasts: Dict[str, Dict[str, TimeSeries]]) -> pd.DataFrame:
+        """
+        Flatten {ticker: {model_type: forecast}} into a long DataFrame (ticker, model, date, forecast).
+        """
+        frames = [
+            pd.DataFrame({
+                'ticker': ticker,
+                'model': model_type,
+                'date': forecast.time_index,
+                'forecast': forecast.values(copy=False)[:, 0],
+            })
+            for ticker, by_model in forecasts.items()
+            for model_type, forecast in by_model.items()
+        ]
+        if not frames:
+            return pd.DataFrame(columns=['ticker', 'model', 'date', 'forecast'])
+        return pd.concat(frames, ignore_index=True)
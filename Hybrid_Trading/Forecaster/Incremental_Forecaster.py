@@ -0,0 +1,205 @@
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, Callable, Optional
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+
+
+class KalmanStateUpdater:
+    """
+    Folds new observations into the filtered state of a fitted statsmodels state-space model
+    (ARIMA / SARIMAX / ETSModel results) with one Kalman filter step per bar.
+    The fitted parameters are kept; only the state and its covariance move.
+    """
+
+    def __init__(self, results):
+        filter_results = results.filter_results
+        self.design = np.asarray(filter_results.design[..., -1])[0]
+        self.obs_intercept = float(np.asarray(filter_results.obs_intercept)[0, -1])
+        self.obs_cov = float(np.asarray(filter_results.obs_cov)[0, 0, -1])
+        self.transition = np.asarray(filter_results.transition[..., -1])
+        self.state_intercept = np.asarray(filter_results.state_intercept[..., -1])
+        selection = np.asarray(filter_results.selection[..., -1])
+        self.state_noise = selection @ np.asarray(filter_results.state_cov[..., -1]) @ selection.T
+
+        # Prediction for the first bar after the fitted sample
+        self.state = np.array(filter_results.predicted_state[:, -1])
+        self.state_cov = np.array(filter_results.predicted_state_cov[:, :, -1])
+        self.nobs = int(results.nobs)
+        # Residuals of the diffuse burn-in period are not one-step errors
+        self.resid_scale = _resid_scale(np.asarray(results.resid)[results.loglikelihood_burn:])
+
+    def update(self, value: float) -> float:
+        """Filter one observation and return its one-step-ahead forecast error."""
+        error = value - (self.design @ self.state + self.obs_intercept)
+        pz = self.state_cov @ self.design
+        gain = pz / (self.design @ pz + self.obs_cov)
+        filtered_state = self.state + gain * error
+        filtered_cov = self.state_cov - np.outer(gain, pz)
+
+        self.state = self.transition @ filtered_state + self.state_intercept
+        self.state_cov = self.transition @ filtered_cov @ self.transition.T + self.state_noise
+        self.nobs += 1
+        return float(error)
+
+    def forecast(self, horizon: int) -> np.ndarray:
+        forecasts = np.empty(horizon)
+        state = self.state
+        for step in range(horizon):
+            forecasts[step] = self.design @ state + self.obs_intercept
+            state = self.transition @ state + self.state_intercept
+        return forecasts
+
+
+class HoltWintersUpdater:
+    """
+    Applies the additive Holt-Winters recursions of a fitted statsmodels ExponentialSmoothing
+    model (the one darts ExponentialSmoothing wraps) to new observations.
+    """
+
+    def __init__(self, results):
+        model = results.model
+        if model.trend == 'mul' or model.seasonal == 'mul':
+            raise ValueError("Incremental updates support additive trend and seasonality only.")
+
+        params = results.params
+        self.alpha = params['smoothing_level']
+        self.beta = params.get('smoothing_trend') or 0.0
+        self.gamma = params.get('smoothing_seasonal') or 0.0
+        self.phi = (params.get('damping_trend') or 1.0) if model.damped_trend else 1.0
+        self.has_trend = model.trend is not None
+        self.period = int(model.seasonal_periods or 0) if model.seasonal is not None else 0
+
+        self.level = float(results.level[-1])
+        self.trend = float(results.trend[-1]) if self.has_trend else 0.0
+        self.season = deque(np.asarray(results.season)[-self.period:].tolist(), maxlen=self.period) if self.period else None
+        self.nobs = int(model.nobs)
+        self.resid_scale = _resid_scale(results.resid)
+
+    def update(self, value: float) -> float:
+        damped_trend = self.phi * self.trend
+        seasonal = self.season[0] if self.period else 0.0
+        error = value - (self.level + damped_trend + seasonal)
+
+        previous_level = self.level
+        self.level = self.alpha * (value - seasonal) + (1 - self.alpha) * (previous_level + damped_trend)
+        if self.has_trend:
+            self.trend = self.beta * (self.level - previous_level) + (1 - self.beta) * damped_trend
+        if self.period:
+            self.season.append(self.gamma * (value - previous_level - damped_trend) + (1 - self.gamma) * seasonal)
+        self.nobs += 1
+        return float(error)
+
+    def forecast(self, horizon: int) -> np.ndarray:
+        steps = np.arange(1, horizon + 1)
+        trend = self.trend * (np.cumsum(self.phi ** steps) if self.phi != 1.0 else steps)
+        seasonal = np.asarray(self.season)[(steps - 1) % self.period] if self.period else 0.0
+        return self.level + trend + seasonal
+
+
+def _resid_scale(resid: Any) -> float:
+    resid = np.asarray(resid, dtype=np.float64)
+    resid = resid[np.isfinite(resid)]
+    return float(np.sqrt(np.mean(resid ** 2))) if resid.size else np.nan
+
+
+def make_updater(model: Any):
+    """
+    Build a state updater from a fitted darts ARIMA / ExponentialSmoothing model or from statsmodels results.
+    """
+    # darts keeps the statsmodels results in .model; statsmodels results keep their model there too
+    results = model if hasattr(model, 'params') else getattr(model, 'model', model)
+    if hasattr(results, 'filter_results'):
+        return KalmanStateUpdater(results)
+    if hasattr(results, 'level') and hasattr(results, 'params'):
+        return HoltWintersUpdater(results)
+    raise TypeError(f"No incremental update path for {type(model).__name__}.")
+
+
+class IncrementalForecaster:
+    """
+    Keeps fitted state-space models current on a stream of intraday bars.
+
+    Each new bar is folded into the model state (one Kalman step or one Holt-Winters recursion)
+    and a fresh forecast is returned, without refitting. The recent one-step errors are compared
+    with the fitted residual RMSE; when their ratio passes FORECAST_DRIFT_THRESHOLD a full refit
+    is scheduled in the background through refit_callback(key, observations), and the refitted
+    model replaces the updater once it is ready.
+    """
+
+    def __init__(self, horizon: int = 5, drift_threshold: float = None, drift_window: int = None,
+                 refit_callback: Optional[Callable[[str, np.ndarray], Any]] = None):
+        self.logger = LoggingMaster("IncrementalForecaster").get_logger()
+        self.constants = TCS()
+        self.horizon = horizon
+        self.drift_threshold = drift_threshold or self.constants.FORECAST_DRIFT_THRESHOLD
+        self.drift_window = drift_window or self.constants.FORECAST_DRIFT_WINDOW
+        self.refit_callback = refit_callback
+
+        self.updaters: Dict[str, Any] = {}
+        self.errors: Dict[str, deque] = {}
+        self.observations: Dict[str, list] = {}
+        self._refits: Dict[str, Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="forecast-refit")
+
+    def attach(self, key: str, model: Any, history: Any = None):
+        """
+        Start tracking a fitted model. If `history` (the full observed series) is longer than the
+        model's fitted sample, the extra observations are folded in first.
+        """
+        updater = make_updater(model)
+        if history is None:
+            observations = np.empty(0)
+        elif hasattr(history, 'univariate_values'):  # darts TimeSeries
+            observations = history.univariate_values().astype(np.float64)
+        else:
+            observations = np.asarray(history, dtype=np.float64).ravel()
+        for value in observations[updater.nobs:]:
+            updater.update(value)
+
+        self.updaters[key] = updater
+        self.errors[key] = deque(maxlen=self.drift_window)
+        self.observations[key] = observations.tolist()
+
+    def update(self, key: str, value: float) -> np.ndarray:
+        """Fold one new bar into the model state and return the updated forecast."""
+        self._swap_in_refit(key)
+        updater = self.updaters[key]
+        self.errors[key].append(updater.update(value))
+        self.observations[key].append(value)
+
+        if self.drift_detected(key):
+            self.schedule_refit(key)
+        return updater.forecast(self.horizon)
+
+    def forecast(self, key: str) -> np.ndarray:
+        self._swap_in_refit(key)
+        return self.updaters[key].forecast(self.horizon)
+
+    def drift_detected(self, key: str) -> bool:
+        errors = self.errors[key]
+        resid_scale = self.updaters[key].resid_scale
+        if len(errors) < self.drift_window or not np.isfinite(resid_scale) or resid_scale == 0:
+            return False
+        recent_rmse = np.sqrt(np.mean(np.square(errors)))
+        return recent_rmse > self.drift_threshold * resid_scale
+
+    def schedule_refit(self, key: str):
+        """Queue a full refit for a key unless one is already running."""
+        if self.refit_callback is None or (key in self._refits and not self._refits[key].done()):
+            return
+        self.logger.info(f"Residual drift detected for {key}, scheduling a full refit")
+        self._refits[key] = self._executor.submit(self.refit_callback, key, np.asarray(self.observations[key]))
+
+    def _swap_in_refit(self, key: str):
+        refit = self._refits.get(key)
+        if refit is None or not refit.done():
+            return
+        del self._refits[key]
+        try:
+            self.attach(key, refit.result(), self.observations[key])
+            self.logger.info(f"Refitted model for {key} is now live")
+        except Exception as e:
+            self.logger.error(f"Refit for {key} failed: {e}")
+            self.errors[key].clear()
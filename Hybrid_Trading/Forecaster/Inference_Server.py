@@ -0,0 +1,172 @@
+import asyncio
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+from Hybrid_Trading.Forecaster.Forecast_Store import ForecastStore
+
+# Request kinds handled by the batch executor
+FORECAST = 'forecast'
+PREDICT = 'predict'
+
+
+class ForecastInferenceServer:
+    """
+    In-process inference service for strategies.
+
+    Requests from many tickers are queued and grouped into micro-batches (up to
+    INFERENCE_MAX_BATCH_SIZE requests or INFERENCE_MAX_WAIT_MS of waiting). Each batch runs in a
+    worker thread and every caller gets its result through an asyncio future.
+
+    - forecast(): values of a stored forecast (ForecastArrays) at given dates. The latest forecasts
+      of all tickers in a batch that are not loaded yet are fetched in one query and kept in memory.
+    - predict(): rows for a registered fitted model (anything with .predict(X)). All rows of a batch
+      are stacked and scored with a single predict call.
+
+    Nothing is refitted at request time; call invalidate() after new forecasts have been stored
+    and stop() when done, which cancels the batch loop and fails requests still queued.
+    """
+
+    def __init__(self, max_batch_size: int = None, max_wait_ms: float = None, forecast_store: ForecastStore = None):
+        self.logger = LoggingMaster("ForecastInferenceServer").get_logger()
+        self.constants = TCS()
+        self.max_batch_size = max_batch_size or self.constants.INFERENCE_MAX_BATCH_SIZE
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else self.constants.INFERENCE_MAX_WAIT_MS) / 1000
+        self.forecast_store = forecast_store or ForecastStore()
+
+        self._models: Dict[str, Any] = {}
+        self._model_versions: Dict[str, Optional[str]] = {}
+        self._forecasts: Dict[str, pd.DataFrame] = {}  # model_name -> wide (date x ticker) forecast frame
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def register_model(self, name: str, model: Any, version: str = None):
+        """Register (or replace) a fitted model; predict() requests for `name` are scored with it."""
+        self._models[name] = model
+        self._model_versions[name] = version
+
+    def has_model(self, name: str) -> bool:
+        return name in self._models
+
+    def model_version(self, name: str) -> Optional[str]:
+        """The version tag `name` was registered with (None when unregistered or untagged)."""
+        return self._model_versions.get(name)
+
+    def invalidate(self, model_name: str = None, ticker: str = None):
+        """Drop loaded forecasts (all, one model's, and/or one ticker's) so the next request reloads them."""
+        for name in ([model_name] if model_name is not None else list(self._forecasts)):
+            if ticker is None:
+                self._forecasts.pop(name, None)
+            elif name in self._forecasts:
+                self._forecasts[name] = self._forecasts[name].drop(columns=[ticker], errors='ignore')
+
+    async def start(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._batch_loop())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        # Requests queued after the last batch would otherwise wait forever
+        while self._queue is not None and not self._queue.empty():
+            future = self._queue.get_nowait()[-1]
+            if not future.done():
+                future.set_exception(RuntimeError("Inference server stopped"))
+
+    async def _submit(self, request: tuple) -> Any:
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(request + (future,))
+        return await future
+
+    async def forecast(self, ticker: str, dates: List[Any], model_name: str = 'ARIMA') -> np.ndarray:
+        """Stored forecast values of `model_name` for a ticker at the given dates (NaN where not forecast)."""
+        return await self._submit((FORECAST, model_name, ticker, pd.to_datetime(list(dates))))
+
+    async def predict(self, model_name: str, features: Any) -> np.ndarray:
+        """Score one feature row (or a 2D block of rows) with a registered model."""
+        return await self._submit((PREDICT, model_name, None, np.atleast_2d(np.asarray(features, dtype=np.float64))))
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                # ORM reads and model scoring run off the event loop
+                try:
+                    results = await asyncio.to_thread(self._run_batch, [request[:-1] for request in batch])
+                except Exception as e:
+                    self.logger.error(f"Inference batch of {len(batch)} requests failed: {e}")
+                    results = [e] * len(batch)
+
+                for request, result in zip(batch, results):
+                    future = request[-1]
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+        except asyncio.CancelledError:
+            # stop(): fail the batch being collected or scored; stop() fails the rest of the queue
+            for request in batch:
+                if not request[-1].done():
+                    request[-1].set_exception(RuntimeError("Inference server stopped"))
+            raise
+
+    def _run_batch(self, batch: List[tuple]) -> List[Any]:
+        results: List[Any] = [None] * len(batch)
+
+        # Stored forecasts: load every missing ticker of a model with one query
+        forecast_requests = [(position, request) for position, request in enumerate(batch) if request[0] == FORECAST]
+        for model_name in {request[1] for _, request in forecast_requests}:
+            loaded = self._forecasts.get(model_name, pd.DataFrame())
+            missing = sorted({request[2] for _, request in forecast_requests if request[1] == model_name} - set(loaded.columns))
+            if missing:
+                fetched = self.forecast_store.load_wide(missing, model_name=model_name)
+                # Tickers without a stored forecast get an empty column so they are not queried again
+                fetched = fetched.reindex(columns=missing)
+                loaded = fetched if loaded.empty else pd.concat([loaded, fetched], axis=1).sort_index()
+                self._forecasts[model_name] = loaded
+        for position, (_, model_name, ticker, dates) in forecast_requests:
+            results[position] = self._forecasts[model_name][ticker].reindex(dates).to_numpy(dtype=np.float64)
+
+        # Registered models: stack all rows per model into one predict call
+        predict_requests = [(position, request) for position, request in enumerate(batch) if request[0] == PREDICT]
+        for model_name in {request[1] for _, request in predict_requests}:
+            group = [(position, request[3]) for position, request in predict_requests if request[1] == model_name]
+            model = self._models.get(model_name)
+            if model is None:
+                for position, _ in group:
+                    results[position] = KeyError(f"No model registered under '{model_name}'")
+                continue
+            try:
+                predictions = np.asarray(model.predict(np.vstack([rows for _, rows in group])))
+            except Exception as e:
+                for position, _ in group:
+                    results[position] = e
+                continue
+            offset = 0
+            for position, rows in group:
+                results[position] = predictions[offset:offset + len(rows)]
+                offset += len(rows)
+
+        return results
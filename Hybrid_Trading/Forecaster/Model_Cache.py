@@ -0,0 +1,206 @@
+import os
+import json
+import uuid
+import pickle
+import hashlib
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Any, Tuple, Optional
+from darts import TimeSeries
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+
+# How each darts model can reuse a cached fit when only new bars were appended
+WARM_START_STRATEGIES = {
+    'ARIMA': 'extend',       # keep the fitted parameters, apply them to the extended series
+    'RNNModel': 'fine_tune',  # continue training the cached LSTM for a few epochs
+}
+
+
+class ForecastModelCache:
+    """
+    On-disk cache of fitted forecasting models keyed by (ticker, model type, hyperparameters,
+    training-data hash).
+
+    An identical training series is a plain hit. When the cached series is a prefix of the new
+    one (only new bars arrived) ARIMA extends its state and the LSTM is fine-tuned for
+    FORECAST_FINE_TUNE_EPOCHS instead of being retrained; other models are refitted.
+    After FORECAST_MAX_WARM_STARTS warm starts a full refit is forced.
+    """
+
+    def __init__(self, cache_dir: str = None, fine_tune_epochs: int = None, max_warm_starts: int = None):
+        self.logger = LoggingMaster("ForecastModelCache").get_logger()
+        self.constants = TCS()
+        self.cache_dir = cache_dir or self.constants.FORECAST_MODEL_CACHE_DIR
+        self.fine_tune_epochs = fine_tune_epochs or self.constants.FORECAST_FINE_TUNE_EPOCHS
+        self.max_warm_starts = max_warm_starts if max_warm_starts is not None else self.constants.FORECAST_MAX_WARM_STARTS
+
+    @staticmethod
+    def series_hash(series: TimeSeries, length: int = None) -> str:
+        """
+        Hash the values and time index of a series, or of its first `length` points.
+        """
+        values = np.ascontiguousarray(series.values(copy=False)[:length], dtype=np.float64)
+        index = np.asarray(series.time_index[:length]).astype(np.int64)
+        digest = hashlib.sha256(values.tobytes())
+        digest.update(index.tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def frame_hash(*frames: Any) -> str:
+        """
+        Hash tabular training data (DataFrames, Series or arrays).
+        """
+        digest = hashlib.sha256()
+        for frame in frames:
+            if isinstance(frame, (pd.DataFrame, pd.Series)):
+                digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+                if isinstance(frame, pd.DataFrame):
+                    digest.update(','.join(map(str, frame.columns)).encode())
+            else:
+                digest.update(np.ascontiguousarray(frame).tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def params_hash(params: Dict[str, Any]) -> str:
+        return hashlib.sha256(json.dumps(params or {}, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+    def _entry_dir(self, ticker: str, model_name: str, params: Dict[str, Any]) -> str:
+        safe_ticker = str(ticker).replace(os.sep, '_').replace(',', '_')
+        return os.path.join(self.cache_dir, safe_ticker, model_name, self.params_hash(params))
+
+    def _read_meta(self, entry_dir: str) -> Optional[Dict[str, Any]]:
+        meta_path = os.path.join(entry_dir, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as meta_file:
+            return json.load(meta_file)
+
+    def _write_meta(self, entry_dir: str, meta: Dict[str, Any]):
+        # Write the metadata last and atomically so a half-written model is never picked up
+        meta_path = os.path.join(entry_dir, 'meta.json')
+        tmp_path = f"{meta_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w') as meta_file:
+            json.dump(meta, meta_file)
+        os.replace(tmp_path, meta_path)
+
+    @staticmethod
+    def _model_path(entry_dir: str, meta: Dict[str, Any]) -> str:
+        return os.path.join(entry_dir, meta.get('model_file', 'model.pkl'))
+
+    def _store_entry(self, entry_dir: str, write_model, meta: Dict[str, Any]):
+        # Each fit gets its own file and meta.json is switched to it atomically, so readers never
+        # see a new model with old metadata (or the reverse); the superseded files are removed last
+        os.makedirs(entry_dir, exist_ok=True)
+        previous = self._read_meta(entry_dir)
+        model_file = f"model-{uuid.uuid4().hex}.pkl"
+        write_model(os.path.join(entry_dir, model_file))
+        self._write_meta(entry_dir, {**meta, 'model_file': model_file})
+        if previous is not None:
+            old_path = self._model_path(entry_dir, previous)
+            for path in (old_path, f"{old_path}.ckpt"):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _save_model(self, entry_dir: str, model, params: Dict[str, Any], series: TimeSeries, warm_starts: int):
+        self._store_entry(entry_dir, model.save, {
+            'model_class': type(model).__name__,
+            'params': params,
+            'data_hash': self.series_hash(series),
+            'length': len(series),
+            'last_timestamp': str(series.end_time()),
+            'warm_starts': warm_starts,
+            'saved_at': datetime.now().isoformat(),
+        })
+
+    def load(self, ticker: str, model_class, params: Dict[str, Any]) -> Optional[Any]:
+        """
+        Return the last cached fit of a darts model, or None when there is none.
+        """
+        entry_dir = self._entry_dir(ticker, model_class.__name__, params)
+        meta = self._read_meta(entry_dir)
+        if meta is None:
+            return None
+        try:
+            return model_class.load(self._model_path(entry_dir, meta))
+        except Exception as e:
+            self.logger.warning(f"Could not load cached {model_class.__name__} for {ticker}: {e}")
+            return None
+
+    def fit_predict(self, ticker: str, model_class, params: Dict[str, Any], series: TimeSeries, horizon: int) -> Tuple[Any, TimeSeries]:
+        """
+        Return (model, forecast) for a darts model, reusing or warm-starting a cached fit when possible.
+        """
+        model_name = model_class.__name__
+        entry_dir = self._entry_dir(ticker, model_name, params)
+        meta = self._read_meta(entry_dir)
+        strategy = WARM_START_STRATEGIES.get(model_name)
+        # ARIMA and the LSTM can forecast from a series other than the one they were fitted on
+        predict_kwargs = {'series': series} if strategy else {}
+
+        status = 'miss'
+        if meta is not None and meta['length'] <= len(series):
+            if meta['data_hash'] == self.series_hash(series):
+                status = 'hit'
+            elif strategy and meta['warm_starts'] < self.max_warm_starts and meta['data_hash'] == self.series_hash(series, meta['length']):
+                status = strategy
+
+        model = None
+        if status != 'miss':
+            try:
+                model = model_class.load(self._model_path(entry_dir, meta))
+            except Exception as e:
+                self.logger.warning(f"Could not load cached {model_name} for {ticker}, refitting: {e}")
+                status = 'miss'
+
+        if status == 'hit':
+            self.logger.info(f"{model_name} cache hit for {ticker}")
+        elif status == 'extend':
+            self.logger.info(f"Extending cached {model_name} state for {ticker} by {len(series) - meta['length']} bars")
+            self._save_model(entry_dir, model, params, series, meta['warm_starts'] + 1)
+        elif status == 'fine_tune':
+            self.logger.info(f"Fine-tuning cached {model_name} for {ticker} for {self.fine_tune_epochs} epochs")
+            model.fit(series, epochs=self.fine_tune_epochs)
+            self._save_model(entry_dir, model, params, series, meta['warm_starts'] + 1)
+        else:
+            self.logger.info(f"Fitting {model_name} for {ticker} from scratch")
+            model = model_class(**params)
+            model.fit(series)
+            self._save_model(entry_dir, model, params, series, 0)
+
+        return model, model.predict(horizon, **predict_kwargs)
+
+    def fit_regressor(self, ticker: str, model_name: str, model_factory, params: Dict[str, Any], X_train: pd.DataFrame, y_train: pd.Series):
+        """
+        Return a fitted tabular regressor (e.g. XGBoost), reusing the cached one when the training data is unchanged.
+        """
+        entry_dir = self._entry_dir(ticker, model_name, params)
+        meta = self._read_meta(entry_dir)
+        data_hash = self.frame_hash(X_train, y_train)
+
+        if meta is not None and meta['data_hash'] == data_hash:
+            try:
+                with open(self._model_path(entry_dir, meta), 'rb') as model_file:
+                    model = pickle.load(model_file)
+                self.logger.info(f"{model_name} cache hit for {ticker}")
+                return model
+            except Exception as e:
+                self.logger.warning(f"Could not load cached {model_name} for {ticker}, refitting: {e}")
+
+        model = model_factory(**params)
+        model.fit(X_train, y_train)
+
+        def write_model(model_path):
+            with open(model_path, 'wb') as model_file:
+                pickle.dump(model, model_file)
+
+        self._store_entry(entry_dir, write_model, {
+            'model_class': model_name,
+            'params': params,
+            'data_hash': data_hash,
+            'length': len(X_train),
+            'warm_starts': 0,
+            'saved_at': datetime.now().isoformat(),
+        })
+        return model
@@ -0,0 +1,114 @@
+import time
+import xgboost as xgb
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, Tuple, Callable
+from darts.models import ARIMA, ExponentialSmoothing, Theta, RNNModel
+from sklearn.metrics import mean_squared_error, mean_absolute_percentage_error
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+from Hybrid_Trading.Forecaster.Model_Cache import ForecastModelCache
+
+SERIES_MODELS = {
+    'ARIMA': ARIMA,
+    'ExponentialSmoothing': ExponentialSmoothing,
+    'Theta': Theta,
+    'RNN': RNNModel,
+}
+
+
+def fit_series_model(ticker: str, model_name: str, params: Dict[str, Any], series, horizon: int) -> Tuple[Any, float, float]:
+    """
+    Worker: fit (or warm-start) a darts model through the model cache and return (forecast, rmse, mape).
+    """
+    model, forecast = ForecastModelCache().fit_predict(ticker, SERIES_MODELS[model_name], params, series, horizon)
+    return forecast, model.rmse(), model.mape()
+
+
+def fit_xgboost_model(ticker: str, params: Dict[str, Any], X_train, y_train, X_test, y_test) -> Tuple[Any, float, float]:
+    """
+    Worker: fit the XGBoost regressor through the model cache and score it on the held-out split.
+    """
+    model = ForecastModelCache().fit_regressor(ticker, 'XGBoost', xgb.XGBRegressor, params, X_train, y_train)
+    forecast = model.predict(X_test)
+    rmse = mean_squared_error(y_test, forecast, squared=False)
+    mape = mean_absolute_percentage_error(y_test, forecast)
+    return forecast, rmse, mape
+
+
+def _limit_torch_threads(threads: int):
+    """
+    Initializer of the torch worker: cap intra-op threads so the LSTM does not starve the statistical fits.
+    """
+    import torch
+    torch.set_num_threads(threads)
+
+
+class ParallelModelFitter:
+    """
+    Fits independent forecasting models concurrently.
+
+    Statistical models share a process pool of FORECAST_FIT_WORKERS processes; torch models run in
+    their own single-process pool with FORECAST_TORCH_THREADS threads. Each model has a deadline
+    (per-model timeouts, FORECAST_MODEL_TIMEOUT by default) counted from submission, and fit()
+    returns whichever models finished in time. Workers still running a timed-out fit are terminated.
+    """
+
+    def __init__(self, max_workers: int = None, torch_threads: int = None, timeouts: Dict[str, float] = None,
+                 default_timeout: float = None):
+        self.logger = LoggingMaster("ParallelModelFitter").get_logger()
+        self.constants = TCS()
+        self.max_workers = max_workers or self.constants.FORECAST_FIT_WORKERS
+        self.torch_threads = torch_threads or self.constants.FORECAST_TORCH_THREADS
+        self.timeouts = timeouts or {}
+        self.default_timeout = default_timeout or self.constants.FORECAST_MODEL_TIMEOUT
+
+    def fit(self, jobs: Dict[str, Tuple[Callable, tuple, bool]]) -> Dict[str, Tuple[Any, float, float]]:
+        """
+        Run the jobs and collect their results.
+
+        :param jobs: {model_name: (worker_function, args, uses_torch)}. Worker functions must be module-level.
+        :return: {model_name: (forecast, rmse, mape)} for the models that finished without error before their deadline.
+        """
+        statistical_jobs = {name: job for name, job in jobs.items() if not job[2]}
+        torch_jobs = {name: job for name, job in jobs.items() if job[2]}
+
+        statistical_pool = ProcessPoolExecutor(max_workers=max(1, min(self.max_workers, len(statistical_jobs)))) if statistical_jobs else None
+        torch_pool = ProcessPoolExecutor(max_workers=1, initializer=_limit_torch_threads, initargs=(self.torch_threads,)) if torch_jobs else None
+
+        submitted_at = time.monotonic()
+        futures = {}
+        for name, (worker, args, _) in statistical_jobs.items():
+            futures[name] = statistical_pool.submit(worker, *args)
+        for name, (worker, args, _) in torch_jobs.items():
+            futures[name] = torch_pool.submit(worker, *args)
+
+        results = {}
+        timed_out = []
+        # Wait on the earliest deadline first so one slow model does not delay collecting the others
+        deadlines = {name: submitted_at + self.timeouts.get(name, self.default_timeout) for name in futures}
+        for name in sorted(futures, key=deadlines.get):
+            try:
+                results[name] = futures[name].result(timeout=max(deadlines[name] - time.monotonic(), 0))
+                self.logger.info(f"{name} finished in {time.monotonic() - submitted_at:.1f}s")
+            except FutureTimeoutError:
+                timed_out.append(name)
+                self.logger.warning(f"{name} did not finish within {deadlines[name] - submitted_at:.0f}s and was dropped")
+            except Exception as e:
+                self.logger.error(f"{name} failed: {e}")
+
+        for pool in (statistical_pool, torch_pool):
+            if pool is None:
+                continue
+            if timed_out:
+                self._terminate(pool)
+            pool.shutdown(wait=not timed_out, cancel_futures=True)
+
+        return results
+
+    def _terminate(self, pool: ProcessPoolExecutor):
+        """
+        Kill the pool's worker processes; a running fit cannot be cancelled through its future.
+        """
+        for process in list((getattr(pool, '_processes', None) or {}).values()):
+            if process.is_alive():
+                process.terminate()
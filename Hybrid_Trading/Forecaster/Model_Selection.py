@@ -0,0 +1,80 @@
+import numpy as np
+from datetime import timedelta
+from typing import Dict, List, Tuple, Any
+from django.utils import timezone
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+from Hybrid_Trading.Forecaster.models import ModelSelection
+
+# Every model the per-ticker forecasters can run
+CANDIDATE_MODELS = ('ARIMA', 'ExponentialSmoothing', 'Theta', 'XGBoost', 'RNN')
+
+
+class ModelSelectionRegistry:
+    """
+    Per-ticker model selection for the forecaster ensemble.
+
+    A full tournament runs every candidate model and ranks them by validation MAPE. Routine runs
+    only fit the FORECAST_SELECTION_TOP_K best models of that ranking. A new tournament is due when
+    the ticker has none yet, after FORECAST_TOURNAMENT_INTERVAL_DAYS, or when the best routine
+    MAPE exceeds the tournament winner's MAPE by FORECAST_DEGRADATION_RATIO.
+    """
+
+    def __init__(self, top_k: int = None, tournament_interval_days: int = None, degradation_ratio: float = None):
+        self.logger = LoggingMaster("ModelSelectionRegistry").get_logger()
+        self.constants = TCS()
+        self.top_k = top_k or self.constants.FORECAST_SELECTION_TOP_K
+        self.tournament_interval = timedelta(days=tournament_interval_days or self.constants.FORECAST_TOURNAMENT_INTERVAL_DAYS)
+        self.degradation_ratio = degradation_ratio or self.constants.FORECAST_DEGRADATION_RATIO
+
+    @staticmethod
+    def _score(mape: Any) -> float:
+        try:
+            mape = float(mape)
+        except (TypeError, ValueError):
+            return np.inf
+        return mape if np.isfinite(mape) else np.inf
+
+    def select(self, ticker: str, candidates: List[str] = CANDIDATE_MODELS) -> Tuple[List[str], bool]:
+        """
+        Models to run for a ticker and whether this run is a full tournament.
+        """
+        selection = ModelSelection.objects.filter(ticker_id=ticker).first()
+        if selection is None or not selection.ranking:
+            return list(candidates), True
+        if selection.needs_tournament:
+            self.logger.info(f"Forecast error degraded for {ticker}, running a full model tournament")
+            return list(candidates), True
+        if selection.last_tournament_at is None or timezone.now() - selection.last_tournament_at >= self.tournament_interval:
+            self.logger.info(f"Scheduled model tournament for {ticker}")
+            return list(candidates), True
+
+        # Models that failed or were added after the last tournament are unranked until the next one
+        top = [name for name in selection.ranking if name in candidates][:self.top_k]
+        self.logger.info(f"Running top {len(top)} models for {ticker}: {', '.join(top)}")
+        return top, False
+
+    def record(self, ticker: str, results: Dict[str, Tuple[Any, float, float]], tournament: bool):
+        """
+        Store the validation MAPE of a run ({model: (forecast, rmse, mape)}) and update the ranking.
+        """
+        if not results:
+            return
+        run_scores = {name: self._score(mape) for name, (_, _, mape) in results.items()}
+        selection, _ = ModelSelection.objects.get_or_create(ticker_id=ticker)
+        scores = dict(selection.scores or {})
+        scores.update({name: (score if np.isfinite(score) else None) for name, score in run_scores.items()})
+        selection.scores = scores
+
+        best_score = min(run_scores.values())
+        if tournament:
+            selection.ranking = sorted(run_scores, key=run_scores.get)
+            selection.baseline_error = best_score if np.isfinite(best_score) else None
+            selection.last_tournament_at = timezone.now()
+            selection.needs_tournament = False
+            self.logger.info(f"Model tournament for {ticker}: {' > '.join(selection.ranking)}")
+        elif selection.baseline_error is None or best_score > selection.baseline_error * self.degradation_ratio:
+            selection.needs_tournament = True
+            self.logger.warning(f"Best MAPE for {ticker} degraded to {best_score:.4f} "
+                                f"(tournament: {selection.baseline_error}); next run is a full tournament")
+        selection.save()
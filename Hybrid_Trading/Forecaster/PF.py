@@ -1,6 +1,6 @@
 import os
 import threading
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 import pandas as pd
 import xgboost as xgb
 from darts import TimeSeries
@@ -9,21 +9,23 @@ from darts.utils.missing_values import fill_missing_values
 from sklearn.metrics import mean_squared_error, mean_absolute_percentage_error
 from lime.lime_tabular import LimeTabularExplainer
 import shap
-from bokeh.plotting import figure, save
-from bokeh.models import HoverTool
 from datetime import datetime, timedelta
-from plyer import notification
 from dotenv import load_dotenv
-import holidays
 from Hybrid_Trading.Model_Trainer.Self_Teaching import SelfTeaching
 from Hybrid_Trading.Data.Storage.CDS import CentralizedDataStorage
 from Hybrid_Trading.Log.Logging_Master import LoggingMaster  # Import LoggingMaster for consistent logging
+from Config.trading_constants import TCS
+from Hybrid_Trading.Data.Trading_Calendar import get_trading_calendar
+from Hybrid_Trading.Forecaster.Forecast_Store import ForecastStore
+from Hybrid_Trading.Forecaster.Model_Cache import ForecastModelCache
+from Hybrid_Trading.Forecaster.Model_Selection import ModelSelectionRegistry, CANDIDATE_MODELS
 # Load environment variables
 load_dotenv()
 
 class TimeSeriesForecaster:
     def __init__(self, user_input, ticker: str, interval: str, start_date: str, end_date: str, period: str,
-                 base_dir: str = "forecasts", prediction_horizon: int = 5, fill_na_method: str = 'mean'):
+                 base_dir: str = "forecasts", prediction_horizon: int = 5, fill_na_method: str = 'mean', headless: bool = None,
+                 candidate_models: List[str] = None):
         self.ticker = ticker
         self.user_input = user_input
         self.interval = interval
@@ -50,47 +52,35 @@ class TimeSeriesForecaster:
         # Initialize the LIME explainer for model interpretation
         self.lime_explainer = None  # Initialize later after loading data
 
-        # Define U.S. holidays for filtering
-        self.holidays = holidays.US()
+        # Headless runs only persist forecast arrays; charts are rendered on demand by ForecastChartRenderer
+        self.headless = TCS().FORECAST_HEADLESS if headless is None else headless
+        self.forecast_store = ForecastStore()
+
+        # Shared precomputed trading calendar for holiday and school-break filtering
+        self.calendar = get_trading_calendar()
+
+        # Fitted models are cached on disk and warm-started when only new bars arrived
+        self.model_cache = ForecastModelCache()
+
+        # Routine runs only fit the ticker's best models; full tournaments are scheduled or triggered by degradation
+        self.model_selection = ModelSelectionRegistry()
+        # Models this forecaster may fit (e.g. without those already covered by the global models)
+        self.candidate_models = list(CANDIDATE_MODELS if candidate_models is None else candidate_models)
 
     def exclude_holidays(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Remove rows that fall on U.S. holidays."""
+        """Remove rows that do not fall on trading sessions (weekends and market holidays)."""
         data['date'] = pd.to_datetime(data['date'])
-        is_holiday = data['date'].isin(self.holidays)
-        non_holiday_data = data[~is_holiday]
+        non_holiday_data = self.calendar.filter_frame(data)
         self.logger.info(f"Excluded {len(data) - len(non_holiday_data)} holiday rows from data for {self.ticker}.")
         return non_holiday_data
 
     def filter_school_breaks(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Exclude typical school break times and back-to-school periods."""
-        
+        """Exclude typical school break times and back-to-school periods of the current year."""
         current_year = datetime.now().year
-
-        # Winter break: Typically starts a few days before Christmas and ends shortly after New Year's
-        winter_break_start = datetime(current_year, 12, 20)
-        winter_break_end = datetime(current_year + 1, 1, 10)  # Spans into the next year
-
-        # Summer break: Typically starts at the beginning of June and ends in mid-August
-        summer_break_start = datetime(current_year, 6, 1)
-        summer_break_end = datetime(current_year, 8, 15)
-
-        # Back-to-school period: Typically late August to early September
-        back_to_school_start = datetime(current_year, 8, 15)
-        back_to_school_end = datetime(current_year, 9, 15)
-
-        # Exclude these periods dynamically based on the current year
-        school_breaks = [
-            (winter_break_start, winter_break_end),
-            (summer_break_start, summer_break_end),
-            (back_to_school_start, back_to_school_end),
-        ]
-        
         data['date'] = pd.to_datetime(data['date'])
-        for start, end in school_breaks:
-            data = data[~((data['date'] >= start) & (data['date'] <= end))]
-
-        self.logger.info(f"Excluded school break and back-to-school dates dynamically for the year {current_year}.")
-        return data
+        filtered_data = data[~self.calendar.is_school_break(data['date'], year=current_year)]
+        self.logger.info(f"Excluded {len(data) - len(filtered_data)} school break and back-to-school rows for {current_year} for {self.ticker}.")
+        return filtered_data
 
     def fetch_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Fetch all required data from the central data storage."""
@@ -148,45 +138,45 @@ class TimeSeriesForecaster:
         series = fill_missing_values(series)
 
         results = {}
+        selected, tournament = self.model_selection.select(self.ticker, self.candidate_models)
 
         # ARIMA model
-        arima_model = ARIMA()
-        arima_model.fit(series)
-        arima_forecast = arima_model.predict(self.prediction_horizon)
-        results['ARIMA'] = (arima_forecast, arima_model.rmse(), arima_model.mape())
+        if 'ARIMA' in selected:
+            arima_model, arima_forecast = self.model_cache.fit_predict(self.ticker, ARIMA, {}, series, self.prediction_horizon)
+            results['ARIMA'] = (arima_forecast, arima_model.rmse(), arima_model.mape())
 
         # Exponential Smoothing model
-        exp_model = ExponentialSmoothing()
-        exp_model.fit(series)
-        exp_forecast = exp_model.predict(self.prediction_horizon)
-        results['ExponentialSmoothing'] = (exp_forecast, exp_model.rmse(), exp_model.mape())
+        if 'ExponentialSmoothing' in selected:
+            exp_model, exp_forecast = self.model_cache.fit_predict(self.ticker, ExponentialSmoothing, {}, series, self.prediction_horizon)
+            results['ExponentialSmoothing'] = (exp_forecast, exp_model.rmse(), exp_model.mape())
 
         # Theta model
-        theta_model = Theta()
-        theta_model.fit(series)
-        theta_forecast = theta_model.predict(self.prediction_horizon)
-        results['Theta'] = (theta_forecast, theta_model.rmse(), theta_model.mape())
+        if 'Theta' in selected:
+            theta_model, theta_forecast = self.model_cache.fit_predict(self.ticker, Theta, {}, series, self.prediction_horizon)
+            results['Theta'] = (theta_forecast, theta_model.rmse(), theta_model.mape())
 
         # XGBoost model using multivariate data
-        split_index = int(0.8 * len(multivariate_data))
-        X_train = multivariate_data.drop(columns='close').iloc[:split_index]
-        y_train = multivariate_data['close'].iloc[:split_index]
-        X_test = multivariate_data.drop(columns='close').iloc[split_index:]
-        y_test = multivariate_data['close'].iloc[split_index:]
-
-        xgb_model = xgb.XGBRegressor(objective='reg:squarederror', n_estimators=100)
-        xgb_model.fit(X_train, y_train)
-        xgb_forecast = xgb_model.predict(X_test)
-        rmse = mean_squared_error(y_test, xgb_forecast, squared=False)
-        mape = mean_absolute_percentage_error(y_test, xgb_forecast)
-        results['XGBoost'] = (xgb_forecast, rmse, mape)
+        if 'XGBoost' in selected:
+            split_index = int(0.8 * len(multivariate_data))
+            X_train = multivariate_data.drop(columns='close').iloc[:split_index]
+            y_train = multivariate_data['close'].iloc[:split_index]
+            X_test = multivariate_data.drop(columns='close').iloc[split_index:]
+            y_test = multivariate_data['close'].iloc[split_index:]
+
+            xgb_params = {'objective': 'reg:squarederror', 'n_estimators': 100}
+            xgb_model = self.model_cache.fit_regressor(self.ticker, 'XGBoost', xgb.XGBRegressor, xgb_params, X_train, y_train)
+            xgb_forecast = xgb_model.predict(X_test)
+            rmse = mean_squared_error(y_test, xgb_forecast, squared=False)
+            mape = mean_absolute_percentage_error(y_test, xgb_forecast)
+            results['XGBoost'] = (xgb_forecast, rmse, mape)
 
         # RNN model using multivariate data
-        rnn_model = RNNModel(model="LSTM", input_chunk_length=12, output_chunk_length=self.prediction_horizon)
-        rnn_model.fit(series)
-        rnn_forecast = rnn_model.predict(self.prediction_horizon)
-        results['RNN'] = (rnn_forecast, rnn_model.rmse(), rnn_model.mape())
+        if 'RNN' in selected:
+            rnn_params = {'model': "LSTM", 'input_chunk_length': 12, 'output_chunk_length': self.prediction_horizon}
+            rnn_model, rnn_forecast = self.model_cache.fit_predict(self.ticker, RNNModel, rnn_params, series, self.prediction_horizon)
+            results['RNN'] = (rnn_forecast, rnn_model.rmse(), rnn_model.mape())
 
+        self.model_selection.record(self.ticker, results, tournament)
         return results
 
 
@@ -220,10 +210,25 @@ class TimeSeriesForecaster:
         results = self.forecast_with_models()
         if results:
             self.report_results(results)
-            threading.Thread(target=self.create_and_save_visualization, args=(results, self.ticker)).start()
+            self.save_results(results)
+            if not self.headless:
+                threading.Thread(target=self.create_and_save_visualization, args=(results, self.ticker)).start()
+
+    def save_results(self, results: Dict[str, Tuple[pd.DataFrame, float, float]]):
+        """Persist the forecast arrays and metrics to TimeSeriesForecasts."""
+        try:
+            self.forecast_store.save(
+                self.ticker, results, interval=self.interval, start_date=self.start_date, end_date=self.end_date,
+                period=self.period, prediction_horizon=self.prediction_horizon, fill_na_method=self.fill_na_method
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to store forecast for {self.ticker}: {e}")
 
     def create_and_save_visualization(self, results: Dict[str, Tuple[pd.DataFrame, float, float]], ticker: str):
         """Create and save the forecast visualization using Bokeh."""
+        from bokeh.plotting import figure, save
+        from bokeh.models import HoverTool
+
         date_str = datetime.today().strftime('%Y-%m-%d')
         output_dir = os.path.join(self.base_dir, ticker, date_str)
         os.makedirs(output_dir, exist_ok=True)
@@ -256,6 +261,8 @@ class TimeSeriesForecaster:
 
     def notify_user_new_forecast(self, ticker: str, file_path: str):
         """Trigger a system notification to inform the user of the new forecast."""
+        from plyer import notification
+
         self.logger.info(f"Notification: New forecast available for {ticker}. File saved at {file_path}")
         
         # Create a system notification
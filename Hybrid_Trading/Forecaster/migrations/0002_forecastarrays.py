@@ -0,0 +1,33 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forecaster_app', '0001_initial'),
+        ('symbols_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ForecastArrays',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(max_length=50)),
+                ('generated_at', models.DateTimeField()),
+                ('dates', models.BinaryField(blank=True, null=True)),
+                ('point', models.BinaryField()),
+                ('lower', models.BinaryField(blank=True, null=True)),
+                ('upper', models.BinaryField(blank=True, null=True)),
+                ('forecast', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='arrays', to='forecaster_app.timeseriesforecasts')),
+                ('ticker', models.ForeignKey(db_column='ticker', on_delete=django.db.models.deletion.DO_NOTHING, to='symbols_app.tickers', to_field='ticker')),
+            ],
+            options={
+                'db_table': 'time_series_forecast_arrays',
+                'managed': True,
+                'unique_together': {('forecast', 'model_name')},
+                'indexes': [models.Index(fields=['ticker', 'model_name', '-generated_at'], name='forecast_arrays_latest_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forecaster_app', '0002_forecastarrays'),
+        ('symbols_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ForecastAccuracy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(max_length=50)),
+                ('horizon', models.IntegerField()),
+                ('retrain_every', models.IntegerField()),
+                ('start_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('n_forecasts', models.IntegerField(default=0)),
+                ('rmse', models.FloatField(blank=True, null=True)),
+                ('mape', models.FloatField(blank=True, null=True)),
+                ('evaluated_at', models.DateTimeField()),
+                ('ticker', models.ForeignKey(db_column='ticker', on_delete=django.db.models.deletion.DO_NOTHING, to='symbols_app.tickers', to_field='ticker')),
+            ],
+            options={
+                'db_table': 'time_series_forecast_accuracy',
+                'managed': True,
+                'unique_together': {('ticker', 'model_name', 'horizon')},
+            },
+        ),
+    ]
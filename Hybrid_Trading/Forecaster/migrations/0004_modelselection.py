@@ -0,0 +1,30 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forecaster_app', '0003_forecastaccuracy'),
+        ('symbols_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelSelection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scores', models.JSONField(default=dict)),
+                ('ranking', models.JSONField(default=list)),
+                ('baseline_error', models.FloatField(blank=True, null=True)),
+                ('last_tournament_at', models.DateTimeField(blank=True, null=True)),
+                ('needs_tournament', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('ticker', models.OneToOneField(db_column='ticker', on_delete=django.db.models.deletion.DO_NOTHING, to='symbols_app.tickers', to_field='ticker')),
+            ],
+            options={
+                'db_table': 'time_series_model_selection',
+                'managed': True,
+            },
+        ),
+    ]
@@ -33,4 +33,53 @@ class TimeSeriesForecasts(models.Model):
 
     class Meta:
         managed = True
-        db_table = 'time_series_forecasts'
\ No newline at end of file
+        db_table = 'time_series_forecasts'
+
+class ForecastArrays(models.Model):
+    # Compact per-model forecast arrays: dates as int64 epoch seconds, values as float32 bytes
+    forecast = models.ForeignKey(TimeSeriesForecasts, models.CASCADE, related_name='arrays')
+    ticker = models.ForeignKey(Tickers, models.DO_NOTHING, db_column='ticker', to_field='ticker')
+    model_name = models.CharField(max_length=50)
+    generated_at = models.DateTimeField()
+    dates = models.BinaryField(blank=True, null=True)
+    point = models.BinaryField()
+    lower = models.BinaryField(blank=True, null=True)
+    upper = models.BinaryField(blank=True, null=True)
+
+    class Meta:
+        managed = True
+        db_table = 'time_series_forecast_arrays'
+        unique_together = (('forecast', 'model_name'),)
+        indexes = [models.Index(fields=['ticker', 'model_name', '-generated_at'], name='forecast_arrays_latest_idx')]
+
+class ForecastAccuracy(models.Model):
+    # Walk-forward accuracy of one model on one ticker, refreshed by ForecastBacktester
+    ticker = models.ForeignKey(Tickers, models.DO_NOTHING, db_column='ticker', to_field='ticker')
+    model_name = models.CharField(max_length=50)
+    horizon = models.IntegerField()
+    retrain_every = models.IntegerField()
+    start_date = models.DateField(blank=True, null=True)
+    end_date = models.DateField(blank=True, null=True)
+    n_forecasts = models.IntegerField(default=0)
+    rmse = models.FloatField(blank=True, null=True)
+    mape = models.FloatField(blank=True, null=True)
+    evaluated_at = models.DateTimeField()
+
+    class Meta:
+        managed = True
+        db_table = 'time_series_forecast_accuracy'
+        unique_together = (('ticker', 'model_name', 'horizon'),)
+
+class ModelSelection(models.Model):
+    # Per-ticker ranking of forecasting models, maintained by ModelSelectionRegistry
+    ticker = models.OneToOneField(Tickers, models.DO_NOTHING, db_column='ticker', to_field='ticker')
+    scores = models.JSONField(default=dict)  # {model_name: latest validation MAPE}
+    ranking = models.JSONField(default=list)  # Model names from best to worst at the last tournament
+    baseline_error = models.FloatField(blank=True, null=True)  # Winner's MAPE at the last tournament
+    last_tournament_at = models.DateTimeField(blank=True, null=True)
+    needs_tournament = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        managed = True
+        db_table = 'time_series_model_selection'
@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import ForecastView  # Import the class-based view
+from .views import ForecastView, ForecastChartView  # Import the class-based views
 
 app_name = 'forecaster'  # Define the app name for namespacing
 
 urlpatterns = [
     path('forecast/', ForecastView.as_view(), name='forecast'),  # Use the class-based view
+    path('chart/<int:forecast_id>/', ForecastChartView.as_view(), name='forecast_chart'),  # Rendered on first access
 ]
\ No newline at end of file
@@ -1,7 +1,10 @@
-from django.http import JsonResponse
+from django.http import JsonResponse, FileResponse, Http404
+from django.views import View
 from django.views.generic import TemplateView
 from .forms import ForecasterForm  # Import the form for user input
 from Hybrid_Trading.Forecaster.PF import TimeSeriesForecaster  # Import the relevant model or logic
+from Hybrid_Trading.Forecaster.models import TimeSeriesForecasts
+from Hybrid_Trading.Forecaster.Forecast_Renderer import ForecastChartRenderer
 
 class ForecastView(TemplateView):
     """A class-based view for handling forecast form input and processing."""
@@ -44,4 +47,15 @@ class ForecastView(TemplateView):
             return JsonResponse({"message": "Forecast initiated for ticker."})
         
         # Re-render the form with validation errors if form is not valid
-        return self.render_to_response(self.get_context_data(form=form))
\ No newline at end of file
+        return self.render_to_response(self.get_context_data(form=form))
+
+
+class ForecastChartView(View):
+    """Serves the chart of a stored forecast, rendering and caching it on first access."""
+
+    def get(self, request, forecast_id, *args, **kwargs):
+        try:
+            chart_path = ForecastChartRenderer().render(forecast_id)
+        except TimeSeriesForecasts.DoesNotExist:
+            raise Http404(f"Forecast {forecast_id} does not exist")
+        return FileResponse(open(chart_path, 'rb'), content_type='text/html')
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+from asgiref.sync import sync_to_async
+from django.db import transaction, connections
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class BufferedModelWriter:
+    """
+    Buffers unsaved Model_Trainer rows and writes them with bulk_create.
+
+    Rows are grouped by model and flushed when a model's buffer reaches MODEL_TRAINER_BULK_CHUNK_SIZE
+    rows or, from a background thread, every MODEL_TRAINER_FLUSH_INTERVAL seconds. The buffer is
+    guarded by a lock, so it can be shared by pipeline threads and sync_to_async callers. Called
+    directly from an event loop, add() never touches the database; use aadd()/aflush() there.
+    close() (or leaving the context manager) does the final flush.
+
+    Rows of a failed write stay buffered and are retried by the next flush; after
+    MODEL_TRAINER_FLUSH_MAX_RETRIES failed writes in a row they are dropped, so one bad row cannot
+    block every other result. Timed flushes and close() log failures instead of raising.
+    """
+
+    def __init__(self, chunk_size: int = None, flush_interval: float = None, max_retries: int = None):
+        self.logger = LoggingMaster("BufferedModelWriter").get_logger()
+        self.constants = TCS()
+        self.chunk_size = chunk_size or self.constants.MODEL_TRAINER_BULK_CHUNK_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else self.constants.MODEL_TRAINER_FLUSH_INTERVAL
+        self.max_retries = max_retries or self.constants.MODEL_TRAINER_FLUSH_MAX_RETRIES
+        self._buffers: Dict[type, List] = OrderedDict()
+        self._failures: Dict[type, int] = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._timer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _start_timer(self):
+        if self._timer is None and self.flush_interval > 0:
+            self._stop.clear()
+            self._timer = threading.Thread(target=self._flush_periodically, name="BufferedModelWriter", daemon=True)
+            self._timer.start()
+
+    def _flush_periodically(self):
+        try:
+            while not self._stop.wait(self.flush_interval):
+                try:
+                    self.flush()
+                except Exception as e:
+                    self.logger.error(f"Timed flush failed, retrying in {self.flush_interval}s: {e}")
+        finally:
+            connections.close_all()  # Connections opened by this thread
+
+    def add(self, instance):
+        """
+        Buffer one unsaved model instance.
+        """
+        with self._lock:
+            rows = self._buffers.setdefault(type(instance), [])
+            rows.append(instance)
+            full = len(rows) >= self.chunk_size
+            self._start_timer()
+        if full and not _in_event_loop():
+            self.flush(type(instance))
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(len(rows) for rows in self._buffers.values())
+
+    def flush(self, model=None) -> int:
+        """
+        Write the buffered rows (of one model, or of all) and return how many were written.
+        Each model is written in its own transaction; the first failure is re-raised after the others.
+        """
+        with self._lock:
+            models = [model] if model is not None else list(self._buffers)
+            batches = [(model_class, self._buffers.pop(model_class, [])) for model_class in models]
+            batches = [(model_class, rows) for model_class, rows in batches if rows]
+            written, error = [], None
+            for model_class, rows in batches:
+                try:
+                    with transaction.atomic():
+                        model_class.objects.bulk_create(rows, batch_size=self.chunk_size)
+                except Exception as e:
+                    error = error or e
+                    self._requeue(model_class, rows, e)
+                else:
+                    self._failures.pop(model_class, None)
+                    written.append((model_class, rows))
+        if written:
+            self.logger.info(f"Wrote {sum(len(rows) for _, rows in written)} rows: "
+                             + ", ".join(f"{len(rows)} {model_class.__name__}" for model_class, rows in written))
+        if error is not None:
+            raise error
+        return sum(len(rows) for _, rows in written)
+
+    def _requeue(self, model_class: type, rows: List, error: Exception):
+        # Put the rows back so the next flush retries them, unless they already failed max_retries times
+        self._failures[model_class] = self._failures.get(model_class, 0) + 1
+        if self._failures[model_class] >= self.max_retries:
+            self._failures.pop(model_class)
+            self.logger.error(f"Dropping {len(rows)} {model_class.__name__} rows after {self.max_retries} failed writes: {error}")
+            return
+        self._buffers[model_class] = rows + self._buffers.get(model_class, [])
+        self.logger.error(f"Bulk write of {len(rows)} {model_class.__name__} rows failed, kept in the buffer: {error}")
+
+    async def aadd(self, instance):
+        self.add(instance)
+        if self.pending() >= self.chunk_size:
+            await self.aflush()
+
+    async def aflush(self, model=None) -> int:
+        return await sync_to_async(self.flush)(model)
+
+    def close(self) -> int:
+        """
+        Stop the timer thread and write everything still buffered. A failed final write is logged,
+        not raised, so it cannot discard the results of the caller's with-block.
+        """
+        if self._timer is not None:
+            self._stop.set()
+            self._timer.join()
+            self._timer = None
+        try:
+            return self.flush()
+        except Exception as e:
+            self.logger.error(f"Final flush failed, {self.pending()} rows were not written: {e}")
+            return 0
+
+    async def aclose(self) -> int:
+        return await sync_to_async(self.close)()
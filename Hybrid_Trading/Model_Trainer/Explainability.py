@@ -0,0 +1,195 @@
+import os
+import re
+import json
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+from Hybrid_Trading.Model_Trainer.Model_Registry import ModelRegistry
+
+# Modules whose fitted models shap.TreeExplainer handles exactly in polynomial time
+TREE_MODEL_MODULES = ('sklearn.ensemble', 'sklearn.tree', 'xgboost', 'lightgbm', 'catboost')
+
+# Model versions are the first 16 hex digits of the registry's content hash
+VERSION_PATTERN = re.compile(r'[0-9a-f]{16}')
+
+
+def stratified_sample(values: np.ndarray, n: int, n_strata: int = 10, random_state: int = 0) -> np.ndarray:
+    """
+    Positions of about n rows drawn evenly from the quantile strata of `values` (e.g. model predictions),
+    so the sample covers the whole output range instead of its most common region.
+    """
+    values = np.asarray(values, dtype=np.float64).ravel()
+    if len(values) <= n:
+        return np.arange(len(values))
+    rng = np.random.RandomState(random_state)
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, n_strata + 1)[1:-1]))
+    strata = np.searchsorted(edges, values, side='right')
+    counts = np.bincount(strata)
+    quota = np.maximum(np.floor(counts / len(values) * n), (counts > 0).astype(int))
+
+    picked = [rng.choice(np.flatnonzero(strata == stratum), int(min(quota[stratum], counts[stratum])), replace=False)
+              for stratum in np.flatnonzero(counts)]
+    return np.sort(np.concatenate(picked))
+
+
+class ExplanationBudget:
+    """
+    Wall-clock and row budget of one explanation request.
+    """
+
+    def __init__(self, seconds: float, max_rows: int):
+        self.deadline = time.monotonic() + seconds
+        self.max_rows = max_rows
+
+    def exhausted(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+
+class ExplainabilityService:
+    """
+    Lazy, budgeted SHAP and LIME explanations of registered Model_Trainer models.
+
+    prepare() runs at training time and only stores small stratified samples of the training data
+    (SHAP background) and evaluation data (rows to explain) next to the model version. explain()
+    runs when a dashboard asks for it: tree models use shap.TreeExplainer, linear models
+    LinearExplainer, anything else KernelExplainer over a k-means summary of the background, row
+    chunk by row chunk until EXPLAIN_TIME_BUDGET seconds are spent. Complete results are cached per
+    (model version, kind) and never recomputed for the same version; results cut short by the
+    budget are returned but not cached, so a later request can explain every row.
+    """
+
+    def __init__(self, registry: ModelRegistry = None, cache_dir: str = None, time_budget: float = None,
+                 max_rows: int = None, background_size: int = None, lime_rows: int = None):
+        self.logger = LoggingMaster("ExplainabilityService").get_logger()
+        self.constants = TCS()
+        self.registry = registry or ModelRegistry()
+        self.cache_dir = cache_dir or self.constants.EXPLAIN_CACHE_DIR
+        self.time_budget = time_budget or self.constants.EXPLAIN_TIME_BUDGET
+        self.max_rows = max_rows or self.constants.EXPLAIN_MAX_ROWS
+        self.background_size = background_size or self.constants.EXPLAIN_BACKGROUND_SIZE
+        self.lime_rows = lime_rows or self.constants.EXPLAIN_LIME_ROWS
+
+    def _version_dir(self, version: str) -> str:
+        return os.path.join(self.cache_dir, version)
+
+    @staticmethod
+    def _is_tree_model(model) -> bool:
+        return type(model).__module__.startswith(TREE_MODEL_MODULES)
+
+    def prepare(self, version: str, model, X_train: pd.DataFrame, X_eval: pd.DataFrame):
+        """
+        Store the background and evaluation samples of a model version, stratified by its predictions.
+        """
+        version_dir = self._version_dir(version)
+        if os.path.exists(os.path.join(version_dir, 'rows.parquet')):
+            return
+        os.makedirs(version_dir, exist_ok=True)
+        background = X_train.iloc[stratified_sample(model.predict(X_train), self.background_size)]
+        rows = X_eval.iloc[stratified_sample(model.predict(X_eval), self.max_rows)]
+        background.rename(columns=str).to_parquet(os.path.join(version_dir, 'background.parquet'))
+        # rows.parquet is written last; its presence marks the version as prepared
+        rows.rename(columns=str).to_parquet(os.path.join(version_dir, 'rows.parquet'))
+
+    def is_registered_version(self, ticker: str, version: str) -> bool:
+        """
+        Whether `version` is well-formed and registered for the ticker (safe to use in paths).
+        """
+        return bool(VERSION_PATTERN.fullmatch(version)) and version in {entry['version'] for entry in self.registry.versions(ticker)}
+
+    def explain(self, ticker: str, kind: str = 'shap', version: str = None) -> Optional[Dict[str, Any]]:
+        """
+        SHAP ('shap') or LIME ('lime') explanation of a ticker's model (the production version by
+        default), from the cache when it was already computed. A requested version must be one of
+        the ticker's registered versions; it is checked before any path is built from it.
+        """
+        if version is not None and not self.is_registered_version(ticker, version):
+            raise ValueError(f"Version {version} is not registered for {ticker}")
+        version = version or self.registry.production_version(ticker)
+        if version is None:
+            return None
+        cache_path = os.path.join(self._version_dir(version), f"{kind}.json")
+        if os.path.exists(cache_path):
+            with open(cache_path) as cache_file:
+                return json.load(cache_file)
+        if not os.path.exists(os.path.join(self._version_dir(version), 'rows.parquet')):
+            self.logger.warning(f"No explanation samples stored for {ticker} version {version}")
+            return None
+
+        model = self.registry.load(version)
+        background = pd.read_parquet(os.path.join(self._version_dir(version), 'background.parquet'))
+        rows = pd.read_parquet(os.path.join(self._version_dir(version), 'rows.parquet'))
+        budget = ExplanationBudget(self.time_budget, self.max_rows)
+        started = time.monotonic()
+        if kind == 'shap':
+            explanation = self._shap(model, background, rows, budget)
+        elif kind == 'lime':
+            explanation = self._lime(model, background, rows, budget)
+        else:
+            raise ValueError(f"Unknown explanation kind: {kind}")
+
+        explanation.update(ticker=ticker, version=version, kind=kind,
+                           elapsed_seconds=round(time.monotonic() - started, 3))
+        if explanation['complete']:
+            with open(f"{cache_path}.tmp", 'w') as cache_file:
+                json.dump(explanation, cache_file, default=float)
+            os.replace(f"{cache_path}.tmp", cache_path)
+        self.logger.info(f"{kind.upper()} explanation for {ticker} ({version}): {len(explanation['rows'])} rows "
+                         f"in {explanation['elapsed_seconds']}s with {explanation['explainer']}")
+        return explanation
+
+    def _shap(self, model, background: pd.DataFrame, rows: pd.DataFrame, budget: ExplanationBudget) -> Dict[str, Any]:
+        import shap
+
+        rows = rows.iloc[:budget.max_rows]
+        if self._is_tree_model(model):
+            # Path-dependent TreeSHAP needs no background data and explains all rows in one pass
+            explainer, name = shap.TreeExplainer(model), 'TreeExplainer'
+            values, explained = np.asarray(explainer.shap_values(rows)), len(rows)
+        elif hasattr(model, 'coef_'):
+            explainer, name = shap.LinearExplainer(model, background), 'LinearExplainer'
+            values, explained = np.asarray(explainer.shap_values(rows)), len(rows)
+        else:
+            summary = shap.kmeans(background, min(10, len(background)))
+            explainer, name = shap.KernelExplainer(model.predict, summary), 'KernelExplainer'
+            chunks, explained = [], 0
+            for start in range(0, len(rows), 10):
+                if budget.exhausted():
+                    break
+                chunks.append(np.asarray(explainer.shap_values(rows.iloc[start:start + 10], silent=True)))
+                explained += len(chunks[-1])
+            values = np.concatenate(chunks) if chunks else np.empty((0, rows.shape[1]))
+
+        values = values.reshape(explained, rows.shape[1])
+        return {
+            'explainer': name,
+            'features': list(rows.columns),
+            'rows': [str(index) for index in rows.index[:explained]],
+            'values': values.tolist(),
+            'base_value': float(np.ravel(explainer.expected_value)[0]),
+            'mean_abs': dict(zip(rows.columns, np.abs(values).mean(axis=0).tolist())) if explained else {},
+            'complete': explained == len(rows),
+        }
+
+    def _lime(self, model, background: pd.DataFrame, rows: pd.DataFrame, budget: ExplanationBudget) -> Dict[str, Any]:
+        from lime.lime_tabular import LimeTabularExplainer
+
+        # Discretizer statistics come from the small background sample instead of the full training set
+        explainer = LimeTabularExplainer(training_data=background.to_numpy(), feature_names=list(background.columns),
+                                         mode='regression', random_state=0)
+        rows = rows.iloc[:min(budget.max_rows, self.lime_rows)]
+        explanations = {}
+        for index, row in rows.iterrows():
+            if budget.exhausted():
+                break
+            explanation = explainer.explain_instance(row.to_numpy(), model.predict, num_features=min(10, rows.shape[1]))
+            explanations[str(index)] = explanation.as_list()
+        return {
+            'explainer': 'LimeTabularExplainer',
+            'features': list(rows.columns),
+            'rows': list(explanations),
+            'explanations': explanations,
+            'complete': len(explanations) == len(rows),
+        }
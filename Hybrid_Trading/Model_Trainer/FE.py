@@ -1,173 +1,248 @@
+import re
+import hashlib
+import numpy as np
 import pandas as pd
+from functools import lru_cache
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from Hybrid_Trading.Log.Logging_Master import LoggingMaster
 
-ogger = LoggingMaster("FeatureEngineer").get_logger()
+# Historical data (Intraday and Daily)
+HISTORICAL_WEIGHTS = {
+    'historical_open': 0.4,
+    'historical_high': 0.4,
+    'historical_low': 0.4,
+    'historical_close': 0.5,
+    'historical_volume': 0.3,
+    'historical_adjClose': 0.5,
+    'historical_changePercent': 0.2,
+    'historical_unadjustedVolume': 0.3,
+    'historical_change': 0.2,
+    'historical_vwap': 0.4,
+}
+
+# Financial Ratios
+RATIO_WEIGHTS = {
+    'ratios_debtEquityRatio': 0.4,
+    'ratios_returnOnAssets': 0.6,
+    'ratios_returnOnEquity': 0.5,
+    'ratios_returnOnCapitalEmployed': 0.5,
+    'ratios_currentRatio': 0.5,
+    'ratios_quickRatio': 0.4,
+    'ratios_cashRatio': 0.4,
+    'ratios_grossProfitMargin': 0.5,
+    'ratios_operatingProfitMargin': 0.5,
+    'ratios_pretaxProfitMargin': 0.5,
+    'ratios_netProfitMargin': 0.6,
+    'ratios_effectiveTaxRate': 0.4,
+    'ratios_netIncomePerEBT': 0.5,
+    'ratios_ebtPerEbit': 0.4,
+    'ratios_ebitPerRevenue': 0.4,
+    'ratios_debtRatio': 0.5,
+    'ratios_longTermDebtToCapitalization': 0.4,
+    'ratios_totalDebtToCapitalization': 0.4,
+    'ratios_interestCoverage': 0.6,
+    'ratios_cashFlowToDebtRatio': 0.5,
+    'ratios_companyEquityMultiplier': 0.4,
+    'ratios_receivablesTurnover': 0.4,
+    'ratios_payablesTurnover': 0.4,
+    'ratios_inventoryTurnover': 0.4,
+    'ratios_fixedAssetTurnover': 0.4,
+    'ratios_assetTurnover': 0.4,
+    'ratios_operatingCashFlowPerShare': 0.5,
+    'ratios_freeCashFlowPerShare': 0.5,
+    'ratios_cashPerShare': 0.5,
+    'ratios_payoutRatio': 0.4,
+    'ratios_operatingCashFlowSalesRatio': 0.5,
+    'ratios_freeCashFlowOperatingCashFlowRatio': 0.4,
+    'ratios_cashFlowCoverageRatios': 0.5,
+    'ratios_shortTermCoverageRatios': 0.4,
+    'ratios_capitalExpenditureCoverageRatio': 0.5,
+    'ratios_dividendPaidAndCapexCoverageRatio': 0.4,
+    'ratios_dividendPayoutRatio': 0.4,
+    'ratios_priceBookValueRatio': 0.4,
+    'ratios_priceToBookRatio': 0.4,
+    'ratios_priceToSalesRatio': 0.4,
+    'ratios_priceEarningsRatio': 0.5,
+    'ratios_priceToFreeCashFlowsRatio': 0.4,
+    'ratios_priceToOperatingCashFlowsRatio': 0.4,
+    'ratios_priceCashFlowRatio': 0.4,
+    'ratios_priceEarningsToGrowthRatio': 0.5,
+    'ratios_priceSalesRatio': 0.4,
+    'ratios_dividendYield': 0.5,
+    'ratios_enterpriseValueMultiple': 0.4,
+    'ratios_priceFairValue': 0.5,
+}
+
+# Key Metrics
+METRIC_WEIGHTS = {
+    'metrics_revenuePerShare': 0.5,
+    'metrics_netIncomePerShare': 0.5,
+    'metrics_operatingCashFlowPerShare': 0.6,
+    'metrics_freeCashFlowPerShare': 0.6,
+    'metrics_cashPerShare': 0.5,
+    'metrics_bookValuePerShare': 0.5,
+    'metrics_tangibleBookValuePerShare': 0.5,
+    'metrics_shareholdersEquityPerShare': 0.5,
+    'metrics_interestDebtPerShare': 0.5,
+    'metrics_marketCap': 0.5,
+    'metrics_enterpriseValue': 0.4,
+    'metrics_peRatio': 0.5,
+    'metrics_priceToSalesRatio': 0.5,
+    'metrics_evToSales': 0.4,
+    'metrics_enterpriseValueOverEBITDA': 0.4,
+    'metrics_evToOperatingCashFlow': 0.4,
+    'metrics_evToFreeCashFlow': 0.4,
+    'metrics_earningsYield': 0.5,
+    'metrics_freeCashFlowYield': 0.5,
+    'metrics_debtToEquity': 0.4,
+    'metrics_debtToAssets': 0.4,
+    'metrics_netDebtToEBITDA': 0.5,
+    'metrics_currentRatio': 0.5,
+    'metrics_interestCoverage': 0.5,
+    'metrics_incomeQuality': 0.5,
+    'metrics_dividendYield': 0.5,
+    'metrics_payoutRatio': 0.4,
+    'metrics_salesGeneralAndAdministrativeToRevenue': 0.4,
+    'metrics_researchAndDevelopmentToRevenue': 0.4,
+    'metrics_intangiblesToTotalAssets': 0.4,
+    'metrics_capexToOperatingCashFlow': 0.4,
+    'metrics_capexToRevenue': 0.4,
+    'metrics_capexToDepreciation': 0.4,
+    'metrics_stockBasedCompensationToRevenue': 0.4,
+    'metrics_grahamNumber': 0.5,
+    'metrics_roic': 0.5,
+    'metrics_returnOnTangibleAssets': 0.5,
+    'metrics_grahamNetNet': 0.5,
+    'metrics_workingCapital': 0.5,
+    'metrics_tangibleAssetValue': 0.5,
+    'metrics_netCurrentAssetValue': 0.5,
+    'metrics_investedCapital': 0.5,
+    'metrics_averageReceivables': 0.4,
+    'metrics_averagePayables': 0.4,
+    'metrics_averageInventory': 0.4,
+    'metrics_daysSalesOutstanding': 0.4,
+    'metrics_daysPayablesOutstanding': 0.4,
+    'metrics_daysOfInventoryOnHand': 0.4,
+    'metrics_receivablesTurnover': 0.4,
+    'metrics_payablesTurnover': 0.4,
+    'metrics_inventoryTurnover': 0.4,
+    'metrics_roe': 0.5,
+    'metrics_capexPerShare': 0.4,
+}
+
+# Upgrades/Downgrades Data
+UPGRADE_DOWNGRADE_WEIGHTS = {
+    'upgrades_downgrades_priceWhenPosted': 0.5,
+}
+
+# Assign weights based on the publisher
+NEWS_WEIGHTS = {
+    'Wall Street Journal': 1.0,
+    'Bloomberg': 0.9,
+    'CNBC': 0.8,
+    'Reuters': 0.85,
+    'MarketWatch': 0.75,
+    'StockTwits': 0.5,
+    'Other': 0.6  # Default weight for less-known publishers
+}
+
+# Assign weights based on the grading company
+GRADING_WEIGHTS = {
+    'Moody\'s': 1.0,
+    'S&P': 0.9,
+    'Fitch': 0.85,
+    'Morningstar': 0.8,
+    'Other': 0.6  # Default weight for less-known grading companies
+}
+
+# Assign weights based on the action taken (upgrade, downgrade, etc.)
+ACTION_WEIGHTS = {
+    'Upgrade': 1.0,
+    'Downgrade': -1.0,
+    'Reaffirm': 0.5,
+    'Other': 0.2  # Default weight for less-known actions
+}
+
+# Source columns that may be absent from the input; they are weighted as zeros
+OPTIONAL_COLUMNS = {'historical_adjClose', 'historical_changePercent', 'historical_unadjustedVolume', 'historical_change', 'historical_vwap'}
+
+
 class FeatureEngineer:
     def __init__(self, user_input):
         self.user_input = user_input
-     
+        self.logger = LoggingMaster("FeatureEngineer").get_logger()
 
     def weighted_features(self, df):
-        # Historical data (Intraday and Daily)
-        df['weighted_open'] = df['historical_open'] * 0.4
-        df['weighted_high'] = df['historical_high'] * 0.4
-        df['weighted_low'] = df['historical_low'] * 0.4
-        df['weighted_close'] = df['historical_close'] * 0.5
-        df['weighted_volume'] = df['historical_volume'] * 0.3
-        df['weighted_adjClose'] = df.get('historical_adjClose', pd.Series(0)) * 0.5
-        df['weighted_changePercent'] = df.get('historical_changePercent', pd.Series(0)) * 0.2
-        df['weighted_unadjustedVolume'] = df.get('historical_unadjustedVolume', pd.Series(0)) * 0.3
-        df['weighted_change'] = df.get('historical_change', pd.Series(0)) * 0.2
-        df['weighted_vwap'] = df.get('historical_vwap', pd.Series(0)) * 0.4
-
-        # Financial Ratios
-        df['weighted_debtEquityRatio'] = df['ratios_debtEquityRatio'] * 0.4
-        df['weighted_returnOnAssets'] = df['ratios_returnOnAssets'] * 0.6
-        df['weighted_returnOnEquity'] = df['ratios_returnOnEquity'] * 0.5
-        df['weighted_returnOnCapitalEmployed'] = df['ratios_returnOnCapitalEmployed'] * 0.5
-        df['weighted_currentRatio'] = df['ratios_currentRatio'] * 0.5
-        df['weighted_quickRatio'] = df['ratios_quickRatio'] * 0.4
-        df['weighted_cashRatio'] = df['ratios_cashRatio'] * 0.4
-        df['weighted_grossProfitMargin'] = df['ratios_grossProfitMargin'] * 0.5
-        df['weighted_operatingProfitMargin'] = df['ratios_operatingProfitMargin'] * 0.5
-        df['weighted_pretaxProfitMargin'] = df['ratios_pretaxProfitMargin'] * 0.5
-        df['weighted_netProfitMargin'] = df['ratios_netProfitMargin'] * 0.6
-        df['weighted_effectiveTaxRate'] = df['ratios_effectiveTaxRate'] * 0.4
-        df['weighted_netIncomePerEBT'] = df['ratios_netIncomePerEBT'] * 0.5
-        df['weighted_ebtPerEbit'] = df['ratios_ebtPerEbit'] * 0.4
-        df['weighted_ebitPerRevenue'] = df['ratios_ebitPerRevenue'] * 0.4
-        df['weighted_debtRatio'] = df['ratios_debtRatio'] * 0.5
-        df['weighted_longTermDebtToCapitalization'] = df['ratios_longTermDebtToCapitalization'] * 0.4
-        df['weighted_totalDebtToCapitalization'] = df['ratios_totalDebtToCapitalization'] * 0.4
-        df['weighted_interestCoverage'] = df['ratios_interestCoverage'] * 0.6
-        df['weighted_cashFlowToDebtRatio'] = df['ratios_cashFlowToDebtRatio'] * 0.5
-        df['weighted_companyEquityMultiplier'] = df['ratios_companyEquityMultiplier'] * 0.4
-        df['weighted_receivablesTurnover'] = df['ratios_receivablesTurnover'] * 0.4
-        df['weighted_payablesTurnover'] = df['ratios_payablesTurnover'] * 0.4
-        df['weighted_inventoryTurnover'] = df['ratios_inventoryTurnover'] * 0.4
-        df['weighted_fixedAssetTurnover'] = df['ratios_fixedAssetTurnover'] * 0.4
-        df['weighted_assetTurnover'] = df['ratios_assetTurnover'] * 0.4
-        df['weighted_operatingCashFlowPerShare'] = df['ratios_operatingCashFlowPerShare'] * 0.5
-        df['weighted_freeCashFlowPerShare'] = df['ratios_freeCashFlowPerShare'] * 0.5
-        df['weighted_cashPerShare'] = df['ratios_cashPerShare'] * 0.5
-        df['weighted_payoutRatio'] = df['ratios_payoutRatio'] * 0.4
-        df['weighted_operatingCashFlowSalesRatio'] = df['ratios_operatingCashFlowSalesRatio'] * 0.5
-        df['weighted_freeCashFlowOperatingCashFlowRatio'] = df['ratios_freeCashFlowOperatingCashFlowRatio'] * 0.4
-        df['weighted_cashFlowCoverageRatios'] = df['ratios_cashFlowCoverageRatios'] * 0.5
-        df['weighted_shortTermCoverageRatios'] = df['ratios_shortTermCoverageRatios'] * 0.4
-        df['weighted_capitalExpenditureCoverageRatio'] = df['ratios_capitalExpenditureCoverageRatio'] * 0.5
-        df['weighted_dividendPaidAndCapexCoverageRatio'] = df['ratios_dividendPaidAndCapexCoverageRatio'] * 0.4
-        df['weighted_dividendPayoutRatio'] = df['ratios_dividendPayoutRatio'] * 0.4
-        df['weighted_priceBookValueRatio'] = df['ratios_priceBookValueRatio'] * 0.4
-        df['weighted_priceToBookRatio'] = df['ratios_priceToBookRatio'] * 0.4
-        df['weighted_priceToSalesRatio'] = df['ratios_priceToSalesRatio'] * 0.4
-        df['weighted_priceEarningsRatio'] = df['ratios_priceEarningsRatio'] * 0.5
-        df['weighted_priceToFreeCashFlowsRatio'] = df['ratios_priceToFreeCashFlowsRatio'] * 0.4
-        df['weighted_priceToOperatingCashFlowsRatio'] = df['ratios_priceToOperatingCashFlowsRatio'] * 0.4
-        df['weighted_priceCashFlowRatio'] = df['ratios_priceCashFlowRatio'] * 0.4
-        df['weighted_priceEarningsToGrowthRatio'] = df['ratios_priceEarningsToGrowthRatio'] * 0.5
-        df['weighted_priceSalesRatio'] = df['ratios_priceSalesRatio'] * 0.4
-        df['weighted_dividendYield'] = df['ratios_dividendYield'] * 0.5
-        df['weighted_enterpriseValueMultiple'] = df['ratios_enterpriseValueMultiple'] * 0.4
-        df['weighted_priceFairValue'] = df['ratios_priceFairValue'] * 0.5
-
-        # Key Metrics
-        df['weighted_revenuePerShare'] = df['metrics_revenuePerShare'] * 0.5
-        df['weighted_netIncomePerShare'] = df['metrics_netIncomePerShare'] * 0.5
-        df['weighted_operatingCashFlowPerShare'] = df['metrics_operatingCashFlowPerShare'] * 0.6
-        df['weighted_freeCashFlowPerShare'] = df['metrics_freeCashFlowPerShare'] * 0.6
-        df['weighted_cashPerShare'] = df['metrics_cashPerShare'] * 0.5
-        df['weighted_bookValuePerShare'] = df['metrics_bookValuePerShare'] * 0.5
-        df['weighted_tangibleBookValuePerShare'] = df['metrics_tangibleBookValuePerShare'] * 0.5
-        df['weighted_shareholdersEquityPerShare'] = df['metrics_shareholdersEquityPerShare'] * 0.5
-        df['weighted_interestDebtPerShare'] = df['metrics_interestDebtPerShare'] * 0.5
-        df['weighted_marketCap'] = df['metrics_marketCap'] * 0.5
-        df['weighted_enterpriseValue'] = df['metrics_enterpriseValue'] * 0.4
-        df['weighted_peRatio'] = df['metrics_peRatio'] * 0.5
-        df['weighted_priceToSalesRatio'] = df['metrics_priceToSalesRatio'] * 0.5
-        df['weighted_evToSales'] = df['metrics_evToSales'] * 0.4
-        df['weighted_enterpriseValueOverEBITDA'] = df['metrics_enterpriseValueOverEBITDA'] * 0.4
-        df['weighted_evToOperatingCashFlow'] = df['metrics_evToOperatingCashFlow'] * 0.4
-        df['weighted_evToFreeCashFlow'] = df['metrics_evToFreeCashFlow'] * 0.4
-        df['weighted_earningsYield'] = df['metrics_earningsYield'] * 0.5
-        df['weighted_freeCashFlowYield'] = df['metrics_freeCashFlowYield'] * 0.5
-        df['weighted_debtToEquity'] = df['metrics_debtToEquity'] * 0.4
-        df['weighted_debtToAssets'] = df['metrics_debtToAssets'] * 0.4
-        df['weighted_netDebtToEBITDA'] = df['metrics_netDebtToEBITDA'] * 0.5
-        df['weighted_currentRatio'] = df['metrics_currentRatio'] * 0.5
-        df['weighted_interestCoverage'] = df['metrics_interestCoverage'] * 0.5
-        df['weighted_incomeQuality'] = df['metrics_incomeQuality'] * 0.5
-        df['weighted_dividendYield'] = df['metrics_dividendYield'] * 0.5
-        df['weighted_payoutRatio'] = df['metrics_payoutRatio'] * 0.4
-        df['weighted_salesGeneralAndAdministrativeToRevenue'] = df['metrics_salesGeneralAndAdministrativeToRevenue'] * 0.4
-        df['weighted_researchAndDevelopmentToRevenue'] = df['metrics_researchAndDevelopmentToRevenue'] * 0.4
-        df['weighted_intangiblesToTotalAssets'] = df['metrics_intangiblesToTotalAssets'] * 0.4
-        df['weighted_capexToOperatingCashFlow'] = df['metrics_capexToOperatingCashFlow'] * 0.4
-        df['weighted_capexToRevenue'] = df['metrics_capexToRevenue'] * 0.4
-        df['weighted_capexToDepreciation'] = df['metrics_capexToDepreciation'] * 0.4
-        df['weighted_stockBasedCompensationToRevenue'] = df['metrics_stockBasedCompensationToRevenue'] * 0.4
-        df['weighted_grahamNumber'] = df['metrics_grahamNumber'] * 0.5
-        df['weighted_roic'] = df['metrics_roic'] * 0.5
-        df['weighted_returnOnTangibleAssets'] = df['metrics_returnOnTangibleAssets'] * 0.5
-        df['weighted_grahamNetNet'] = df['metrics_grahamNetNet'] * 0.5
-        df['weighted_workingCapital'] = df['metrics_workingCapital'] * 0.5
-        df['weighted_tangibleAssetValue'] = df['metrics_tangibleAssetValue'] * 0.5
-        df['weighted_netCurrentAssetValue'] = df['metrics_netCurrentAssetValue'] * 0.5
-        df['weighted_investedCapital'] = df['metrics_investedCapital'] * 0.5
-        df['weighted_averageReceivables'] = df['metrics_averageReceivables'] * 0.4
-        df['weighted_averagePayables'] = df['metrics_averagePayables'] * 0.4
-        df['weighted_averageInventory'] = df['metrics_averageInventory'] * 0.4
-        df['weighted_daysSalesOutstanding'] = df['metrics_daysSalesOutstanding'] * 0.4
-        df['weighted_daysPayablesOutstanding'] = df['metrics_daysPayablesOutstanding'] * 0.4
-        df['weighted_daysOfInventoryOnHand'] = df['metrics_daysOfInventoryOnHand'] * 0.4
-        df['weighted_receivablesTurnover'] = df['metrics_receivablesTurnover'] * 0.4
-        df['weighted_payablesTurnover'] = df['metrics_payablesTurnover'] * 0.4
-        df['weighted_inventoryTurnover'] = df['metrics_inventoryTurnover'] * 0.4
-        df['weighted_roe'] = df['metrics_roe'] * 0.5
-        df['weighted_capexPerShare'] = df['metrics_capexPerShare'] * 0.4
-
-        # Upgrades/Downgrades Data
-        df['weighted_newsPublisher'] = df['upgrades_downgrades_newsPublisher'].apply(self.assign_news_weight)
-        df['weighted_gradingCompany'] = df['upgrades_downgrades_gradingCompany'].apply(self.assign_grading_weight)
-        df['weighted_action'] = df['upgrades_downgrades_action'].apply(self.assign_action_weight)
-        df['weighted_priceWhenPosted'] = df['upgrades_downgrades_priceWhenPosted'] * 0.5
-
-        return df
+        """
+        Add the weighted_* columns as one float32 block: the source columns are multiplied by the
+        weight vector in a single broadcast, and the categorical columns are mapped through their weight tables.
+        """
+        columns, weights = self.weight_vector()
+        present = [column in df.columns for column in columns]
+        for column, is_present in zip(columns, present):
+            if not is_present and column not in OPTIONAL_COLUMNS:
+                raise KeyError(column)
+
+        # Missing optional columns contribute zeros
+        values = np.zeros((len(df), len(columns)), dtype=np.float32)
+        present_columns = [column for column, is_present in zip(columns, present) if is_present]
+        if present_columns:
+            values[:, np.flatnonzero(present)] = df[present_columns].to_numpy(dtype=np.float32, na_value=np.nan)
+        values *= weights
+
+        weighted = pd.DataFrame(values, index=df.index, columns=[self.weighted_name(column) for column in columns])
+        weighted['weighted_newsPublisher'] = self.map_weights(df['upgrades_downgrades_newsPublisher'], NEWS_WEIGHTS)
+        weighted['weighted_gradingCompany'] = self.map_weights(df['upgrades_downgrades_gradingCompany'], GRADING_WEIGHTS)
+        weighted['weighted_action'] = self.map_weights(df['upgrades_downgrades_action'], ACTION_WEIGHTS)
+        weighted['weighted_priceWhenPosted'] = weighted.pop('weighted_priceWhenPosted')  # Keep the established column order
+
+        # One concat instead of one insert per column keeps the frame consolidated
+        return pd.concat([df.drop(columns=weighted.columns, errors='ignore'), weighted], axis=1)
+
+    @staticmethod
+    def weighted_name(column):
+        return 'weighted_' + re.sub(r'^(historical|ratios|metrics|upgrades_downgrades)_', '', column)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def weight_vector():
+        """
+        Source columns and their float32 weights. Where a ratio and a key metric map to the same
+        weighted_* name, the key metric's weight wins.
+        """
+        by_name = {}
+        for table in (HISTORICAL_WEIGHTS, RATIO_WEIGHTS, METRIC_WEIGHTS, UPGRADE_DOWNGRADE_WEIGHTS):
+            for column, weight in table.items():
+                by_name[FeatureEngineer.weighted_name(column)] = (column, weight)
+        columns = tuple(column for column, _ in by_name.values())
+        weights = np.array([weight for _, weight in by_name.values()], dtype=np.float32)
+        return columns, weights
+
+    @staticmethod
+    def definition_hash():
+        """
+        Short hash of the weight tables, used to version materialized features.
+        """
+        columns, weights = FeatureEngineer.weight_vector()
+        definition = repr((columns, weights.tolist(), NEWS_WEIGHTS, GRADING_WEIGHTS, ACTION_WEIGHTS))
+        return hashlib.sha256(definition.encode()).hexdigest()[:8]
+
+    @staticmethod
+    def map_weights(values, weights):
+        # Vectorized lookup; unknown and missing categories get the 'Other' weight
+        return values.map(weights).fillna(weights['Other']).astype(np.float32)
 
     def assign_news_weight(self, publisher):
         # Assign weights based on the publisher
-        weights = {
-            'Wall Street Journal': 1.0,
-            'Bloomberg': 0.9,
-            'CNBC': 0.8,
-            'Reuters': 0.85,
-            'MarketWatch': 0.75,
-            'StockTwits': 0.5,
-            'Other': 0.6  # Default weight for less-known publishers
-        }
-        return weights.get(publisher, weights['Other'])
+        return NEWS_WEIGHTS.get(publisher, NEWS_WEIGHTS['Other'])
 
     def assign_grading_weight(self, grading_company):
         # Assign weights based on the grading company
-        weights = {
-            'Moody\'s': 1.0,
-            'S&P': 0.9,
-            'Fitch': 0.85,
-            'Morningstar': 0.8,
-            'Other': 0.6  # Default weight for less-known grading companies
-        }
-        return weights.get(grading_company, weights['Other'])
+        return GRADING_WEIGHTS.get(grading_company, GRADING_WEIGHTS['Other'])
 
     def assign_action_weight(self, action):
         # Assign weights based on the action taken (upgrade, downgrade, etc.)
-        weights = {
-            'Upgrade': 1.0,
-            'Downgrade': -1.0,
-            'Reaffirm': 0.5,
-            'Other': 0.2  # Default weight for less-known actions
-        }
-        return weights.get(action, weights['Other'])
+        return ACTION_WEIGHTS.get(action, ACTION_WEIGHTS['Other'])
 
     def scale_features(self, df):
         # Apply scaling using StandardScaler
@@ -180,15 +255,16 @@ class FeatureEngineer:
         normalizer = MinMaxScaler()
         df_normalized = normalizer.fit_transform(df)
         return pd.DataFrame(df_normalized, columns=df.columns)
-    def run_feature_engineer(self, df):
+    def run_feature_engineer(self, df, apply_weights=True):
         """
         Orchestrates the feature engineering process.
-        - Applies weighted features
+        - Applies weighted features (skipped when they were already materialized by the feature store)
         - Scales the features
         - Optionally normalizes the features based on user input
 
         Args:
             df (DataFrame): Input data containing the raw features.
+            apply_weights (bool): Whether to compute the weighted features.
 
         Returns:
             DataFrame: Processed DataFrame with engineered features.
@@ -197,8 +273,9 @@ class FeatureEngineer:
         
         try:
             # Step 1: Apply weighted features
-            df = self.weighted_features(df)
-            self.logger.info("Weighted features applied successfully.")
+            if apply_weights:
+                df = self.weighted_features(df)
+                self.logger.info("Weighted features applied successfully.")
             
             # Step 2: Scale the features
             df = self.scale_features(df)
@@ -1,60 +1,113 @@
+import os
+import json
+import hashlib
 import logging
+import threading
+import numpy as np
 import pandas as pd
-from sklearn.feature_selection import SelectKBest, f_regression, mutual_info_regression
+from collections import OrderedDict
+from typing import Optional, List
+from sklearn.feature_selection import f_regression, mutual_info_regression
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.linear_model import Lasso, Ridge, LogisticRegression, SGDRegressor, PassiveAggressiveRegressor, Perceptron
 from sklearn.svm import SVR
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from alive_progress import alive_bar
 from xgboost import XGBRegressor
+from Config.trading_constants import TCS
+
+
+def approximate_mutual_info(X: np.ndarray, y: np.ndarray, n_bins: int = 16) -> np.ndarray:
+    """
+    Mutual information of every column of X with y, from quantile-binned joint histograms.
+    Columns are binned one at a time with searchsorted and counted at once with a single bincount.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n_rows, n_cols = X.shape
+    quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+
+    # Bin codes 0..n_bins-1 from each column's own quantile edges (ties collapse into fewer bins)
+    x_edges = np.quantile(X, quantiles, axis=0)  # (n_bins - 1, n_cols)
+    x_codes = np.empty((n_rows, n_cols), dtype=np.intp)
+    for column in range(n_cols):
+        x_codes[:, column] = np.searchsorted(x_edges[:, column], X[:, column], side='left')
+    y_codes = np.searchsorted(np.quantile(y, quantiles), y, side='left')
+
+    cells = x_codes * n_bins + y_codes[:, None] + np.arange(n_cols) * n_bins * n_bins
+    joint = np.bincount(cells.ravel(), minlength=n_cols * n_bins * n_bins).reshape(n_cols, n_bins, n_bins) / n_rows
+    px = joint.sum(axis=2, keepdims=True)
+    py = joint.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(joint > 0, joint * np.log(joint / (px * py)), 0.0)
+    return terms.sum(axis=(1, 2))
 
 
 class FeatureSelector:
-    def __init__(self, user_input, method: str = 'k_best', k: int = 10, threshold: float = 0.01):
+    """
+    Feature selection by f_regression ('k_best'), mutual information ('mutual_info'), quantile-binned
+    approximate mutual information ('approx_mutual_info') or model importance ('model_based').
+
+    Per-feature scores are cached in memory and under FEATURE_SELECTION_CACHE_DIR, keyed by the
+    feature-set version, method, data window and a hash of the data, so unchanged inputs are not
+    rescored. The disk cache keeps the FEATURE_SELECTION_MAX_CACHE_FILES most recently used entries. Before scoring, columns whose absolute correlation with an already kept column exceeds
+    FEATURE_SELECTION_CORRELATION_THRESHOLD are dropped; the column most correlated with the target
+    represents each cluster.
+    """
+
+    _score_cache: "OrderedDict[str, pd.Series]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    MAX_CACHED_SCORES = 256
+    LINEAR_MODELS = ('Lasso', 'Ridge', 'Logistic Regression', 'SGDRegressor', 'PassiveAggressiveRegressor', 'Perceptron', 'SVM')
+
+    def __init__(self, user_input=None, method: str = 'k_best', k: int = 10, threshold: float = 0.01,
+                 model_type: str = None, feature_set_version: str = None, correlation_threshold: float = None,
+                 cache_dir: str = None, mi_bins: int = None):
+        self.constants = TCS()
         self.user_input = user_input
         self.method = method
         self.k = k
         self.threshold = threshold
+        self.model_type = model_type or (user_input.args.get('model_type', 'XGBoost') if user_input is not None else 'XGBoost')
+        self.feature_set_version = feature_set_version or self.constants.FEATURE_SET_VERSION
+        self.correlation_threshold = correlation_threshold if correlation_threshold is not None else self.constants.FEATURE_SELECTION_CORRELATION_THRESHOLD
+        self.cache_dir = cache_dir or self.constants.FEATURE_SELECTION_CACHE_DIR
+        self.mi_bins = mi_bins or self.constants.FEATURE_SELECTION_MI_BINS
+        self.max_cache_files = self.constants.FEATURE_SELECTION_MAX_CACHE_FILES
         logging.info(f"FeatureSelector initialized with method: {method}, k: {k}, threshold: {threshold}")
 
     def select_features(self, df: pd.DataFrame, target: pd.Series) -> pd.DataFrame:
-        model_type = self.user_input.args.get('model_type', 'XGBoost')  # Default to XGBoost if not specified
-        logging.info(f"Starting feature selection for model type: {model_type}")
-        print(f"Selecting features for model type: {model_type}")
+        logging.info(f"Starting feature selection for model type: {self.model_type}")
 
         try:
             if self.method == 'k_best':
                 return self.k_best_selection(df, target)
-            elif self.method == 'mutual_info':
+            elif self.method in ('mutual_info', 'approx_mutual_info'):
                 return self.mutual_info_selection(df, target)
             else:
-                return self.model_based_selection(df, target, model_type)
+                return self.model_based_selection(df, target, self.model_type)
         except Exception as e:
             logging.error(f"Error during feature selection: {e}")
             raise
 
     def k_best_selection(self, df: pd.DataFrame, target: pd.Series) -> pd.DataFrame:
-        selector = SelectKBest(score_func=f_regression, k=self.k)
-        df_selected = selector.fit_transform(df, target)
-        selected_features = df.columns[selector.get_support(indices=True)]
+        scores = self.feature_scores(df, target, 'k_best')
+        selected_features = self.top_k(scores)
         logging.info(f"Selected top {self.k} features using k_best method: {selected_features}")
-        return pd.DataFrame(df_selected, columns=selected_features)
+        return df[selected_features]
 
     def mutual_info_selection(self, df: pd.DataFrame, target: pd.Series) -> pd.DataFrame:
-        selector = SelectKBest(score_func=mutual_info_regression, k=self.k)
-        df_selected = selector.fit_transform(df, target)
-        selected_features = df.columns[selector.get_support(indices=True)]
-        logging.info(f"Selected top {self.k} features using mutual information method: {selected_features}")
-        return pd.DataFrame(df_selected, columns=selected_features)
+        method = 'approx_mutual_info' if self.method == 'approx_mutual_info' else 'mutual_info'
+        scores = self.feature_scores(df, target, method)
+        selected_features = self.top_k(scores)
+        logging.info(f"Selected top {self.k} features using {method} method: {selected_features}")
+        return df[selected_features]
 
     def model_based_selection(self, df: pd.DataFrame, target: pd.Series, model_type: str) -> pd.DataFrame:
-        model = self.get_model(model_type)
-        model.fit(df, target)
-        importances = model.feature_importances_ if hasattr(model, 'feature_importances_') else model.coef_
-        selected_features = df.columns[importances > self.threshold] if hasattr(model, 'feature_importances_') else df.columns[importances != 0]
-        df_selected = df[selected_features]
+        scores = self.feature_scores(df, target, f"model_based:{model_type}")
+        # Tree importances must exceed the threshold; linear coefficients must be non-zero
+        cutoff = 0 if model_type in self.LINEAR_MODELS else self.threshold
+        selected_features = list(scores.index[scores.to_numpy() > cutoff])
         logging.info(f"Selected features based on {model_type} model importance: {selected_features}")
-        return df_selected
+        return df[selected_features]
 
     def get_model(self, model_type: str):
         models = {
@@ -71,24 +124,117 @@ class FeatureSelector:
         }
         return models.get(model_type, XGBRegressor())  # Default to XGBoost
 
-    def run_selection(self, df: pd.DataFrame, target: pd.Series) -> pd.DataFrame:
-        num_tickers = len(df.columns)
-        logging.info(f"Running feature selection on {num_tickers} features.")
-        print(f"Running feature selection on {num_tickers} features.")
+    def top_k(self, scores: pd.Series) -> List[str]:
+        return list(scores.sort_values(ascending=False, kind='stable').index[:self.k])
+
+    def decorrelate(self, df: pd.DataFrame, target: pd.Series) -> List[str]:
+        """
+        Columns left after dropping those correlated above correlation_threshold with a kept column.
+        Columns are visited in order of absolute correlation with the target.
+        """
+        if self.correlation_threshold >= 1 or df.shape[1] < 2:
+            return list(df.columns)
+        values = df.to_numpy(dtype=np.float64)
+        values = (values - values.mean(axis=0)) / np.where(values.std(axis=0) > 0, values.std(axis=0), 1)
+        y = target.to_numpy(dtype=np.float64)
+        y = (y - y.mean()) / (y.std() or 1)
+        target_corr = np.abs(values.T @ y) / len(y)
+        corr = np.abs(values.T @ values) / len(values)
+
+        kept = []
+        for column in np.argsort(-target_corr, kind='stable'):
+            if not kept or corr[column, kept].max() <= self.correlation_threshold:
+                kept.append(column)
+        kept.sort()
+        if len(kept) < df.shape[1]:
+            logging.info(f"Correlation prefilter kept {len(kept)} of {df.shape[1]} features")
+        return list(df.columns[kept])
+
+    def _cache_key(self, df: pd.DataFrame, target: pd.Series, method: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(json.dumps([self.feature_set_version, method, self.mi_bins, self.correlation_threshold,
+                                  str(df.index[0]), str(df.index[-1]), len(df), list(map(str, df.columns))]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        digest.update(pd.util.hash_pandas_object(target, index=True).to_numpy().tobytes())
+        return digest.hexdigest()[:24]
+
+    def _compute_scores(self, df: pd.DataFrame, target: pd.Series, method: str) -> np.ndarray:
+        if method == 'k_best':
+            return np.nan_to_num(f_regression(df, target)[0])
+        if method == 'mutual_info':
+            return mutual_info_regression(df, target)
+        if method == 'approx_mutual_info':
+            return approximate_mutual_info(df.to_numpy(), target.to_numpy(), n_bins=self.mi_bins)
+        model = self.get_model(method.split(':', 1)[1])
+        model.fit(df, target)
+        importances = model.feature_importances_ if hasattr(model, 'feature_importances_') else model.coef_
+        return np.abs(np.ravel(importances)) if not hasattr(model, 'feature_importances_') else np.asarray(importances)
+
+    def feature_scores(self, df: pd.DataFrame, target: pd.Series, method: str) -> pd.Series:
+        """
+        Score of every feature (0 for those dropped by the correlation prefilter), from the cache when possible.
+        """
+        key = self._cache_key(df, target, method)
+        with self._cache_lock:
+            if key in self._score_cache:
+                self._score_cache.move_to_end(key)
+                return self._score_cache[key]
+
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        if os.path.exists(path):
+            with open(path) as cache_file:
+                scores = pd.Series(json.load(cache_file), dtype=np.float64).reindex(df.columns, fill_value=0.0)
+            os.utime(path)  # Mark as recently used for pruning
+            logging.info(f"Feature scores for {method} loaded from cache")
+        else:
+            columns = self.decorrelate(df, target)
+            scores = pd.Series(0.0, index=df.columns)
+            scores[columns] = self._compute_scores(df[columns], target, method)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(f"{path}.tmp", 'w') as cache_file:
+                json.dump({str(column): float(score) for column, score in scores.items()}, cache_file)
+            os.replace(f"{path}.tmp", path)
+            self._prune_disk_cache()
+
+        with self._cache_lock:
+            self._score_cache[key] = scores
+            while len(self._score_cache) > self.MAX_CACHED_SCORES:
+                self._score_cache.popitem(last=False)
+        return scores
 
-        selected_features_df = pd.DataFrame()
+    def _prune_disk_cache(self):
+        """
+        Delete the least recently used score files beyond max_cache_files.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                try:
+                    entries.append((os.path.getmtime(os.path.join(self.cache_dir, name)), name))
+                except FileNotFoundError:
+                    continue  # Pruned concurrently
+        entries.sort()
+        for _, name in entries[:max(0, len(entries) - self.max_cache_files)]:
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
 
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = []
-            with alive_bar(num_tickers, title="Feature Selection Progress") as bar:
-                for feature in df.columns:
-                    futures.append(executor.submit(self.select_features, df, target))
+    def run_selection(self, df: pd.DataFrame, target) -> pd.DataFrame:
+        """
+        Select features once for the whole matrix. `target` is a Series, or the name of a column of
+        df, in which case that column is kept next to the selected features.
+        """
+        target_column: Optional[str] = target if isinstance(target, str) else None
+        if target_column is not None:
+            target = df[target_column]
+            df = df.drop(columns=[target_column])
+        df = df.select_dtypes(include='number')
+        logging.info(f"Running feature selection on {len(df.columns)} features.")
 
-                for future in as_completed(futures):
-                    result = future.result()
-                    selected_features_df = pd.concat([selected_features_df, result], axis=1)
-                    bar()
+        selected_features_df = self.select_features(df, target)
+        if target_column is not None:
+            selected_features_df = pd.concat([selected_features_df, target], axis=1)
 
         logging.info("Feature selection completed.")
-        print("Feature selection completed.")
-        return selected_features_df
\ No newline at end of file
+        return selected_features_df
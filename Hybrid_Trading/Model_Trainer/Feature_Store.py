@@ -0,0 +1,129 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Callable, Optional, Dict
+from datetime import datetime
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+
+# Bookkeeping columns stored next to the features
+RAW_HASH = '_raw_hash'
+MATERIALIZED_AT = '_materialized_at'
+
+
+class FeatureStore:
+    """
+    Offline/online store of engineered features, one Parquet table per (feature-set version, ticker).
+
+    materialize() compares the raw rows with what is stored (by date and a hash of each raw row) and
+    runs the feature function only on dates that are new or whose raw data changed; invalidate()
+    forces dates to be recomputed. training_frame() serves point-in-time slices by date, and
+    latest_vector() serves the newest row for online inference.
+    """
+
+    def __init__(self, feature_set_version: str = None, store_dir: str = None, date_col: str = 'historical_date'):
+        self.logger = LoggingMaster("FeatureStore").get_logger()
+        self.constants = TCS()
+        self.feature_set_version = feature_set_version or self.constants.FEATURE_SET_VERSION
+        self.store_dir = os.path.join(store_dir or self.constants.FEATURE_STORE_DIR, f"v{self.feature_set_version}")
+        self.date_col = date_col
+        self._latest: Dict[str, pd.Series] = {}
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.store_dir, f"{str(ticker).replace(os.sep, '_')}.parquet")
+
+    def load(self, ticker: str) -> pd.DataFrame:
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        return pd.read_parquet(path)
+
+    def _write(self, ticker: str, table: pd.DataFrame):
+        # Write to a temporary file and swap it in so readers never see a partial table
+        os.makedirs(self.store_dir, exist_ok=True)
+        path = self._path(ticker)
+        table.to_parquet(f"{path}.tmp", index=False)
+        os.replace(f"{path}.tmp", path)
+        self._latest.pop(ticker, None)
+
+    def materialize(self, ticker: str, raw: pd.DataFrame, compute_fn: Callable[[pd.DataFrame], pd.DataFrame],
+                    lookback: int = 0) -> pd.DataFrame:
+        """
+        Bring the stored features up to date with `raw` and return the features for raw's dates.
+
+        compute_fn maps raw rows to feature rows (keeping the date column). It is called once, on the
+        new or changed rows plus `lookback` earlier rows for features that need history. Rows are keyed
+        by date: rows without one are dropped and only the last row of a repeated date is kept.
+        """
+        raw = raw.dropna(subset=[self.date_col]).copy()
+        raw[self.date_col] = pd.to_datetime(raw[self.date_col])
+        raw = raw.sort_values(self.date_col, kind='stable').drop_duplicates(self.date_col, keep='last').reset_index(drop=True)
+        current = pd.DataFrame({self.date_col: raw[self.date_col], RAW_HASH: pd.util.hash_pandas_object(raw, index=False).to_numpy()})
+
+        # A row is stale unless the same date with the same raw hash is already stored
+        stored = self.load(ticker)
+        if stored.empty:
+            stale = np.ones(len(raw), dtype=bool)
+        else:
+            matched = current.merge(stored[[self.date_col, RAW_HASH]], on=[self.date_col, RAW_HASH], how='left', indicator=True)
+            stale = (matched['_merge'] != 'both').to_numpy()
+
+        if stale.any():
+            first_stale = int(np.argmax(stale))
+            context = raw.iloc[max(first_stale - lookback, 0):]
+            computed = compute_fn(context.copy())
+            computed[self.date_col] = pd.to_datetime(computed[self.date_col])
+
+            stale_dates = raw[self.date_col][stale]
+            computed = computed[computed[self.date_col].isin(stale_dates)].drop(columns=[RAW_HASH], errors='ignore')
+            computed = computed.merge(current, on=self.date_col, how='left')
+            computed[MATERIALIZED_AT] = pd.Timestamp(datetime.now())
+
+            kept = stored[~stored[self.date_col].isin(stale_dates)] if not stored.empty else stored
+            stored = pd.concat([kept, computed], ignore_index=True).sort_values(self.date_col, kind='stable').reset_index(drop=True)
+            self._write(ticker, stored)
+            self.logger.info(f"Materialized {int(stale.sum())} of {len(raw)} feature rows for {ticker} (v{self.feature_set_version})")
+        else:
+            self.logger.info(f"Features for {ticker} are up to date (v{self.feature_set_version})")
+
+        features = stored[stored[self.date_col].isin(raw[self.date_col])]
+        return features.drop(columns=[RAW_HASH, MATERIALIZED_AT]).reset_index(drop=True)
+
+    def invalidate(self, ticker: str, since: Optional[str] = None):
+        """
+        Drop stored rows (all, or those dated on/after `since`) so the next materialize recomputes them.
+        """
+        stored = self.load(ticker)
+        if stored.empty:
+            return
+        if since is None:
+            os.remove(self._path(ticker))
+            self._latest.pop(ticker, None)
+            return
+        self._write(ticker, stored[stored[self.date_col] < pd.Timestamp(since)])
+
+    def training_frame(self, ticker: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
+        """
+        Training slice for [start_date, end_date]. Stored features are unscaled, so scalers fitted on
+        the slice see nothing from after end_date.
+        """
+        stored = self.load(ticker)
+        if stored.empty:
+            return stored
+        keep = np.ones(len(stored), dtype=bool)
+        if start_date is not None:
+            keep &= stored[self.date_col] >= pd.Timestamp(start_date)
+        if end_date is not None:
+            keep &= stored[self.date_col] <= pd.Timestamp(end_date)
+        return stored[keep].drop(columns=[RAW_HASH, MATERIALIZED_AT]).reset_index(drop=True)
+
+    def latest_vector(self, ticker: str) -> Optional[pd.Series]:
+        """
+        Newest feature row of a ticker for online inference, kept in memory until the table changes.
+        """
+        if ticker not in self._latest:
+            stored = self.load(ticker)
+            if stored.empty:
+                return None
+            self._latest[ticker] = stored.iloc[-1].drop([RAW_HASH, MATERIALIZED_AT])
+        return self._latest[ticker]
@@ -5,6 +5,7 @@ from skopt.space import Real, Categorical, Integer
 import pandas as pd
 from pmdarima import auto_arima  # For Auto ARIMA
 from typing import Dict, Any
+from Hybrid_Trading.Model_Trainer.Trial_Scheduler import PrunedSearch, TrialHistory
 
 
 class HyperOptimization:
@@ -104,6 +105,27 @@ class HyperOptimization:
         logging.info(f"Best Time Series CV Parameters: \n{best_params_df}")
         return grid_search.best_estimator_, grid_search.best_params_
 
+    def pruned_search_optimization(self, X, y, ticker: str = None):
+        logging.info("Starting pruned parallel search...")
+        history = TrialHistory(ticker, type(self.model).__name__) if ticker else None
+        search = PrunedSearch(
+            estimator=self.model,
+            search_space=self.search_space,
+            n_trials=self.n_iter,
+            n_splits=self.time_series_cv_params.get('n_splits', self.cv_folds),
+            max_train_size=self.time_series_cv_params.get('max_train_size', None),
+            scoring=self.scoring,
+            pruner=self.user_input.get('pruner', 'median'),
+            max_workers=self.user_input.get('max_workers'),
+            random_state=self.settings.get('random_seed', 42),
+            history=history
+        )
+        best_estimator, best_params = search.run(X, y)
+        logging.info("Pruned parallel search complete.")
+        best_params_df = pd.DataFrame([best_params], index=['Best Params'])
+        logging.info(f"Best Pruned Search Parameters: \n{best_params_df}")
+        return best_estimator, best_params
+
     def auto_arima_optimization(self, X, y):
         logging.info("Starting Auto ARIMA Optimization...")
         arima_model = auto_arima(
@@ -122,7 +144,7 @@ class HyperOptimization:
         logging.info("Auto ARIMA Optimization complete.")
         return arima_model
 
-    def run_hyper_op(self, X, y):
+    def run_hyper_op(self, X, y, ticker: str = None):
         logging.info(f"Running optimization method: {self.optimization_method}")
         
         if self.optimization_method == 'bayesian':
@@ -133,6 +155,8 @@ class HyperOptimization:
             return self.grid_search_optimization(X, y)
         elif self.optimization_method == 'time_series_cv':
             return self.time_series_cross_validation_optimization(X, y)
+        elif self.optimization_method == 'pruned_search':
+            return self.pruned_search_optimization(X, y, ticker)
         elif self.optimization_method == 'auto_arima':
             return self.auto_arima_optimization(X, y)
         else:
@@ -1,5 +1,9 @@
 import logging
 import os
+import re
+import json
+import hashlib
+import threading
 import pandas as pd
 import requests
 import asyncio
@@ -7,16 +11,90 @@ import aiohttp
 import random
 import time
 from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
+from Config.trading_constants import TCS
 from Hybrid_Trading.Inputs.user_input import UserInput
-from functools import lru_cache
+
+# FMP endpoints of the training data: name -> (URL template, column prefix, how it joins the daily price rows)
+# 'spine': the daily price rows themselves; 'asof': latest report on or before each date;
+# 'daily_last': last intraday bar of each date; 'broadcast': a single record repeated on every row
+ENDPOINTS = {
+    'historical_data': ("https://financialmodelingprep.com/api/v3/historical-price-full/{ticker}?from={start_date}&to={end_date}&apikey={api_key}", 'historical_', 'spine'),
+    'financial_ratios': ("https://financialmodelingprep.com/api/v3/ratios/{ticker}?apikey={api_key}", 'ratios_', 'asof'),
+    'key_metrics': ("https://financialmodelingprep.com/api/v3/key-metrics/{ticker}?apikey={api_key}", 'metrics_', 'asof'),
+    'upgrades_downgrades': ("https://financialmodelingprep.com/api/v4/upgrades-downgrades-consensus?symbol={ticker}&apikey={api_key}", 'upgrades_downgrades_', 'broadcast'),
+    'historical_interday': ("https://financialmodelingprep.com/api/v3/historical-chart/1min/{ticker}?apikey={api_key}", 'interday_', 'daily_last'),
+}
+
+# Endpoints without which a ticker's training data cannot be built
+REQUIRED_ENDPOINTS = ('historical_data',)
+
+
+def api_error(payload: Any) -> Optional[str]:
+    """
+    The error message of an FMP error payload, or None. FMP reports invalid keys, exhausted limits and
+    unknown symbols as a JSON object with an "Error Message" field and HTTP 200.
+    """
+    if isinstance(payload, dict):
+        return payload.get('Error Message') or payload.get('error')
+    return None
+
+
+class DiskResponseCache:
+    """
+    Persistent cache of JSON API responses, one file per (endpoint, URL) under MTDG_CACHE_DIR.
+    Entries expire after the endpoint's TTL; the API key is not part of the cache key. FMP error
+    payloads are never stored, and are treated as misses if an older file holds one.
+    """
+
+    def __init__(self, cache_dir: str = None, ttls: Dict[str, int] = None):
+        constants = TCS()
+        self.cache_dir = cache_dir or constants.MTDG_CACHE_DIR
+        self.ttls = ttls or constants.MTDG_CACHE_TTLS
+
+    def _path(self, endpoint: str, url: str) -> str:
+        key = hashlib.sha256(re.sub(r'apikey=[^&]*', '', url).encode()).hexdigest()[:32]
+        return os.path.join(self.cache_dir, endpoint, f"{key}.json")
+
+    def get(self, endpoint: str, url: str) -> Optional[Any]:
+        path = self._path(endpoint, url)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttls.get(endpoint, 0):
+                return None
+            with open(path) as cache_file:
+                payload = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        return None if api_error(payload) else payload
+
+    def put(self, endpoint: str, url: str, payload: Any):
+        if api_error(payload):
+            return
+        path = self._path(endpoint, url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique temporary name: several workers may write the same entry at once
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w') as cache_file:
+            json.dump(payload, cache_file)
+        os.replace(temp_path, path)
+
 
 class MTDataFetcher:
-    def __init__(self, user_input: UserInput):
+    def __init__(self, user_input: UserInput = None, tickers: List[str] = None, start_date: str = None,
+                 end_date: str = None, cache_dir: str = None):
         load_dotenv()
+        self.constants = TCS()
         self.fmp_api_key = os.getenv("FMP_API_KEY")
         self.user_input = user_input
-        
+        self.args = user_input.args if user_input is not None else {}
+        if start_date is not None:
+            self.args['start_date'] = start_date
+        if end_date is not None:
+            self.args['end_date'] = end_date
+        self.tickers = tickers or []
+        self.cache = DiskResponseCache(cache_dir)
+
     def standardize_columns(self, df):
         """Standardize column names to ensure consistency."""
         df.columns = df.columns.str.lower().str.replace(' ', '_').str.strip()
@@ -24,14 +102,14 @@ class MTDataFetcher:
 
     def calculate_date_range(self):
         """Calculate the start and end dates based on user input for interval and duration."""
-        interval = self.user_input.args.get('interval', '1d')
-        duration = self.user_input.args.get('duration', '1y')
-        period = self.user_input.args.get('period', 'day')
-        
+        interval = self.args.get('interval', '1d')
+        duration = self.args.get('duration', '1y')
+        period = self.args.get('period', 'day')
+
         end_date = datetime.now()
         start_date = self._get_start_date_based_on_duration(duration, end_date)
-        self.user_input.args['start_date'] = start_date.strftime('%Y-%m-%d') if isinstance(start_date, datetime) else start_date
-        self.user_input.args['end_date'] = end_date.strftime('%Y-%m-%d')
+        self.args['start_date'] = start_date.strftime('%Y-%m-%d') if isinstance(start_date, datetime) else start_date
+        self.args['end_date'] = end_date.strftime('%Y-%m-%d')
         return start_date, end_date
 
     def _get_start_date_based_on_duration(self, duration, end_date):
@@ -54,19 +132,40 @@ class MTDataFetcher:
         else:
             raise ValueError("Invalid duration.")
 
-    @lru_cache(maxsize=100)
-    def fetch_data_from_cache(self, url):
-        """Simple in-memory cache for API requests to avoid repeated calls."""
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
+    def endpoint_urls(self, ticker: str) -> Dict[str, str]:
+        """URLs of every endpoint for a ticker."""
+        if 'start_date' not in self.args or 'end_date' not in self.args:
+            self.calculate_date_range()
+        return {name: template.format(ticker=ticker, start_date=self.args['start_date'], end_date=self.args['end_date'],
+                                      api_key=self.fmp_api_key)
+                for name, (template, _, _) in ENDPOINTS.items()}
 
-    async def async_fetch(self, session, url, delay=0):
-        """Asynchronous fetch with optional jitter delay."""
-        await asyncio.sleep(delay)  # Apply jitter
-        async with session.get(url) as response:
+    def fetch_data_from_cache(self, url, endpoint: str = 'default'):
+        """Blocking fetch through the persistent disk cache."""
+        payload = self.cache.get(endpoint, url)
+        if payload is None:
+            response = requests.get(url)
             response.raise_for_status()
-            return await response.json()
+            payload = response.json()
+            if api_error(payload):
+                raise ValueError(f"FMP error for {endpoint}: {api_error(payload)}")
+            self.cache.put(endpoint, url, payload)
+        return payload
+
+    async def async_fetch(self, session, url, delay=0, endpoint: str = 'default', semaphore: asyncio.Semaphore = None):
+        """Asynchronous fetch through the disk cache, with optional jitter delay on cache misses."""
+        payload = self.cache.get(endpoint, url)
+        if payload is not None:
+            return payload
+        await asyncio.sleep(delay)  # Apply jitter
+        async with semaphore or asyncio.Semaphore(1):
+            async with session.get(url) as response:
+                response.raise_for_status()
+                payload = await response.json()
+        if api_error(payload):
+            raise ValueError(f"FMP error for {endpoint}: {api_error(payload)}")
+        self.cache.put(endpoint, url, payload)
+        return payload
 
     def apply_jitter(self):
         """Random delay to avoid rate limits."""
@@ -74,53 +173,112 @@ class MTDataFetcher:
 
     async def fetch_all_async(self, ticker, urls):
         """Fetch all data asynchronously for a ticker."""
+        return (await self.fetch_batch_async([ticker], {ticker: urls}))[ticker]
+
+    async def fetch_batch_async(self, tickers: List[str], urls: Dict[str, Dict[str, str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch every endpoint of every ticker concurrently (at most MTDG_MAX_CONCURRENCY requests in flight).
+        Returns {ticker: {endpoint: payload}}; failed requests (including FMP error payloads) are logged
+        and left out, so callers can check for the endpoints they require.
+        """
+        urls = urls or {ticker: self.endpoint_urls(ticker) for ticker in tickers}
+        semaphore = asyncio.Semaphore(self.constants.MTDG_MAX_CONCURRENCY)
+        requests_to_run = [(ticker, name, url) for ticker in tickers for name, url in urls[ticker].items()]
         async with aiohttp.ClientSession() as session:
-            tasks = []
-            for name, url in urls.items():
-                delay = self.apply_jitter()  # Apply jitter to each request
-                tasks.append(self.async_fetch(session, url, delay))
-            results = await asyncio.gather(*tasks)
-            return dict(zip(urls.keys(), results))
+            responses = await asyncio.gather(
+                *(self.async_fetch(session, url, self.apply_jitter(), endpoint=name, semaphore=semaphore)
+                  for ticker, name, url in requests_to_run),
+                return_exceptions=True
+            )
+
+        results = {ticker: {} for ticker in tickers}
+        for (ticker, name, _), response in zip(requests_to_run, responses):
+            if isinstance(response, Exception):
+                logging.error(f"Fetching {name} for {ticker} failed: {response}")
+            else:
+                results[ticker][name] = response
+        return results
+
+    def fetch_batch(self, tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Blocking wrapper around fetch_batch_async, usable whether or not an event loop is running."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.fetch_batch_async(tickers))
+        # Called from inside an event loop: run the batch on a loop of its own thread
+        results = {}
+        worker = threading.Thread(target=lambda: results.update(asyncio.run(self.fetch_batch_async(tickers))))
+        worker.start()
+        worker.join()
+        return results
+
+    def prefetch(self, tickers: List[str] = None):
+        """Warm the disk cache for a batch of tickers with concurrent requests."""
+        tickers = tickers or self.tickers
+        started = time.monotonic()
+        results = self.fetch_batch(tickers)
+        fetched = sum(len(payloads) for payloads in results.values())
+        logging.info(f"Prefetched {fetched} responses for {len(tickers)} tickers in {time.monotonic() - started:.1f}s")
 
     def validate_data(self, data: pd.DataFrame):
         """Basic validation to ensure data is not empty and columns are standardized."""
         if data.empty:
             logging.error("Data validation failed: DataFrame is empty.")
             raise ValueError("Data validation failed: DataFrame is empty.")
-        
+
         # Standardize column names
         data = self.standardize_columns(data)
         logging.info("Data validation passed.")
         return data
 
+    def combine_sources(self, results: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Join the endpoint payloads of one ticker onto its daily price rows, oldest first, as declared in ENDPOINTS.
+        """
+        spine_prefix = ENDPOINTS['historical_data'][1]
+        payload = results.get('historical_data')
+        combined = pd.DataFrame(payload.get('historical', []) if isinstance(payload, dict) else [])
+        if combined.empty:
+            return combined
+        combined['date'] = pd.to_datetime(combined['date'])
+        combined = combined.sort_values('date', kind='stable').reset_index(drop=True).add_prefix(spine_prefix)
+        date_col = f"{spine_prefix}date"
+
+        for name, (_, prefix, join) in ENDPOINTS.items():
+            if join == 'spine' or not results.get(name):
+                continue
+            source = pd.DataFrame(results[name] if isinstance(results[name], list) else [results[name]])
+            if join == 'broadcast':
+                combined = combined.assign(**source.iloc[-1].add_prefix(prefix).to_dict())
+                continue
+            if 'date' not in source.columns:
+                logging.warning(f"{name} payload has no date column; left out")
+                continue
+            source['date'] = pd.to_datetime(source['date'])
+            source = source.dropna(subset=['date']).sort_values('date', kind='stable')
+            if join == 'asof':
+                source = source.add_prefix(prefix)
+                combined = pd.merge_asof(combined, source, left_on=date_col, right_on=f"{prefix}date", direction='backward')
+            elif join == 'daily_last':
+                source = source.groupby(source['date'].dt.normalize().rename('day')).last().reset_index().add_prefix(prefix)
+                combined = combined.merge(source, how='left', left_on=date_col, right_on=f"{prefix}day").drop(columns=f"{prefix}day")
+        return combined
+
     def fetch_and_preprocess_data_all_sources(self, ticker: str) -> pd.DataFrame:
-        """Fetch data from all sources for a ticker."""
-        if 'start_date' not in self.user_input.args or 'end_date' not in self.user_input.args:
-            self.calculate_date_range()
+        """
+        Fetch data from all sources for a ticker (from the disk cache when it is fresh) and join them on
+        the price dates. Raises ValueError when a required endpoint could not be fetched.
+        """
+        results = self.fetch_batch([ticker])[ticker]
+
+        missing = [name for name in ENDPOINTS if name not in results]
+        missing_required = [name for name in missing if name in REQUIRED_ENDPOINTS]
+        if missing_required:
+            raise ValueError(f"Required endpoints failed for {ticker}: {', '.join(missing_required)}")
+        if missing:
+            logging.warning(f"Optional endpoints failed for {ticker}, their columns are missing: {', '.join(missing)}")
 
-        urls = {
-            'historical_data': f"https://financialmodelingprep.com/api/v3/historical-price-full/{ticker}?from={self.user_input.args['start_date']}&to={self.user_input.args['end_date']}&apikey={self.fmp_api_key}",
-            'financial_ratios': f"https://financialmodelingprep.com/api/v3/ratios/{ticker}?apikey={self.fmp_api_key}",
-            'key_metrics': f"https://financialmodelingprep.com/api/v3/key-metrics/{ticker}?apikey={self.fmp_api_key}",
-            'upgrades_downgrades': f"https://financialmodelingprep.com/api/v4/upgrades-downgrades-consensus?symbol={ticker}&apikey={self.fmp_api_key}",
-            'historical_interday': f"https://financialmodelingprep.com/api/v3/historical-chart/1min/{ticker}?apikey={self.fmp_api_key}"
-        }
-
-        # Asynchronously fetch all data
-        loop = asyncio.get_event_loop()
-        results = loop.run_until_complete(self.fetch_all_async(ticker, urls))
-
-        # Process and merge the data
-        data_sources = {
-            'historical_data': pd.DataFrame(results['historical_data']['historical']).add_prefix('historical_'),
-            'financial_ratios': pd.DataFrame(results['financial_ratios']).add_prefix('ratios_'),
-            'key_metrics': pd.DataFrame(results['key_metrics']).add_prefix('metrics_'),
-            'upgrades_downgrades': pd.DataFrame(results['upgrades_downgrades']).add_prefix('upgrades_downgrades_'),
-            'historical_interday': pd.DataFrame(results['historical_interday']).add_prefix('interday_')
-        }
-
-        # Combine all data on 'ticker' and 'date'
-        combined_data = pd.concat(data_sources.values(), axis=1, join='outer')
+        combined_data = self.combine_sources(results)
 
         # Basic validation to ensure combined data is not empty
         if combined_data.empty:
@@ -128,4 +286,7 @@ class MTDataFetcher:
             return pd.DataFrame()
 
         logging.info(f"Combined data for {ticker}:\n{combined_data.head()}")
-        return combined_data
\ No newline at end of file
+        return combined_data
+
+    # Name used by PipelineManager
+    fetch_and_process_data_all_sources = fetch_and_preprocess_data_all_sources
@@ -0,0 +1,227 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import importlib
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable
+import joblib
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+
+# Process-wide LRU of deserialized (memory-mapped) models, keyed by artifact version
+_loaded_models: "OrderedDict[str, Any]" = OrderedDict()
+_loaded_lock = threading.Lock()
+
+
+def _class_path(obj) -> str:
+    return f"{type(obj).__module__}:{type(obj).__qualname__}"
+
+
+def _import_class(path: str):
+    module_name, _, qualname = path.partition(':')
+    target = importlib.import_module(module_name)
+    for part in qualname.split('.'):
+        target = getattr(target, part)
+    return target
+
+
+def _artifact_format(model) -> str:
+    """
+    'darts' for darts torch models (their own save/load), 'torch' for plain nn.Modules, 'joblib' otherwise.
+    """
+    module = type(model).__module__
+    if module.startswith('darts') and hasattr(model, 'save') and hasattr(type(model), 'load'):
+        return 'darts'
+    try:
+        import torch
+        if isinstance(model, torch.nn.Module):
+            return 'torch'
+    except ImportError:
+        pass
+    return 'joblib'
+
+
+def data_hash(*frames: Any) -> str:
+    """
+    Hash the training data (DataFrames, Series or arrays) a model was fitted on.
+    """
+    digest = hashlib.sha256()
+    for frame in frames:
+        if isinstance(frame, (pd.DataFrame, pd.Series)):
+            digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+            if isinstance(frame, pd.DataFrame):
+                digest.update(','.join(map(str, frame.columns)).encode())
+        elif frame is not None:
+            digest.update(np.ascontiguousarray(frame).tobytes())
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Local registry of trained Model_Trainer models.
+
+    Artifacts are stored once under the hash of their content (uncompressed joblib for sklearn and
+    xgboost so numpy arrays can be memory-mapped on load, torch state dicts for nn.Modules, darts'
+    own format for darts RNN models). Each ticker keeps the lineage of its registered versions
+    (params, training-data hash, metrics, parent version) and a production pointer set by promote().
+    Loaded models are kept in a process-wide LRU of MODEL_REGISTRY_CACHE_SIZE entries.
+    """
+
+    def __init__(self, registry_dir: str = None, cache_size: int = None):
+        self.logger = LoggingMaster("ModelRegistry").get_logger()
+        self.constants = TCS()
+        self.registry_dir = registry_dir or self.constants.MODEL_REGISTRY_DIR
+        self.cache_size = cache_size or self.constants.MODEL_REGISTRY_CACHE_SIZE
+
+    def _artifact_dir(self, version: str) -> str:
+        return os.path.join(self.registry_dir, 'artifacts', version)
+
+    def _ticker_dir(self, ticker: str) -> str:
+        return os.path.join(self.registry_dir, 'tickers', str(ticker).replace(os.sep, '_'))
+
+    @staticmethod
+    def _read_json(path: str, default=None):
+        if not os.path.exists(path):
+            return default
+        with open(path) as json_file:
+            return json.load(json_file)
+
+    @staticmethod
+    def _write_json(path: str, payload):
+        # Swap the file in so readers never see a partial write
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", 'w') as json_file:
+            json.dump(payload, json_file, default=str)
+        os.replace(f"{path}.tmp", path)
+
+    def _serialize(self, model, target_dir: str) -> Dict[str, Any]:
+        artifact_format = _artifact_format(model)
+        if artifact_format == 'darts':
+            model.save(os.path.join(target_dir, 'model.pt'))
+            return {'format': 'darts', 'file': 'model.pt'}
+        if artifact_format == 'torch':
+            import torch
+            torch.save(model.state_dict(), os.path.join(target_dir, 'state_dict.pt'))
+            return {'format': 'torch', 'file': 'state_dict.pt'}
+        # No compression: compressed joblib files cannot be memory-mapped
+        joblib.dump(model, os.path.join(target_dir, 'model.joblib'), compress=0)
+        return {'format': 'joblib', 'file': 'model.joblib'}
+
+    @staticmethod
+    def _content_hash(directory: str) -> str:
+        digest = hashlib.sha256()
+        for name in sorted(os.listdir(directory)):
+            digest.update(name.encode())
+            with open(os.path.join(directory, name), 'rb') as artifact_file:
+                for chunk in iter(lambda: artifact_file.read(1 << 20), b''):
+                    digest.update(chunk)
+        return digest.hexdigest()[:16]
+
+    def register(self, ticker: str, model, params: Dict[str, Any] = None, training_data: tuple = (),
+                 metrics: Dict[str, float] = None, model_training_id: int = None) -> str:
+        """
+        Store a trained model and record its lineage for the ticker. Returns the artifact version.
+        """
+        os.makedirs(os.path.join(self.registry_dir, 'artifacts'), exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix='.staging-', dir=os.path.join(self.registry_dir, 'artifacts'))
+        try:
+            manifest = self._serialize(model, staging_dir)
+            version = self._content_hash(staging_dir)
+            manifest.update(model_class=_class_path(model), params=params or {})
+            self._write_json(os.path.join(staging_dir, 'manifest.json'), manifest)
+            try:
+                os.rename(staging_dir, self._artifact_dir(version))
+            except OSError:
+                # Identical content is already stored
+                shutil.rmtree(staging_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+
+        versions_path = os.path.join(self._ticker_dir(ticker), 'versions.json')
+        versions = self._read_json(versions_path, [])
+        versions.append({
+            'version': version,
+            'model_class': _class_path(model),
+            'params': params or {},
+            'data_hash': data_hash(*training_data) if training_data else None,
+            'metrics': {name: (float(value) if value is not None else None) for name, value in (metrics or {}).items()},
+            'parent_version': self.production_version(ticker),
+            'model_training_id': model_training_id,
+            'registered_at': datetime.now().isoformat(),
+        })
+        self._write_json(versions_path, versions)
+        self.logger.info(f"Registered {type(model).__name__} for {ticker} as version {version}")
+        return version
+
+    def versions(self, ticker: str) -> List[Dict[str, Any]]:
+        return self._read_json(os.path.join(self._ticker_dir(ticker), 'versions.json'), [])
+
+    def promote(self, ticker: str, version: str):
+        """
+        Point the ticker's production model at a registered version.
+        """
+        if version not in {entry['version'] for entry in self.versions(ticker)}:
+            raise ValueError(f"Version {version} is not registered for {ticker}")
+        self._write_json(os.path.join(self._ticker_dir(ticker), 'production.json'), {
+            'version': version,
+            'previous': self.production_version(ticker),
+            'promoted_at': datetime.now().isoformat(),
+        })
+        self.logger.info(f"Promoted version {version} to production for {ticker}")
+
+    def production_version(self, ticker: str) -> Optional[str]:
+        pointer = self._read_json(os.path.join(self._ticker_dir(ticker), 'production.json'))
+        return pointer['version'] if pointer else None
+
+    def load(self, version: str, model_factory: Callable = None, mmap: bool = True):
+        """
+        Load an artifact, from the process-wide LRU when possible.
+
+        Plain torch modules are rebuilt with model_factory() (or their class called with the
+        registered params) before the state dict is loaded. Memory-mapped joblib arrays are
+        read-only; pass mmap=False for a model that will be updated in place, which returns a
+        private copy that bypasses (and is not added to) the shared LRU.
+        """
+        with _loaded_lock:
+            if mmap and version in _loaded_models:
+                _loaded_models.move_to_end(version)
+                return _loaded_models[version]
+
+        artifact_dir = self._artifact_dir(version)
+        manifest = self._read_json(os.path.join(artifact_dir, 'manifest.json'))
+        if manifest is None:
+            raise FileNotFoundError(f"No artifact stored for version {version}")
+        path = os.path.join(artifact_dir, manifest['file'])
+
+        if manifest['format'] == 'darts':
+            model = _import_class(manifest['model_class']).load(path)
+        elif manifest['format'] == 'torch':
+            import torch
+            model = model_factory() if model_factory is not None else _import_class(manifest['model_class'])(**manifest['params'])
+            model.load_state_dict(torch.load(path, map_location='cpu'))
+            model.eval()
+        else:
+            model = joblib.load(path, mmap_mode='r' if mmap else None)
+
+        if not mmap:
+            return model
+        with _loaded_lock:
+            _loaded_models[version] = model
+            _loaded_models.move_to_end(version)
+            while len(_loaded_models) > self.cache_size:
+                _loaded_models.popitem(last=False)
+        return model
+
+    def load_production(self, ticker: str, model_factory: Callable = None, mmap: bool = True):
+        """
+        The ticker's production model, or None when nothing has been promoted.
+        """
+        version = self.production_version(ticker)
+        return self.load(version, model_factory=model_factory, mmap=mmap) if version else None
@@ -0,0 +1,246 @@
+import math
+import time
+import threading
+import numpy as np
+import pandas as pd
+from collections import deque
+from typing import Dict, Any
+from sklearn.linear_model import SGDRegressor, PassiveAggressiveRegressor
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+
+
+class RunningStats:
+    """
+    Streaming mean and variance per column (Welford), updated one batch at a time.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+        self.m2 = None
+
+    def update(self, values: np.ndarray):
+        values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        if self.mean is None:
+            self.mean = np.zeros(values.shape[1])
+            self.m2 = np.zeros(values.shape[1])
+        batch_count = len(values)
+        batch_mean = values.mean(axis=0)
+        delta = batch_mean - self.mean
+        total = self.count + batch_count
+        self.mean = self.mean + delta * batch_count / total
+        self.m2 = self.m2 + ((values - batch_mean) ** 2).sum(axis=0) + delta ** 2 * self.count * batch_count / total
+        self.count = total
+
+    @property
+    def std(self) -> np.ndarray:
+        if self.count < 2:
+            return np.ones_like(self.mean)
+        std = np.sqrt(self.m2 / (self.count - 1))
+        return np.where(std > 0, std, 1.0)
+
+    def transform(self, values: np.ndarray) -> np.ndarray:
+        return (np.asarray(values, dtype=np.float64) - self.mean) / self.std
+
+
+class ADWIN:
+    """
+    Adaptive windowing drift detector over a bounded window.
+
+    Every `clock` values, each split of the window into an older and a newer part is tested at once
+    (cumulative sums); when the two means differ by more than the Hoeffding/Bernstein bound for
+    confidence `delta`, the older part is dropped and drift is reported.
+    """
+
+    def __init__(self, delta: float = 0.002, max_window: int = 2000, clock: int = 16, min_side: int = 10):
+        self.delta = delta
+        self.window = deque(maxlen=max_window)
+        self.clock = clock
+        self.min_side = min_side
+        self._seen = 0
+
+    def update(self, value: float) -> bool:
+        self.window.append(float(value))
+        self._seen += 1
+        if self._seen % self.clock or len(self.window) < 2 * self.min_side:
+            return False
+
+        values = np.fromiter(self.window, dtype=np.float64)
+        n = len(values)
+        cumulative = np.cumsum(values)
+        splits = np.arange(self.min_side, n - self.min_side + 1)
+        n0, n1 = splits, n - splits
+        mean0 = cumulative[splits - 1] / n0
+        mean1 = (cumulative[-1] - cumulative[splits - 1]) / n1
+        harmonic = 1.0 / (1.0 / n0 + 1.0 / n1)
+        log_term = math.log(2.0 * math.log(n) / self.delta)
+        variance = values.var()
+        bound = np.sqrt(2.0 / harmonic * variance * log_term) + 2.0 / (3.0 * harmonic) * log_term
+
+        cut = np.flatnonzero(np.abs(mean0 - mean1) > bound)
+        if not len(cut):
+            return False
+        for _ in range(int(splits[cut[-1]])):
+            self.window.popleft()
+        return True
+
+
+class PageHinkley:
+    """
+    Page-Hinkley test for an upward shift in the mean of a stream (e.g. rising errors).
+    """
+
+    def __init__(self, delta: float = 0.005, threshold: float = 25.0, alpha: float = 0.9999, min_instances: int = 30):
+        self.delta = delta
+        self.threshold = threshold
+        self.alpha = alpha
+        self.min_instances = min_instances
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = 0.0
+        self.cumulative = 0.0
+        self.minimum = 0.0
+
+    def update(self, value: float) -> bool:
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+        self.cumulative = self.alpha * self.cumulative + (value - self.mean - self.delta)
+        self.minimum = min(self.minimum, self.cumulative)
+        if self.count >= self.min_instances and self.cumulative - self.minimum > self.threshold:
+            self.reset()
+            return True
+        return False
+
+
+class OnlineLearner:
+    """
+    Incremental regressor of one ticker with drift detection.
+
+    New labelled rows are first scored (prequential error), then standardized with running feature
+    statistics and learned with partial_fit. The absolute errors of the monitored predictions,
+    scaled by the running target deviation, feed ADWIN and Page-Hinkley; a full retrain is only
+    scheduled when both detectors fire within ONLINE_DRIFT_CONFIRM_WINDOW rows of each other.
+    """
+
+    ESTIMATORS = {
+        'sgd': lambda: SGDRegressor(learning_rate='invscaling', eta0=0.01, random_state=0),
+        'passive_aggressive': lambda: PassiveAggressiveRegressor(random_state=0),
+    }
+
+    def __init__(self, ticker: str, estimator: str = None, confirm_window: int = None):
+        self.constants = TCS()
+        self.ticker = ticker
+        self.estimator_name = estimator or self.constants.ONLINE_LEARNER
+        self.model = self.ESTIMATORS[self.estimator_name]()
+        self.feature_stats = RunningStats()
+        self.target_stats = RunningStats()
+        self.adwin = ADWIN(delta=self.constants.ONLINE_ADWIN_DELTA)
+        self.page_hinkley = PageHinkley(threshold=self.constants.ONLINE_PH_THRESHOLD)
+        self.confirm_window = confirm_window or self.constants.ONLINE_DRIFT_CONFIRM_WINDOW
+        self.rows_seen = 0
+        self.last_alarm = {'adwin': None, 'page_hinkley': None}
+        self.retrain_scheduled = False
+        self.latencies = deque(maxlen=1000)  # (seconds, rows) per ingest
+        self.lock = threading.Lock()
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        if self.feature_stats.mean is None:
+            return np.zeros(len(X))
+        scaled = self.feature_stats.transform(X.to_numpy(dtype=np.float64))
+        return self.model.predict(scaled) * self.target_stats.std[0] + self.target_stats.mean[0]
+
+    def _detect(self, errors: np.ndarray):
+        for error in errors:
+            self.rows_seen += 1
+            if self.adwin.update(error):
+                self.last_alarm['adwin'] = self.rows_seen
+            if self.page_hinkley.update(error):
+                self.last_alarm['page_hinkley'] = self.rows_seen
+            alarms = [row for row in self.last_alarm.values() if row is not None]
+            if len(alarms) == 2 and self.rows_seen - min(alarms) <= self.confirm_window:
+                self.retrain_scheduled = True
+
+    def learn(self, X: pd.DataFrame, y: pd.Series, monitored_predictions: np.ndarray = None) -> Dict[str, Any]:
+        """
+        Ingest newly labelled rows. monitored_predictions are the production model's predictions for
+        the same rows; without them the learner's own prequential predictions are monitored.
+        """
+        started = time.perf_counter()
+        with self.lock:
+            features = X.to_numpy(dtype=np.float64)
+            target = np.asarray(y, dtype=np.float64)
+            predictions = monitored_predictions if monitored_predictions is not None else self.predict(X)
+
+            self.target_stats.update(target[:, None])
+            errors = np.abs(target - np.asarray(predictions, dtype=np.float64)) / self.target_stats.std[0]
+            if self.feature_stats.mean is not None:
+                self._detect(errors)
+
+            self.feature_stats.update(features)
+            scaled_target = (target - self.target_stats.mean[0]) / self.target_stats.std[0]
+            self.model.partial_fit(self.feature_stats.transform(features), scaled_target)
+            elapsed = time.perf_counter() - started
+            self.latencies.append((elapsed, len(target)))
+            return {'rows': len(target), 'latency_ms': elapsed * 1000, 'retrain_scheduled': self.retrain_scheduled,
+                    'mean_error': float(errors.mean()) if len(errors) else None}
+
+    def latency_report(self) -> Dict[str, float]:
+        if not self.latencies:
+            return {}
+        seconds = np.array([latency for latency, _ in self.latencies])
+        rows = sum(count for _, count in self.latencies)
+        return {
+            'updates': len(seconds),
+            'p50_ms': float(np.percentile(seconds, 50) * 1000),
+            'p95_ms': float(np.percentile(seconds, 95) * 1000),
+            'max_ms': float(seconds.max() * 1000),
+            'rows_per_second': float(rows / seconds.sum()) if seconds.sum() > 0 else float('inf'),
+        }
+
+
+class OnlineLearningManager:
+    """
+    Process-wide registry of per-ticker OnlineLearners.
+    """
+
+    def __init__(self, estimator: str = None):
+        self.logger = LoggingMaster("OnlineLearningManager").get_logger()
+        self.constants = TCS()
+        self.estimator = estimator or self.constants.ONLINE_LEARNER
+        self.learners: Dict[str, OnlineLearner] = {}
+        self.lock = threading.Lock()
+
+    def learner(self, ticker: str) -> OnlineLearner:
+        with self.lock:
+            if ticker not in self.learners:
+                self.learners[ticker] = OnlineLearner(ticker, estimator=self.estimator)
+            return self.learners[ticker]
+
+    def ingest(self, ticker: str, X: pd.DataFrame, y: pd.Series, monitored_predictions: np.ndarray = None) -> Dict[str, Any]:
+        result = self.learner(ticker).learn(X, y, monitored_predictions)
+        if result['retrain_scheduled']:
+            self.logger.warning(f"Sustained drift for {ticker} (ADWIN and Page-Hinkley); full retrain scheduled")
+        return result
+
+    def pending_retrains(self) -> list:
+        with self.lock:
+            return [ticker for ticker, learner in self.learners.items() if learner.retrain_scheduled]
+
+    def mark_retrained(self, ticker: str):
+        """
+        Clear the scheduled retrain and restart drift detection for the retrained model.
+        """
+        learner = self.learner(ticker)
+        with learner.lock:
+            learner.retrain_scheduled = False
+            learner.last_alarm = {'adwin': None, 'page_hinkley': None}
+            learner.adwin = ADWIN(delta=self.constants.ONLINE_ADWIN_DELTA)
+            learner.page_hinkley.reset()
+
+    def latency_report(self) -> pd.DataFrame:
+        with self.lock:
+            learners = dict(self.learners)
+        return pd.DataFrame({ticker: learner.latency_report() for ticker, learner in learners.items()}).T
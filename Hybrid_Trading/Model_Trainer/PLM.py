@@ -1,15 +1,23 @@
 import logging
 import pandas as pd
+from typing import Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm  # Import tqdm for progress bars
 from Hybrid_Trading.Model_Trainer.MTDG import MTDataFetcher  # Data Fetcher
 from Hybrid_Trading.Model_Trainer.FE import FeatureEngineer  # Feature Engineer
+from Hybrid_Trading.Model_Trainer.Feature_Store import FeatureStore  # Materialized features
+from Config.trading_constants import TCS
 from Hybrid_Trading.Model_Trainer.FS import FeatureSelector  # Feature Selector
 from Hybrid_Trading.Model_Trainer.PMA import PerformanceMonitoringAlerts
+from Hybrid_Trading.Model_Trainer.Online_Learning import OnlineLearningManager  # Drift-triggered retraining
 from Hybrid_Trading.Model_Trainer.Self_Teaching import SelfTeaching # Self-Teaching and Performance Alerts
 from Hybrid_Trading.Model_Trainer.MT import TradingModel  # Trading Model
 from Hybrid_Trading.Model_Trainer.HPO import HyperOptimization # Hyperparameterization
 from Hybrid_Trading.Model_Trainer.MTVIZ import MTVisualization  # MT Visualizer
+from Hybrid_Trading.Model_Trainer.Pipeline_Executor import ProcessPipelineExecutor  # Process backend
+from Hybrid_Trading.Model_Trainer.Model_Registry import ModelRegistry  # Versioned model artifacts
+from Hybrid_Trading.Model_Trainer.Explainability import ExplainabilityService  # Lazy SHAP/LIME
+from Hybrid_Trading.Model_Trainer.Bulk_Writer import BufferedModelWriter  # Batched result rows
 
 class PipelineManager:
     def __init__(self, 
@@ -32,10 +40,19 @@ class PipelineManager:
                  return_format: str, 
                  start_date: str, 
                  end_date: str, 
-                 train_test_split_ratio: float):
+                 train_test_split_ratio: float,
+                 execution_backend: str = None,
+                 shared_inputs: dict = None):
         """
         Initialize the PipelineManager with required parameters.
+
+        execution_backend: 'thread' or 'process' (PIPELINE_EXECUTION_BACKEND by default).
+        shared_inputs: date-indexed numeric frames (macro data, sector data, common features) joined
+        onto every ticker's data; the process backend places them in shared memory.
         """
+        # Constructor arguments, used to rebuild the pipeline inside worker processes
+        self.pipeline_kwargs = {name: value for name, value in locals().items()
+                                if name not in ('self', 'execution_backend', 'shared_inputs')}
         self.model_type = model_type
         self.tickers = tickers
         self.target_column = target_column
@@ -56,6 +73,8 @@ class PipelineManager:
         self.start_date = start_date
         self.end_date = end_date
         self.train_test_split_ratio = train_test_split_ratio
+        self.execution_backend = execution_backend or TCS().PIPELINE_EXECUTION_BACKEND
+        self.shared_inputs = shared_inputs or {}
         
         # Initialize all components
         self.data_fetcher = MTDataFetcher(
@@ -69,8 +88,16 @@ class PipelineManager:
             scaling_preference=self.scaling_preference
         )
         
+        # Weighted features are materialized per (ticker, date, feature-set version) and only new days are computed
+        self.feature_store = FeatureStore(
+            feature_set_version=f"{TCS().FEATURE_SET_VERSION}-{FeatureEngineer.definition_hash()}"
+        )
+
+        # Feature scores are cached per feature-set version and data window
         self.feature_selector = FeatureSelector(
-            method=self.feature_selection_method
+            method=self.feature_selection_method,
+            model_type=self.model_type,
+            feature_set_version=self.feature_store.feature_set_version
         )
         
         self.hyper_optimizer = HyperOptimization(
@@ -84,14 +111,26 @@ class PipelineManager:
             model_type=self.model_type
         )
         
-        self.performance_alerts = PerformanceMonitoringAlerts(
-            mape_threshold=self.mape_threshold,
-            rmse_threshold=self.rmse_threshold,
-            mae_threshold=self.mae_threshold,
-            r2_threshold=self.r2_threshold
-        )
+        # Monitoring thresholds; one PerformanceMonitoringAlerts is built per trained model
+        self.monitoring_thresholds = {
+            'mape_threshold': self.mape_threshold,
+            'rmse_threshold': self.rmse_threshold,
+            'mae_threshold': self.mae_threshold,
+            'r2_threshold': self.r2_threshold
+        }
+
+        # Per-ticker online learners shared by every ticker's monitoring; sustained drift also triggers a full retrain
+        self.online_learning = OnlineLearningManager()
         
-        self.self_teaching =  SelfTeaching()
+        # Prediction, signal and evaluation rows of all tickers share one buffered writer
+        self.result_writer = BufferedModelWriter()
+
+        self.self_teaching =  SelfTeaching(model=None, tickers=self.tickers, writer=self.result_writer)
+
+        self.model_registry = ModelRegistry()
+
+        # Explanations are computed on demand; training only stores their samples
+        self.explainability = ExplainabilityService(registry=self.model_registry)
         
         self.visualizer =  MTVisualization ()
         
@@ -102,8 +141,18 @@ class PipelineManager:
         Returns:
             dict: Results containing evaluation metrics, predictions, and signals for each ticker.
         """
+        # Fetch every endpoint of every ticker concurrently into the disk cache; tickers then read from it
+        self.data_fetcher.prefetch(self.tickers)
+
+        if self.execution_backend == 'process':
+            with tqdm(total=len(self.tickers), desc="Running Pipeline", ncols=100) as pbar:
+                return ProcessPipelineExecutor(max_workers=self.concurrency).run(
+                    PipelineManager, self.pipeline_kwargs, self.tickers,
+                    shared_inputs=self.shared_inputs, on_result=lambda ticker: pbar.update(1)
+                )
+
         results = {}
-        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+        with self.result_writer, ThreadPoolExecutor(max_workers=self.concurrency) as executor:
             futures = {executor.submit(self.process_ticker, ticker): ticker for ticker in self.tickers}
 
             with tqdm(total=len(futures), desc="Running Pipeline", ncols=100) as pbar:
@@ -140,8 +189,18 @@ class PipelineManager:
                 logging.warning(f"No data available after fetching for {ticker}")
                 return None
 
-            # Step 2: Feature Engineering
-            df = self.feature_engineer.run_feature_engineer(df)
+            # Join shared date-indexed inputs (macro, sector, common features)
+            df = self._join_shared_inputs(df)
+
+            # Step 2: Feature Engineering (weighted features come from the feature store)
+            # The store is keyed by date: rows without a historical date are dropped, and only the last
+            # row of a repeated date is kept
+            raw_rows = len(df)
+            df = self.feature_store.materialize(ticker, df, self.feature_engineer.weighted_features)
+            if len(df) < raw_rows:
+                logging.warning(f"Feature store dropped {raw_rows - len(df)} of {raw_rows} rows for {ticker} "
+                                f"without a unique historical date")
+            df = self.feature_engineer.run_feature_engineer(df, apply_weights=False)
             if df.empty:
                 logging.warning(f"No data available after feature engineering for {ticker}")
                 return None
@@ -156,7 +215,7 @@ class PipelineManager:
             X_train, X_val, y_train, y_val = self._split_train_validation(df_selected)
 
             # Step 5: Hyperparameter Optimization
-            optimized_params = self.hyper_optimizer.run_hyper_op(X_train, y_train)
+            optimized_params = self.hyper_optimizer.run_hyper_op(X_train, y_train, ticker=ticker)
 
             # Step 6: Model Training
             model, evaluation_metrics = self.trading_model.run(
@@ -164,30 +223,81 @@ class PipelineManager:
             )
 
             # Step 7: Performance Monitoring and Alerts
-            needs_retraining = self.performance_alerts.run(
-                model, X_val, y_val
+            performance_alerts = PerformanceMonitoringAlerts(
+                model, self.monitoring_thresholds, ticker, online_learning=self.online_learning
             )
+            needs_retraining = performance_alerts.check_for_retraining(X_val, y_val)
 
             # Step 8: Self-Teaching (after Performance Monitoring)
             if needs_retraining:
                 self.self_teaching.run(
                     model, X_train, y_train, X_val, y_val, evaluation_metrics
                 )
+                self.online_learning.mark_retrained(ticker)
 
-            # Step 9: Visualization
-            predictions = model.predict(X_val)
+            # Step 8b: Register the trained model; models that pass monitoring become the production version
+            version = None
+            try:
+                # run_hyper_op returns (best_estimator, best_params); auto_arima returns only the fitted model
+                best_params = optimized_params[1] if isinstance(optimized_params, tuple) else {}
+                version = self.model_registry.register(
+                    ticker, model, params=best_params, training_data=(X_train, y_train), metrics=evaluation_metrics
+                )
+                if not needs_retraining:
+                    self.model_registry.promote(ticker, version)
+                self.explainability.prepare(version, model, X_train, X_val)
+            except Exception as e:
+                logging.warning(f"Could not register the model for {ticker}: {e}")
+
+            # Step 9: Visualization (predictions come from the production version, which may be an
+            # earlier one when this model failed monitoring)
+            predictions, prediction_version = self._production_predictions(ticker, model, version, X_val)
             self.visualizer.visualize_forecast(predictions, y_val)
 
             return {
                 "evaluation_metrics": evaluation_metrics,
                 "predictions": predictions,
-                "signals": None  # Assuming signals are generated within the model
+                "signals": None,  # Assuming signals are generated within the model
+                "model": model,
+                "model_version": version,
+                "prediction_version": prediction_version
             }
 
         except Exception as e:
             logging.error(f"Error in process_ticker for {ticker}: {e}")
             return None
 
+    def _production_predictions(self, ticker: str, model, version: Optional[str], X_val: pd.DataFrame):
+        """
+        Predict with the ticker's production model; fall back to the freshly trained one when nothing
+        is promoted yet or the production model was fitted on different features.
+        """
+        production_version = self.model_registry.production_version(ticker)
+        if production_version is not None and production_version != version:
+            try:
+                production_model = self.model_registry.load_production(ticker)
+                features = getattr(production_model, 'feature_names_in_', None)
+                if features is not None and list(features) == list(X_val.columns):
+                    return production_model.predict(X_val), production_version
+                logging.info(f"Production model {production_version} for {ticker} uses other features; "
+                             f"predicting with the trained model")
+            except Exception as e:
+                logging.warning(f"Could not load production model {production_version} for {ticker}: {e}")
+        return model.predict(X_val), version
+
+    def _join_shared_inputs(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Left-join each shared input on the ticker's date column, prefixing its columns with the input name.
+        """
+        if not self.shared_inputs or 'historical_date' not in df.columns:
+            return df
+        dates = pd.to_datetime(df['historical_date'])
+        joined = [df]
+        for name, frame in self.shared_inputs.items():
+            aligned = frame.reindex(pd.DatetimeIndex(dates)).add_prefix(f"{name}_")
+            joined.append(aligned.set_axis(df.index))
+        return pd.concat(joined, axis=1)
+
     def _split_train_validation(self, df: pd.DataFrame):
         """
         Split the dataset into training and validation sets.
@@ -6,19 +6,23 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, mean_absolu
 # Import necessary Django models
 from Hybrid_Trading.Trading.models import TradeResults  # Import the TradeResults model
 from django.utils import timezone  # For handling time zones
+from Hybrid_Trading.Model_Trainer.Online_Learning import OnlineLearningManager
 
 class PerformanceMonitoringAlerts:
-    def __init__(self, model, user_input, ticker: str):
+    def __init__(self, model, user_input, ticker: str, online_learning: OnlineLearningManager = None):
         """
         Initialize the performance monitoring system.
         
         :param model: The trained model to monitor
         :param user_input: User configurations and thresholds for monitoring
         :param ticker: The ticker symbol associated with the model
+        :param online_learning: Optional online-learning manager; when set, new labelled rows update the
+                                ticker's incremental learner and sustained drift also triggers a full retrain
         """
         self.model = model
         self.user_input = user_input
         self.ticker = ticker
+        self.online_learning = online_learning
         self.metrics_history = []
         self.last_monitor_time = datetime.now() - timedelta(weeks=1)
 
@@ -73,6 +77,22 @@ class PerformanceMonitoringAlerts:
         logging.info("Performance within acceptable thresholds.")
         return False
 
+    def check_for_retraining(self, X_val: pd.DataFrame, y_val: pd.Series) -> bool:
+        """
+        Evaluate the model on newly labelled rows and decide whether it needs a full retrain: when a
+        metric threshold is breached or, with online learning, when its errors drift persistently.
+
+        The drift detectors only see rows passed in here (the validation split of each training run);
+        live labels are not streamed yet and have to be fed through ingest_labelled_rows once available.
+        """
+        metrics, threshold_breach = self.evaluate_model_performance(X_val, y_val)
+
+        drift_scheduled = False
+        if self.online_learning is not None:
+            # The learner needs a first batch before it can score drift, so thresholds still apply
+            drift_scheduled = self.ingest_labelled_rows(X_val, y_val)
+        return threshold_breach or drift_scheduled
+
     def run_performance_monitoring(self, X_val: pd.DataFrame, y_val: pd.Series, X_train: pd.DataFrame, y_train: pd.Series):
         """
         Run the performance monitoring process: evaluate performance and decide on retraining.
@@ -85,7 +105,7 @@ class PerformanceMonitoringAlerts:
         logging.info("Running performance monitoring...")
 
         # Evaluate model performance
-        metrics, needs_retraining = self.evaluate_model_performance(X_val, y_val)
+        needs_retraining = self.check_for_retraining(X_val, y_val)
 
         if needs_retraining:
             logging.info("Initiating model retraining...")
@@ -101,8 +121,21 @@ class PerformanceMonitoringAlerts:
         """
         logging.info("Retraining model...")
         self.model.fit(X_train, y_train)
+        if self.online_learning is not None:
+            self.online_learning.mark_retrained(self.ticker)
         logging.info("Model retraining complete.")
 
+    def ingest_labelled_rows(self, X_new: pd.DataFrame, y_new: pd.Series) -> bool:
+        """
+        Feed newly labelled rows to the ticker's online learner and report whether sustained drift
+        of the monitored model has scheduled a full retrain.
+        """
+        result = self.online_learning.ingest(self.ticker, X_new, y_new, monitored_predictions=self.model.predict(X_new))
+        latency = self.online_learning.learner(self.ticker).latency_report()
+        logging.info(f"Online update for {self.ticker}: {result['rows']} rows in {result['latency_ms']:.2f} ms "
+                     f"(p95 {latency.get('p95_ms', 0):.2f} ms over {latency.get('updates', 0)} updates)")
+        return result['retrain_scheduled']
+
     def learn_from_trade_execution(self):
         """
         Learn from the trade executions and update the model accordingly.
@@ -0,0 +1,135 @@
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, Any, List, Tuple, Callable
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+
+# Thread-count variables read by OpenBLAS / MKL / OpenMP when they are first loaded
+BLAS_THREAD_VARIABLES = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+# Per-process state of a pipeline worker
+_worker_pipeline = None
+_worker_segments: List[shared_memory.SharedMemory] = []
+
+
+def share_frame(frame: pd.DataFrame) -> Tuple[shared_memory.SharedMemory, Dict[str, Any]]:
+    """
+    Copy the numeric columns of a frame into a shared memory block once.
+    Returns the block (owned by the caller, who must unlink it) and a small picklable spec to attach it.
+    """
+    numeric = frame.select_dtypes(include='number')
+    values = np.ascontiguousarray(numeric.to_numpy(dtype=np.float64))
+    segment = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    np.ndarray(values.shape, dtype=values.dtype, buffer=segment.buf)[:] = values
+    spec = {'name': segment.name, 'shape': values.shape, 'dtype': values.dtype.str,
+            'columns': list(numeric.columns), 'index': numeric.index}
+    return segment, spec
+
+
+def attach_frame(spec: Dict[str, Any]) -> Tuple[shared_memory.SharedMemory, pd.DataFrame]:
+    """
+    Read-only DataFrame view over a block created by share_frame, without copying the data.
+    """
+    try:
+        segment = shared_memory.SharedMemory(name=spec['name'], track=False)
+    except TypeError:  # Python < 3.13 has no track argument
+        segment = shared_memory.SharedMemory(name=spec['name'])
+    values = np.ndarray(spec['shape'], dtype=np.dtype(spec['dtype']), buffer=segment.buf)
+    values.flags.writeable = False
+    return segment, pd.DataFrame(values, index=spec['index'], columns=spec['columns'], copy=False)
+
+
+def _init_pipeline_worker(blas_threads: int, pipeline_factory: Callable, pipeline_kwargs: Dict[str, Any],
+                          shared_specs: Dict[str, Dict[str, Any]]):
+    """
+    Initializer of every pipeline process: cap BLAS threads, build one pipeline and attach the shared inputs.
+    """
+    global _worker_pipeline
+    for variable in BLAS_THREAD_VARIABLES:
+        os.environ[variable] = str(blas_threads)
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(blas_threads)  # BLAS libraries NumPy already loaded
+    except ImportError:
+        pass
+
+    shared_inputs = {}
+    for name, spec in shared_specs.items():
+        segment, frame = attach_frame(spec)
+        _worker_segments.append(segment)  # Keep the mapping alive for the life of the process
+        shared_inputs[name] = frame
+    _worker_pipeline = pipeline_factory(**pipeline_kwargs, execution_backend='thread', shared_inputs=shared_inputs)
+
+
+def _process_ticker_worker(ticker: str) -> Dict[str, Any]:
+    """
+    Worker: run one ticker and return only compact results (metrics, float32 predictions, pickled model).
+    """
+    try:
+        result = _worker_pipeline.process_ticker(ticker)
+    finally:
+        _worker_pipeline.result_writer.flush()  # Worker processes write their own buffered rows
+    if result is None:
+        return None
+    model = result.pop('model', None)
+    result['predictions'] = np.asarray(result['predictions'], dtype=np.float32)
+    result['model_artifact'] = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL) if model is not None else None
+    return result
+
+
+class ProcessPipelineExecutor:
+    """
+    Process-based backend for PipelineManager.
+
+    Feature engineering, sklearn fitting, SHAP and LIME hold the GIL, so tickers run in separate
+    processes. Shared inputs (macro data, sector data, a common feature matrix) are copied once into
+    multiprocessing.shared_memory and attached by every worker as zero-copy frames. Each worker caps
+    its BLAS threads at PIPELINE_BLAS_THREADS so the processes do not oversubscribe the cores.
+    """
+
+    def __init__(self, max_workers: int = None, blas_threads: int = None):
+        self.logger = LoggingMaster("ProcessPipelineExecutor").get_logger()
+        self.constants = TCS()
+        self.max_workers = max_workers or os.cpu_count()
+        self.blas_threads = blas_threads or self.constants.PIPELINE_BLAS_THREADS
+
+    def run(self, pipeline_factory: Callable, pipeline_kwargs: Dict[str, Any], tickers: List[str],
+            shared_inputs: Dict[str, pd.DataFrame] = None, on_result: Callable = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Run process_ticker for every ticker. pipeline_factory(**pipeline_kwargs) rebuilds the pipeline in each worker.
+        """
+        segments, specs = [], {}
+        try:
+            for name, frame in (shared_inputs or {}).items():
+                segment, specs[name] = share_frame(frame)
+                segments.append(segment)
+            self.logger.info(f"Shared {len(specs)} inputs ({sum(segment.size for segment in segments) / 1e6:.1f} MB) "
+                             f"with {self.max_workers} workers")
+
+            results = {}
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_pipeline_worker,
+                                     initargs=(self.blas_threads, pipeline_factory, pipeline_kwargs, specs)) as pool:
+                futures = {pool.submit(_process_ticker_worker, ticker): ticker for ticker in tickers}
+                for future in as_completed(futures):
+                    ticker = futures[future]
+                    try:
+                        result = future.result()
+                        if result is not None:
+                            results[ticker] = result
+                            self.logger.info(f"Successfully processed {ticker}")
+                        else:
+                            self.logger.warning(f"Processing {ticker} returned no result.")
+                    except Exception as e:
+                        self.logger.error(f"Error processing {ticker}: {e}")
+                    finally:
+                        if on_result is not None:
+                            on_result(ticker)
+            return results
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
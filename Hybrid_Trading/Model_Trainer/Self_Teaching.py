@@ -20,18 +20,21 @@ from Hybrid_Trading.Model_Trainer.models import (
     Ticker
 )
 from django.utils import timezone
+from Hybrid_Trading.Model_Trainer.Bulk_Writer import BufferedModelWriter
 
 class SelfTeaching:
-    def __init__(self, model, tickers: str):
+    def __init__(self, model, tickers: str, writer: BufferedModelWriter = None):
         """
         Initialize the self-teaching model with configuration parameters.
 
         Parameters:
         - model: The initial trained model.
         - tickers: The stock ticker(s) associated with the model.
+        - writer: Buffered writer for prediction, signal, evaluation and update rows (shared by the pipeline).
         """
         self.model = model
         self.ticker = tickers
+        self.writer = writer or BufferedModelWriter()
         self.metrics_history = []
         self.last_update = datetime.now() - timedelta(weeks=1)
         
@@ -130,30 +133,30 @@ class SelfTeaching:
         # Assuming we have a ModelTraining instance associated with this model
         model_training_obj = ModelTraining.objects.filter(user_input=user_input_obj).last()
 
-        # Record predictions and trade signals
+        # Record predictions and trade signals (buffered, written with bulk_create)
         for pred_date, pred_value, actual_value in zip(actuals.index, predictions, actuals):
             # Determine trade signal
             trade_signal = 'BUY' if pred_value > actual_value else 'SELL' if pred_value < actual_value else 'HOLD'
 
             # Create ModelPrediction entry
-            ModelPrediction.objects.create(
+            self.writer.add(ModelPrediction(
                 model_training=model_training_obj,
                 ticker=ticker_obj,
                 prediction_date=pred_date,
                 prediction_value=pred_value,
                 actual_value=actual_value,
                 trade_signal=trade_signal
-            )
+            ))
 
             # Create TradeSignal entry
-            TradeSignal.objects.create(
+            self.writer.add(TradeSignal(
                 ticker=ticker_obj,
                 signal_date=pred_date,
                 signal=trade_signal,
                 user_input=user_input_obj
-            )
+            ))
 
-        logging.info(f"Signals recorded for {ticker}.")
+        logging.info(f"Signals for {ticker} queued ({self.writer.pending()} rows pending).")
 
     def record_evaluation(self, mape, mse, mae):
         """
@@ -171,7 +174,7 @@ class SelfTeaching:
         model_training_obj = ModelTraining.objects.filter(user_input=user_input_obj).last()
 
         # Create ModelEvaluation entry
-        ModelEvaluation.objects.create(
+        self.writer.add(ModelEvaluation(
             model_training=model_training_obj,
             mae=mae,
             rmse=mse ** 0.5,
@@ -179,7 +182,7 @@ class SelfTeaching:
             r2=None,  # Assuming R^2 is not calculated here
             evaluation_set='SelfTeaching',
             timestamp=timezone.now()
-        )
+        ))
 
     def learn_from_order_execution(self):
         """
@@ -187,7 +190,8 @@ class SelfTeaching:
         """
         logging.info("Learning from order execution...")
 
-        # Fetch recent trade signals and actual trade results
+        # Fetch recent trade signals and actual trade results, including ones still buffered
+        self.writer.flush(TradeSignal)
         one_week_ago = timezone.now() - timedelta(weeks=1)
         trade_signals = TradeSignal.objects.filter(
             ticker__ticker=self.ticker,
@@ -257,13 +261,13 @@ class SelfTeaching:
             performance_metric_after = self.metrics_history[-1]['MAPE'] if self.metrics_history else None
 
         # Create SelfTeachingUpdate entry
-        SelfTeachingUpdate.objects.create(
+        self.writer.add(SelfTeachingUpdate(
             model_training=model_training_obj,
             update_date=timezone.now(),
             performance_metric_before=performance_metric_before,
             performance_metric_after=performance_metric_after,
             reason_for_update='Automatic self-teaching based on performance degradation.'
-        )
+        ))
 
     def run(self, test_data: pd.DataFrame, target_column: str, new_data: pd.DataFrame = None):
         """
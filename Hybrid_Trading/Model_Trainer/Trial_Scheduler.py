@@ -0,0 +1,225 @@
+import os
+import json
+import numpy as np
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import TimeSeriesSplit
+from skopt.space import Real, Integer
+from Config.trading_constants import TCS
+from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+
+# Per-process training data of a trial worker, set once by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_trial_worker(estimator, X, y, scoring: str):
+    _worker_state.update(estimator=estimator, X=X, y=y, scorer=get_scorer(scoring))
+
+
+def _take(data, index):
+    return data.iloc[index] if hasattr(data, 'iloc') else data[index]
+
+
+def _run_fold(params: Dict[str, Any], train_index: np.ndarray, test_index: np.ndarray) -> float:
+    """
+    Worker: fit one configuration on one time-series fold and return its validation score.
+    """
+    X, y = _worker_state['X'], _worker_state['y']
+    model = clone(_worker_state['estimator']).set_params(**params)
+    model.fit(_take(X, train_index), _take(y, train_index))
+    return float(_worker_state['scorer'](model, _take(X, test_index), _take(y, test_index)))
+
+
+def _to_python(value):
+    return value.item() if hasattr(value, 'item') else value
+
+
+class TrialHistory:
+    """
+    Trial log per (ticker, model), stored as JSON under HPO_HISTORY_DIR.
+    """
+
+    MAX_TRIALS = 500
+
+    def __init__(self, ticker: str, model_name: str, history_dir: str = None):
+        history_dir = history_dir or TCS().HPO_HISTORY_DIR
+        self.path = os.path.join(history_dir, str(ticker).replace(os.sep, '_'), f"{model_name}.json")
+
+    def load(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path) as history_file:
+            return json.load(history_file)
+
+    def append(self, trials: List[Dict[str, Any]]):
+        history = (self.load() + trials)[-self.MAX_TRIALS:]
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f"{self.path}.tmp", 'w') as history_file:
+            json.dump(history, history_file, default=str)
+        os.replace(f"{self.path}.tmp", self.path)
+
+    def best(self, n: int = 1) -> List[Dict[str, Any]]:
+        completed = [trial for trial in self.load() if trial['status'] == 'complete']
+        return sorted(completed, key=lambda trial: trial['score'], reverse=True)[:n]
+
+
+class PrunedSearch:
+    """
+    Asynchronous hyperparameter search over TimeSeriesSplit folds.
+
+    Trials run fold by fold on a process pool; whenever a fold finishes the trial is either
+    continued or pruned, and a free worker starts the next trial. Pruning compares a trial's running
+    mean score after k folds with the trials that already reached k folds:
+    - 'median': prune when below their median.
+    - 'halving': successive halving; at rungs of min_folds * eta^i folds, keep only the top 1/eta.
+    Past trials for the same ticker and model are read from TrialHistory: the best previous
+    configuration is re-evaluated first and HPO_WARM_START_FRACTION of the new trials are sampled
+    from a narrowed space around it.
+    """
+
+    def __init__(self, estimator, search_space: Dict[str, Any], n_trials: int = 50, n_splits: int = 5,
+                 scoring: str = 'neg_mean_squared_error', pruner: str = 'median', eta: int = None,
+                 min_folds: int = 1, max_workers: int = None, random_state: int = 42,
+                 history: Optional[TrialHistory] = None, max_train_size: int = None):
+        self.logger = LoggingMaster("PrunedSearch").get_logger()
+        self.constants = TCS()
+        self.estimator = estimator
+        self.search_space = search_space
+        self.n_trials = n_trials
+        self.n_splits = n_splits
+        self.max_train_size = max_train_size
+        self.scoring = scoring
+        self.pruner = pruner
+        self.eta = eta or self.constants.HPO_HALVING_ETA
+        self.min_folds = min_folds
+        self.max_workers = max_workers or self.constants.HPO_MAX_WORKERS
+        self.rng = np.random.RandomState(random_state)
+        self.history = history
+        self.trials: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def narrow(dimension, center, shrink: float = 0.25):
+        """
+        A copy of a skopt dimension restricted to `shrink` of its range around `center`.
+        """
+        if isinstance(dimension, Real):
+            log_scale = dimension.prior == 'log-uniform'
+            low, high, mid = (np.log10([dimension.low, dimension.high, center]) if log_scale
+                              else (dimension.low, dimension.high, center))
+            half_width = (high - low) * shrink / 2
+            low, high = max(low, mid - half_width), min(high, mid + half_width)
+            if log_scale:
+                low, high = 10 ** low, 10 ** high
+            return Real(low, high, prior=dimension.prior) if low < high else dimension
+        if isinstance(dimension, Integer):
+            half_width = max(int((dimension.high - dimension.low) * shrink / 2), 1)
+            low, high = max(dimension.low, int(center) - half_width), min(dimension.high, int(center) + half_width)
+            return Integer(low, high) if low < high else dimension
+        return dimension
+
+    def sample(self, around: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        params = {}
+        for name, dimension in self.search_space.items():
+            if around is not None and name in around:
+                dimension = self.narrow(dimension, around[name])
+            if hasattr(dimension, 'rvs'):
+                params[name] = _to_python(dimension.rvs(random_state=self.rng)[0])
+            else:  # Plain list of candidate values
+                params[name] = _to_python(dimension[self.rng.randint(len(dimension))])
+        return params
+
+    def candidate_params(self) -> List[Dict[str, Any]]:
+        previous_best = self.history.best() if self.history is not None else []
+        if not previous_best:
+            return [self.sample() for _ in range(self.n_trials)]
+
+        best_params = previous_best[0]['params']
+        self.logger.info(f"Warm-starting from previous best {best_params} (score {previous_best[0]['score']:.4f})")
+        n_near = int(round((self.n_trials - 1) * self.constants.HPO_WARM_START_FRACTION))
+        near = [self.sample(around=best_params) for _ in range(n_near)]
+        wide = [self.sample() for _ in range(self.n_trials - 1 - n_near)]
+        return [dict(best_params)] + near + wide
+
+    def should_prune(self, folds_done: int, running_mean: float, peers: List[float]) -> bool:
+        if folds_done < self.min_folds or not peers:
+            return False
+        if self.pruner == 'halving':
+            rung = self.min_folds
+            while rung < folds_done:
+                rung *= self.eta
+            if rung != folds_done:
+                return False
+            return running_mean < np.quantile(peers + [running_mean], 1 - 1 / self.eta)
+        return running_mean < np.median(peers)
+
+    def run(self, X, y):
+        """
+        Run the search and return (best_estimator refitted on all data, best_params).
+        """
+        splits = list(TimeSeriesSplit(n_splits=self.n_splits, max_train_size=self.max_train_size).split(X))
+        candidates = self.candidate_params()
+        self.trials = [{'params': params, 'scores': [], 'status': 'running'} for params in candidates]
+        rung_scores = defaultdict(list)  # folds done -> running means of trials that reached them
+        pending = {}
+        next_trial = 0
+
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_trial_worker,
+                                 initargs=(self.estimator, X, y, self.scoring)) as pool:
+            def submit(trial_id: int):
+                train_index, test_index = splits[len(self.trials[trial_id]['scores'])]
+                pending[pool.submit(_run_fold, self.trials[trial_id]['params'], train_index, test_index)] = trial_id
+
+            while next_trial < min(self.max_workers, len(self.trials)):
+                submit(next_trial)
+                next_trial += 1
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    trial_id = pending.pop(future)
+                    trial = self.trials[trial_id]
+                    try:
+                        trial['scores'].append(future.result())
+                    except Exception as e:
+                        trial['status'] = 'failed'
+                        self.logger.warning(f"Trial {trial['params']} failed: {e}")
+                    else:
+                        folds_done = len(trial['scores'])
+                        running_mean = float(np.mean(trial['scores']))
+                        prune = self.should_prune(folds_done, running_mean, rung_scores[folds_done])
+                        rung_scores[folds_done].append(running_mean)
+                        if folds_done == len(splits):
+                            trial['status'] = 'complete'
+                        elif prune:
+                            trial['status'] = 'pruned'
+                        else:
+                            submit(trial_id)
+                            continue
+
+                    # The trial stopped, so its worker slot goes to the next configuration
+                    if next_trial < len(self.trials):
+                        submit(next_trial)
+                        next_trial += 1
+
+        for trial in self.trials:
+            trial['score'] = float(np.mean(trial['scores'])) if trial['scores'] else None
+            trial['finished_at'] = datetime.now().isoformat()
+        if self.history is not None:
+            self.history.append(self.trials)
+
+        completed = [trial for trial in self.trials if trial['status'] == 'complete']
+        if not completed:
+            raise RuntimeError("No hyperparameter trial completed all folds.")
+        best = max(completed, key=lambda trial: trial['score'])
+        pruned = sum(trial['status'] == 'pruned' for trial in self.trials)
+        folds_run = sum(len(trial['scores']) for trial in self.trials)
+        self.logger.info(f"{len(completed)} trials completed, {pruned} pruned, {folds_run} of "
+                         f"{len(self.trials) * len(splits)} folds fitted; best score {best['score']:.4f}")
+
+        best_estimator = clone(self.estimator).set_params(**best['params'])
+        best_estimator.fit(X, y)
+        return best_estimator, best['params']
@@ -17,6 +17,7 @@ class OrchestrationForm(forms.Form):
         ('', 'Choose Feature Selection Method'),  # Placeholder option
         ('k_best', 'K Best'),
         ('mutual_info', 'Mutual Information'),
+        ('approx_mutual_info', 'Approximate Mutual Information'),
         ('model_based', 'Model Based')
     ]
 
@@ -25,6 +26,7 @@ class OrchestrationForm(forms.Form):
         ('grid_search', 'Grid Search'),
         ('random_search', 'Random Search'),
         ('bayesian_optimization', 'Bayesian Optimization'),
+        ('pruned_search', 'Pruned Parallel Search'),
         ('auto_arima', 'Auto ARIMA'),
         ('time_series_cv', 'Time Series Cross-Validation')
     ]
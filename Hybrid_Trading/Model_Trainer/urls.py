@@ -2,6 +2,7 @@ from django.urls import path
 from .views import (
     ModelTrainerResultsView,
     ModelTrainerView,  # Updated the view name from OrchestrationView to ModelTrainerView
+    ModelExplanationView,
 )
 
 app_name = 'model_trainer'
@@ -12,4 +13,7 @@ urlpatterns = [
 
     # Route to display and handle model trainer form (formerly orchestration)
     path('orchestration/', ModelTrainerView.as_view(), name='orchestration_form'),
+
+    # Route to fetch (and lazily compute) SHAP/LIME explanations of a ticker's production model
+    path('model-explanations/<str:ticker>/', ModelExplanationView.as_view(), name='model_explanation'),
 ]
\ No newline at end of file
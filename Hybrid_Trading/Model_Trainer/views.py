@@ -1,5 +1,5 @@
 from django.http import JsonResponse
-from django.views.generic import FormView, DetailView
+from django.views.generic import FormView, DetailView, View
 from django.shortcuts import render
 from tqdm import tqdm
 import time
@@ -8,6 +8,7 @@ import pandas as pd
 from Hybrid_Trading.Model_Trainer.forms import OrchestrationForm
 from Hybrid_Trading.Model_Trainer.MTVIZ import MTVisualization
 from Hybrid_Trading.Model_Trainer.models import ModelEvaluation, ModelPrediction, ModelTraining
+from Hybrid_Trading.Model_Trainer.Explainability import ExplainabilityService
 from Hybrid_Trading.Symbols.SymbolScrapper import TickerScraper
 from Hybrid_Trading.Pipeline.MTS import ModelTrainingStage  # Use the correct class for model training
 from Hybrid_Trading.Log.Logging_Master import LoggingMaster
@@ -160,4 +161,27 @@ class ModelTrainerResultsView(DetailView):
                 model_name=model_training.model_type
             )
 
-        return context
\ No newline at end of file
+        return context
+
+
+class ModelExplanationView(View):
+    """
+    SHAP or LIME explanation of a ticker's production model (or ?version=...), computed on first request.
+    """
+
+    def get(self, request, ticker):
+        kind = request.GET.get('kind', 'shap')
+        if kind not in ('shap', 'lime'):
+            return JsonResponse({'error': f"Unknown explanation kind: {kind}"}, status=400)
+        version = request.GET.get('version')
+        try:
+            service = ExplainabilityService()
+            if version is not None and not service.is_registered_version(ticker, version):
+                return JsonResponse({'error': f"Version {version} is not registered for {ticker}"}, status=400)
+            explanation = service.explain(ticker, kind=kind, version=version)
+        except Exception as e:
+            logger.error(f"Error explaining the model of {ticker}: {str(e)}")
+            return JsonResponse({'error': str(e)}, status=500)
+        if explanation is None:
+            return JsonResponse({'error': f"No explainable model registered for {ticker}"}, status=404)
+        return JsonResponse(explanation)
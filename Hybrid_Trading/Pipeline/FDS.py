@@ -15,15 +15,17 @@ from Hybrid_Trading.Data.Data_Gathering.TI import TechnicalIndicatorFetcher
 from Hybrid_Trading.Data.models import HistoricalPrice, RealTimePrice, TechnicalIndicators
 from Hybrid_Trading.Forecaster.DTPF import DayTimeForecaster
 from Hybrid_Trading.Log.Logging_Master import LoggingMaster
+from Hybrid_Trading.Data.Trading_Calendar import get_trading_calendar
 from asgiref.sync import sync_to_async
 
 # Initialize the logger outside the class to avoid multiple initializations
 logger = LoggingMaster("FetchDataStage").get_logger()
 
 class FetchDataStage:
-    def __init__(self, tickers, interval, start_date, end_date, period, fillna_method):
+    def __init__(self, tickers, interval, start_date, end_date, period, fillna_method, covered_models=None):
         """
         Initialize the data fetch stage with necessary parameters.
+        covered_models maps tickers to the forecast models another run already produced.
         """
         # Initialize TCS (trading constants)
         self.constants = TCS()
@@ -37,6 +39,7 @@ class FetchDataStage:
         self.fillna_method = fillna_method
 
         self.logger = logger
+        self.calendar = get_trading_calendar()
         self.rate_limit = 10
         self.retry_attempts = 3
         self.task_dict = {}
@@ -72,7 +75,8 @@ class FetchDataStage:
             interval=self.interval,
             start_date=self.start_date,
             end_date=self.end_date,
-            period=self.period
+            period=self.period,
+            covered_models=covered_models
         )
 
     async def check_data_freshness(self, ticker_instance, data_type: str) -> bool:
@@ -94,8 +98,8 @@ class FetchDataStage:
         elif data_type == 'prophet_forecast':
             latest_data = await sync_to_async(DayTimeForecaster.objects.filter(ticker=ticker_instance).order_by('-created_at').first)()
 
-        # Check if the latest data is fresh (created today)
-        if latest_data and latest_data.created_at.date() == datetime.now().date():
+        # Data is fresh if it was created on or after the most recent trading session (so weekends and holidays reuse it)
+        if latest_data and latest_data.created_at.date() >= self.calendar.last_session(datetime.now().date()).date():
             return True
         return False
 
@@ -303,6 +307,16 @@ class FetchDataStage:
                         )
                         self.task_dict[ticker]["result_data"]["real_time_price"] = real_time_to_store
 
+                        # New intraday bar: update the cached forecasts incrementally instead of refitting
+                        if real_time_to_store["last_sale_price"]:
+                            intraday_forecasts = await sync_to_async(self.forecaster.update_intraday)(
+                                float(real_time_to_store["last_sale_price"]), real_time_data.get('last_sale_time')
+                            )
+                            if intraday_forecasts:
+                                self.task_dict[ticker]["result_data"]["intraday_forecast"] = {
+                                    model_name: forecast.tolist() for model_name, forecast in intraday_forecasts.items()
+                                }
+
                 # Fetch News Data
                 self.task_dict[ticker]["progress"] = "fetching news data"
                 fresh_news_data = await self.check_data_freshness(ticker_instance, "news")
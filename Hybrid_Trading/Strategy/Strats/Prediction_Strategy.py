@@ -1,3 +1,5 @@
+import asyncio
+import numpy as np
 import pandas as pd
 import datetime
 from sklearn.ensemble import GradientBoostingRegressor
@@ -6,13 +8,36 @@ from typing import Dict, Any, List
 from tqdm.asyncio import tqdm_asyncio
 from Hybrid_Trading.Log.Logging_Master import LoggingMaster
 from Config.utils import TempFiles
+from Hybrid_Trading.Forecaster.Inference_Server import ForecastInferenceServer
+from Hybrid_Trading.Model_Trainer.Model_Registry import ModelRegistry, data_hash
+
+# Quote columns with a stored per-ticker price model, served as "<ticker>:<column>"
+PRICE_MODELS = ('bid_price', 'ask_price')
+
+
+class LevelForecastModel:
+    """
+    predict(X) adapter for a fitted simple exponential smoothing: its forecast is the same level for every row.
+    """
+
+    def __init__(self, fitted):
+        self.level = float(np.asarray(fitted.forecast(1))[0])
+
+    def predict(self, X) -> np.ndarray:
+        return np.full(len(X), self.level)
+
 
 class PredictionStrategy:
-    def __init__(self, user_input: Any, logger=None):
+    def __init__(self, user_input: Any, logger=None, inference_server: ForecastInferenceServer = None,
+                 model_registry: ModelRegistry = None):
         self.user_input = user_input
         self.temp_files = TempFiles()
         self.buy_signals = {}  
         self.logger = logger or LoggingMaster("PredictionStrategy").get_logger()
+        # Optional shared server: predictions come from stored forecasts/models instead of per-ticker fits
+        self.inference_server = inference_server
+        # Fitted bid/ask price models are stored as registry versions and reused across runs
+        self.model_registry = model_registry or (ModelRegistry() if inference_server is not None else None)
 
     def prepare_data(self, ticker: str, prophet_forecast: pd.DataFrame) -> pd.DataFrame:
         self.logger.info(f"Preparing data for {ticker}")
@@ -35,20 +60,77 @@ class PredictionStrategy:
         
         return df
 
-    def prepare_future_dataframe(self, df: pd.DataFrame, future: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def fit_price_model(column: str, prices: pd.Series):
+        """
+        Gradient boosting over the bar position for the bid, simple exponential smoothing for the ask.
+        """
+        if column == 'bid_price':
+            model = GradientBoostingRegressor()
+            # Fitted on a plain array: the server scores stacked NumPy rows
+            model.fit(np.arange(len(prices)).reshape(-1, 1), prices.values)
+            return model
+        return LevelForecastModel(SimpleExpSmoothing(prices).fit())
+
+    def load_price_model(self, ticker: str, column: str, quotes_hash: str):
+        """
+        The production price model of a ticker's quote column, if it was fitted on these quotes.
+        """
+        registry_key = f"{ticker}.{column}"
+        production = self.model_registry.production_version(registry_key)
+        entry = next((entry for entry in reversed(self.model_registry.versions(registry_key))
+                      if entry['version'] == production), None)
+        if entry is None or entry['data_hash'] != quotes_hash:
+            return None
+        return self.model_registry.load(production)
+
+    def register_price_models(self, ticker: str, df: pd.DataFrame):
+        """
+        Serve the ticker's bid/ask price models as "<ticker>:bid_price" and "<ticker>:ask_price".
+
+        The models are the production versions in the ModelRegistry; one is only fitted (then
+        registered and promoted) when no stored version was fitted on these quotes. When new quotes
+        arrive the served models are swapped and the ticker's loaded forecasts are dropped, so the
+        next forecast request reads the latest stored ones.
+        """
+        refreshed = False
+        for column in PRICE_MODELS:
+            name = f"{ticker}:{column}"
+            quotes_hash = data_hash(df[column])
+            if self.inference_server.model_version(name) == quotes_hash:
+                continue
+            model = self.load_price_model(ticker, column, quotes_hash)
+            if model is None:
+                model = self.fit_price_model(column, df[column])
+                version = self.model_registry.register(f"{ticker}.{column}", model, training_data=(df[column],))
+                self.model_registry.promote(f"{ticker}.{column}", version)
+                self.logger.info(f"Fitted {column} model for {ticker} on {len(df)} quotes (version {version})")
+            refreshed = refreshed or self.inference_server.has_model(name)
+            self.inference_server.register_model(name, model, version=quotes_hash)
+        if refreshed:
+            self.inference_server.invalidate(ticker=ticker)
+
+    async def prepare_future_dataframe(self, ticker: str, df: pd.DataFrame, future: pd.DataFrame) -> pd.DataFrame:
         self.logger.info("Preparing future dataframe with regressors")
         print("Preparing future dataframe with regressors")
 
-        future['sentiment_score'] = df['sentiment_score'].iloc[-1]
+        future['sentiment_score'] = df['sentiment_score'].iloc[-1] if 'sentiment_score' in df else 0.0
         future['volume'] = df['volume'].iloc[-1]
 
         X = pd.DataFrame({'time': range(len(df))})
         y = df['bid_price'].values
 
+        future_index = pd.DataFrame({'time': range(len(df), len(df) + len(future))})
+        if self.inference_server is not None:
+            # Stored bid/ask models are served by the inference server; nothing is fitted at signal time
+            await asyncio.to_thread(self.register_price_models, ticker, df)
+            future['bid_price'] = await self.inference_server.predict(f"{ticker}:bid_price", future_index.values)
+            future['ask_price'] = await self.inference_server.predict(f"{ticker}:ask_price", future_index.values)
+            return future
+
         # Fit a gradient boosting model for bid price prediction
         linear_model = GradientBoostingRegressor()
         linear_model.fit(X, y)
-        future_index = pd.DataFrame({'time': range(len(df), len(df) + len(future))})
         future['bid_price'] = linear_model.predict(future_index)
 
         # Apply exponential smoothing for ask price prediction
@@ -71,12 +153,27 @@ class PredictionStrategy:
         # Prepare the data
         df = self.prepare_data(ticker, prophet_forecast)
 
-        self.logger.info(f"Using provided Prophet forecast for {ticker}")
-        print(f"Using provided Prophet forecast for {ticker}")
+        # Bid/ask outlook for the next bars; refreshing the price models on new quotes also drops
+        # the ticker's loaded forecasts, so it runs before the forecast request
+        quote_outlook = {}
+        if self.inference_server is not None and set(PRICE_MODELS) <= set(real_time_data.columns):
+            future = await self.prepare_future_dataframe(ticker, real_time_data, pd.DataFrame(index=range(5)))
+            quote_outlook = {'predicted_bid': float(future['bid_price'].iloc[-1]),
+                             'predicted_ask': float(future['ask_price'].iloc[-1])}
 
         # Get predictions for today and 5 days out
-        predicted_today = df[df['ds'] == str(datetime.date.today())]['yhat'].values[0]
-        predicted_5_days_out = df[df['ds'] == str(datetime.date.today() + datetime.timedelta(days=5))]['yhat'].values[0]
+        today = datetime.date.today()
+        five_days_out = today + datetime.timedelta(days=5)
+        if self.inference_server is not None:
+            self.logger.info(f"Using stored forecasts from the inference server for {ticker}")
+            predicted_today, predicted_5_days_out = await self.inference_server.forecast(
+                ticker, [today, five_days_out], model_name=self.user_input.get('forecast_model', 'ARIMA')
+            )
+        else:
+            self.logger.info(f"Using provided Prophet forecast for {ticker}")
+            print(f"Using provided Prophet forecast for {ticker}")
+            predicted_today = df[df['ds'] == str(today)]['yhat'].values[0]
+            predicted_5_days_out = df[df['ds'] == str(five_days_out)]['yhat'].values[0]
 
         current_price = real_time_data['price'].iloc[-1]
 
@@ -111,6 +208,7 @@ class PredictionStrategy:
                 'end_date': self.user_input.get('end_date')
             }
 
+        signal.update(quote_outlook)
         self.logger.info(f"Signal for {ticker}: {signal}")
         print(f"Signal for {ticker}: {signal}")
 
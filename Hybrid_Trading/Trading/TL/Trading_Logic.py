@@ -1,5 +1,6 @@
 import os
 import logging
+import numpy as np
 from datetime import datetime
 from dotenv import load_dotenv
 from typing import List, Dict, Any
@@ -132,9 +133,15 @@ class DayTradingLogic:
             else:
                 return 'Hold'
 
-    def calculate_position_size(self, buying_power: float, price: float) -> int:
-        position_size = (buying_power * self.constants.POSITION_SIZE) / price
-        return int(min(position_size, self.constants.MAX_INVESTMENT_PARTITION * buying_power / price))
+    def calculate_position_size(self, buying_power: float, price):
+        # Accepts a scalar price or an array of prices (portfolio backtests size every ticker in one call)
+        position_size = np.minimum(
+            (buying_power * self.constants.POSITION_SIZE) / price,
+            self.constants.MAX_INVESTMENT_PARTITION * buying_power / price
+        )
+        if np.ndim(position_size) == 0:
+            return int(position_size)
+        return np.floor(position_size).astype(np.int64)
 
     def handle_order(self, trade_details: Dict[str, Any]):
         ticker = trade_details.get('ticker')